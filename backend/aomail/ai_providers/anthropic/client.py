@@ -27,6 +27,7 @@ import os
 import re
 import anthropic
 from datetime import datetime
+from functools import lru_cache
 from aomail.ai_providers.utils import count_corrections
 from aomail.ai_providers.prompts import (
     CHAT_HISTORY_TEXT,
@@ -54,13 +55,19 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
 
 ######################## TEXT PROCESSING UTILITIES ########################
+@lru_cache(maxsize=None)
+def get_client() -> anthropic.Anthropic:
+    """Returns the Anthropic client shared by all calls, keeping its connections alive"""
+    return anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+
+
 def get_prompt_response(
     formatted_prompt: str, model: str = "claude-3-5-haiku-latest"
 ) -> anthropic.types.message.Message:
     """Returns the prompt response"""
     if not model:
         model = "claude-3-5-haiku-latest"
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
+    client = get_client()
     response = client.messages.create(
         model=model,
         max_tokens=4096,
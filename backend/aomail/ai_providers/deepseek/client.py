@@ -11,6 +11,7 @@ import re
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from openai.types.chat.chat_completion import ChatCompletion
 from aomail.ai_providers.utils import count_corrections, extract_json_from_response
 from aomail.ai_providers.prompts import (
@@ -38,15 +39,19 @@ DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 
 
 ######################## TEXT PROCESSING UTILITIES ########################
+@lru_cache(maxsize=None)
+def get_client() -> openai.OpenAI:
+    """Returns the DeepSeek client shared by all calls, keeping its connections alive"""
+    return openai.OpenAI(api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com")
+
+
 def get_prompt_response(
     formatted_prompt: str, model: str = "deepseek-chat"
 ) -> ChatCompletion:
     """Returns the prompt response"""
     if not model:
         model = "deepseek-chat"
-    client = openai.OpenAI(
-        api_key=DEEPSEEK_API_KEY, base_url="https://api.deepseek.com"
-    )
+    client = get_client()
     response = client.chat.completions.create(
         model=model,
         messages=[{"role": "user", "content": formatted_prompt}],
@@ -27,6 +27,7 @@ import json
 import logging
 import google.generativeai as genai
 from datetime import datetime
+from functools import lru_cache
 from aomail.ai_providers.utils import (
     count_corrections,
     extract_json_from_response,
@@ -58,14 +59,20 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 
 ######################## TEXT PROCESSING UTILITIES ########################
+@lru_cache(maxsize=None)
+def get_model(model: str) -> genai.GenerativeModel:
+    """Returns the Gemini model shared by all calls, configuring the API key once"""
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(model)
+
+
 def get_prompt_response(
     formatted_prompt: str, model: str = "gemini-1.5-flash"
 ) -> genai.types.GenerateContentResponse:
     """Returns the prompt response using Gemini 1.5 Flash model"""
     if not model:
         model = "gemini-1.5-flash"
-    genai.configure(api_key=GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel(model)
+    gemini_model = get_model(model)
     response = gemini_model.generate_content(
         formatted_prompt,
         generation_config=genai.types.GenerationConfig(
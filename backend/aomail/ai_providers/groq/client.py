@@ -11,6 +11,7 @@ import json
 import logging
 from groq import Groq
 from datetime import datetime
+from functools import lru_cache
 from groq.types.chat.chat_completion import ChatCompletion
 from aomail.ai_providers.utils import count_corrections, extract_json_from_response
 from aomail.ai_providers.prompts import (
@@ -39,13 +40,19 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
 
 ######################## TEXT PROCESSING UTILITIES ########################
+@lru_cache(maxsize=None)
+def get_client() -> Groq:
+    """Returns the Groq client shared by all calls, keeping its connections alive"""
+    return Groq(api_key=GROQ_API_KEY)
+
+
 def get_prompt_response(
     formatted_prompt: str, model: str = "llama3-8b-8192"
 ) -> ChatCompletion:
     """Returns the prompt response"""
     if not model:
         model = "llama3-8b-8192"
-    client = Groq(api_key=GROQ_API_KEY)
+    client = get_client()
     response = client.chat.completions.create(
         messages=[{"role": "user", "content": formatted_prompt}],
         model=model,
@@ -58,7 +65,7 @@ def get_prompt_response_with_tokens(
 ) -> dict:
     """Returns the prompt response with tokens"""
     response = get_prompt_response(formatted_prompt, model)
-    print(response)
+    LOGGER.debug("Groq response: %s", response)
     result_json = extract_json_from_response(response.choices[0].message.content)
     result_json["tokens_input"] = response.usage.prompt_tokens
     result_json["tokens_output"] = response.usage.completion_tokens
@@ -10,6 +10,7 @@ import json
 import logging
 from mistralai import ChatCompletionResponse, Mistral
 from datetime import datetime
+from functools import lru_cache
 from aomail.ai_providers.utils import count_corrections, extract_json_from_response
 from aomail.ai_providers.prompts import (
     CHAT_HISTORY_TEXT,
@@ -37,13 +38,19 @@ MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 
 
 ######################## TEXT PROCESSING UTILITIES ########################
+@lru_cache(maxsize=None)
+def get_client() -> Mistral:
+    """Returns the Mistral client shared by all calls, keeping its connections alive"""
+    return Mistral(api_key=MISTRAL_API_KEY)
+
+
 def get_prompt_response(
     formatted_prompt: str, model: str = "mistral-small-latest"
 ) -> ChatCompletionResponse:
     """Returns the prompt response"""
     if not model:
         model = "mistral-small-latest"
-    client = Mistral(api_key=MISTRAL_API_KEY)
+    client = get_client()
     response = client.chat.complete(
         model=model,
         messages=[
@@ -11,6 +11,7 @@ import re
 import json
 import logging
 from datetime import datetime
+from functools import lru_cache
 from openai.types.chat.chat_completion import ChatCompletion
 from aomail.ai_providers.utils import count_corrections, extract_json_from_response
 from aomail.ai_providers.prompts import (
@@ -39,13 +40,19 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 
 ######################## TEXT PROCESSING UTILITIES ########################
+@lru_cache(maxsize=None)
+def get_client() -> openai.OpenAI:
+    """Returns the OpenAI client shared by all calls, keeping its connections alive"""
+    return openai.OpenAI(api_key=OPENAI_API_KEY)
+
+
 def get_prompt_response(
     formatted_prompt: str, model: str = "gpt-4o-mini"
 ) -> ChatCompletion:
     """Returns the prompt response"""
     if not model:
         model = "gpt-4o-mini"
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+    client = get_client()
     response = client.chat.completions.create(
         model=model,
         messages=[{"role": "user", "content": formatted_prompt}],
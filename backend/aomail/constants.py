@@ -73,6 +73,11 @@ POSSIBLY_RELEVANT = "Possibly Relevant"
 NOT_RELEVANT = "Not Relevant"
 DEFAULT_CATEGORY = "Others"
 MAX_RETRIES = 3
+EMAIL_BATCH_SIZE = 50
+EMAIL_BATCH_MAX_WORKERS = 10
+EMAIL_QUEUE_DELAY = 5  # seconds
+PENDING_EMAIL_RECOVERY_DELAY = 60  # seconds
+EMAIL_CLAIM_TTL = 3600  # seconds
 
 ######################## GOOGLE API ########################
 GOOGLE_READONLY_SCOPE = "https://www.googleapis.com/auth/gmail.readonly"
@@ -111,6 +116,16 @@ GOOGLE_WEB_CONFIG = {
     }
 }
 GOOGLE = "google"
+GOOGLE_API_NUM_RETRIES = 4  # exponential backoff on 429, 403 rate limits and 5xx
+GOOGLE_API_MAX_CONCURRENT_REQUESTS = int(
+    os.getenv("GOOGLE_API_MAX_CONCURRENT_REQUESTS", "10")
+)
+GOOGLE_API_MAX_REQUESTS_PER_SECOND = float(
+    os.getenv("GOOGLE_API_MAX_REQUESTS_PER_SECOND", "50")
+)
+GOOGLE_BATCH_MAX_REQUESTS = 100
+GOOGLE_BATCH_FALLBACK_MAX_WORKERS = 20
+GOOGLE_MEDIA_UPLOAD_THRESHOLD = 5 * 1024 * 1024  # bytes
 
 ######################## MICROSOFT API ########################
 MICROSOFT_READ_SCOPE = "Mail.Read"
@@ -129,6 +144,12 @@ MICROSOFT_SCOPES = [
 ]
 MICROSOFT_AUTHORITY = "https://login.microsoftonline.com/common"
 GRAPH_URL = "https://graph.microsoft.com/v1.0/"
+GRAPH_POOL_MAXSIZE = 32
+GRAPH_MAX_RETRIES = 3  # idempotent requests only, on 429 and 5xx
+GRAPH_RETRY_BACKOFF_FACTOR = 0.3  # seconds, doubled after each retry
+MICROSOFT_TOKEN_EXPIRY_MARGIN = 300  # seconds before expiry a token is refreshed
+GRAPH_MAX_CONCURRENT_WRITES = int(os.getenv("GRAPH_MAX_CONCURRENT_WRITES", "8"))
+MICROSOFT_PROFILE_PHOTO_SIZE = "96x96"  # avatars are displayed at 48px at most
 MICROSOFT_CLIENT_ID = os.getenv("MICROSOFT_CLIENT_ID")
 MICROSOFT_CLIENT_SECRET = os.getenv("MICROSOFT_CLIENT_SECRET")
 MICROSOFT_TENANT_ID = os.getenv("MICROSOFT_TENANT_ID")
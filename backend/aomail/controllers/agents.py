@@ -48,27 +48,29 @@ def update_agent(request: HttpRequest, agent_id: int) -> Response:
         Response: JSON response with updated agent data or error messages.
     """
     LOGGER.info(
-        f"Received update request for agent_id: {agent_id} by user: {request.user.username}"
+        "Received update request for agent_id: %s by user: %s",
+        agent_id,
+        request.user.username,
     )
 
     try:
         agent = Agent.objects.get(id=agent_id, user=request.user)
-        LOGGER.debug(f"Agent before update: {agent}")
+        LOGGER.debug("Agent before update: %s", agent)
     except Agent.DoesNotExist:
         LOGGER.error(
-            f"Agent with id {agent_id} not found for user {request.user.username}"
+            "Agent with id %s not found for user %s", agent_id, request.user.username
         )
         return Response({"error": "Agent not found."}, status=status.HTTP_404_NOT_FOUND)
 
     serializer = AgentSerializer(agent, data=request.data, partial=True)
-    LOGGER.debug(f"Serialized data: {serializer.initial_data}")
+    LOGGER.debug("Serialized data: %s", serializer.initial_data)
 
     if serializer.is_valid():
         updated_agent = serializer.save()
-        LOGGER.info(f"Agent updated successfully: {updated_agent}")
+        LOGGER.info("Agent updated successfully: %s", updated_agent)
         return Response(serializer.data, status=status.HTTP_200_OK)
     else:
-        LOGGER.error(f"Serializer errors: {serializer.errors}")
+        LOGGER.error("Serializer errors: %s", serializer.errors)
         return Response(
             {"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
         )
@@ -181,7 +183,7 @@ def get_all_agents_info(request: HttpRequest) -> Response:
         serializer = AgentSerializer(agents, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     except Exception as e:
-        LOGGER.error(f"Error fetching agents for user {request.user.id}: {str(e)}")
+        LOGGER.error("Error fetching agents for user %s: %s", request.user.id, e)
         return Response(
             {"error": "An error occurred while fetching agents."},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -276,10 +278,10 @@ def create_default_agents(user: User, language: str) -> dict:
 
         if language.lower() == "fr" or language.lower() == "french":
             agents_to_create = default_agents_fr
-            LOGGER.info(f"Creating default French agents for user {user.username}")
+            LOGGER.info("Creating default French agents for user %s", user.username)
         else:
             agents_to_create = default_agents_en
-            LOGGER.info(f"Creating default English agents for user {user.username}")
+            LOGGER.info("Creating default English agents for user %s", user.username)
 
         for agent_data in agents_to_create:
             Agent.objects.create(
@@ -295,10 +297,10 @@ def create_default_agents(user: User, language: str) -> dict:
                 picture=agent_data["picture"],
                 icon_name=agent_data["icon_name"],
             )
-        LOGGER.info(f"Default agents created for user {user.username}")
+        LOGGER.info("Default agents created for user %s", user.username)
         return {"message": "Default agents created successfully"}
     except Exception as e:
         LOGGER.error(
-            f"Failed to create default agents for user {user.username}: {str(e)}"
+            "Failed to create default agents for user %s: %s", user.username, e
         )
         return {"error": "An error occurred during agent creation."}
@@ -16,7 +16,7 @@ Endpoints:
 
 import json
 import logging
-import threading
+from concurrent.futures import ThreadPoolExecutor
 import re
 import difflib
 from django.core.mail import send_mail
@@ -366,14 +366,6 @@ def search_emails_ai(request: HttpRequest) -> Response:
     search_params = result["search_params"]
     update_tokens_stats(user, result)
 
-    result = {}
-
-    def append_to_result(provider: str, email: str, data: list):
-        if len(data) > 0:
-            if provider not in result:
-                result[provider] = {}
-            result[provider][email] = data
-
     max_results: int = search_params["max_results"]
     from_addresses: list = search_params["from"]
     to: list = search_params["to"]
@@ -384,57 +376,50 @@ def search_emails_ai(request: HttpRequest) -> Response:
     keywords: list = search_params["keywords"]
     search_in: dict = search_params["search_in"]
 
-    for email in emails:
-        social_api = SocialAPI.objects.get(email=email)
-        type_api = social_api.type_api
+    search_parameters = {
+        "max_results": max_results,
+        "filenames": filenames,
+        "from_addresses": from_addresses,
+        "to_addresses": to,
+        "subject": subject,
+        "body": body,
+        "keywords": keywords,
+        "date_from": date_from,
+        "search_in": search_in,
+    }
 
-        if type_api == GOOGLE and not social_api.imap_config:
+    def search_account(social_api: SocialAPI) -> list:
+        email = social_api.email
+        if social_api.imap_config:
+            return []
+        elif social_api.type_api == GOOGLE:
             services = auth_google.authenticate_service(user, email, ["gmail"])
-            search_result = threading.Thread(
-                target=append_to_result,
-                args=(
-                    GOOGLE,
-                    email,
-                    email_operations_google.search_emails_ai(
-                        services,
-                        max_results=max_results,
-                        filenames=filenames,
-                        from_addresses=from_addresses,
-                        to_addresses=to,
-                        subject=subject,
-                        body=body,
-                        keywords=keywords,
-                        date_from=date_from,
-                        search_in=search_in,
-                    ),
-                ),
+            return email_operations_google.search_emails_ai(
+                services, **search_parameters
             )
-        elif type_api == MICROSOFT and not social_api.imap_config:
+        elif social_api.type_api == MICROSOFT:
             access_token = auth_microsoft.refresh_access_token(
                 auth_microsoft.get_social_api(user, email)
             )
-            search_result = threading.Thread(
-                target=append_to_result,
-                args=(
-                    MICROSOFT,
-                    email,
-                    email_operations_microsoft.search_emails_ai(
-                        access_token,
-                        max_results=max_results,
-                        filenames=filenames,
-                        from_addresses=from_addresses,
-                        to_addresses=to,
-                        subject=subject,
-                        body=body,
-                        keywords=keywords,
-                        date_from=date_from,
-                        search_in=search_in,
-                    ),
-                ),
+            return email_operations_microsoft.search_emails_ai(
+                access_token, **search_parameters
             )
+        return []
 
-        search_result.start()
-        search_result.join()
+    social_apis = [SocialAPI.objects.get(email=email) for email in emails]
+
+    # Each account is searched in its own thread, so that the provider round trips
+    # overlap instead of adding up
+    result = {}
+    if social_apis:
+        with ThreadPoolExecutor(max_workers=len(social_apis)) as executor:
+            search_results = list(executor.map(search_account, social_apis))
+
+        for social_api, search_result in zip(social_apis, search_results):
+            if search_result:
+                result.setdefault(social_api.type_api, {})[
+                    social_api.email
+                ] = search_result
 
     return Response(result, status=status.HTTP_200_OK)
 
@@ -15,6 +15,8 @@ Endpoints:
 import json
 import logging
 import os
+import threading
+from cachetools import TTLCache
 from datetime import timedelta
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404
@@ -54,6 +56,13 @@ LOGGER = logging.getLogger(__name__)
 READ_EMAILS_MARKER = "read"
 
 
+######################## EMAIL CONTENT CACHE ########################
+# The content of an email never changes once received, only its state does
+MAIL_CONTENT_CACHE_TTL = 24 * 60 * 60  # time in seconds
+MAIL_CONTENT_CACHE = TTLCache(maxsize=256, ttl=MAIL_CONTENT_CACHE_TTL)
+MAIL_CONTENT_CACHE_LOCK = threading.Lock()
+
+
 @api_view(["GET"])
 @subscription(ALLOW_ALL)
 def get_first_email(request: HttpRequest) -> Response:
@@ -96,6 +105,13 @@ def get_mail_by_id(request: HttpRequest) -> Response:
             )
 
         email = get_object_or_404(Email, user=user, provider_id=mail_id)
+
+        cache_key = (user.id, mail_id)
+        with MAIL_CONTENT_CACHE_LOCK:
+            mail_content = MAIL_CONTENT_CACHE.get(cache_key)
+        if mail_content is not None:
+            return Response(mail_content, status=status.HTTP_200_OK)
+
         social_api = email.social_api
         email_user = social_api.email
         type_api = social_api.type_api
@@ -194,18 +210,19 @@ def get_mail_by_id(request: HttpRequest) -> Response:
             all_recipients.append(from_info)
         all_recipients.extend(cc)
 
-        return Response(
-            {
-                "subject": subject,
-                "decodedData": decoded_data,
-                "from": from_info or {"name": "", "email": ""},
-                "cc": cc or [],
-                "bcc": bcc or [],
-                "date": date,
-                "emailUser": email_user,
-            },
-            status=status.HTTP_200_OK,
-        )
+        mail_content = {
+            "subject": subject,
+            "decodedData": decoded_data,
+            "from": from_info or {"name": "", "email": ""},
+            "cc": cc or [],
+            "bcc": bcc or [],
+            "date": date,
+            "emailUser": email_user,
+        }
+        with MAIL_CONTENT_CACHE_LOCK:
+            MAIL_CONTENT_CACHE[cache_key] = mail_content
+
+        return Response(mail_content, status=status.HTTP_200_OK)
 
     except Exception as e:
         LOGGER.error(f"Error in get_mail_by_id: {str(e)}")
@@ -142,10 +142,9 @@ def create_rule(request: HttpRequest) -> Response:
 
     # Check for duplicate rules based on email triggers
     if data.get("senderEmails"):
-        existing_rule = Rule.objects.filter(
+        if Rule.objects.filter(
             user=user, sender_emails__overlap=data["senderEmails"]
-        ).first()
-        if existing_rule:
+        ).exists():
             return Response(
                 {
                     "error": "A rule already exists for one or more of these email addresses"
@@ -154,10 +153,7 @@ def create_rule(request: HttpRequest) -> Response:
             )
 
     if data.get("domains"):
-        existing_rule = Rule.objects.filter(
-            user=user, domains__overlap=data["domains"]
-        ).first()
-        if existing_rule:
+        if Rule.objects.filter(user=user, domains__overlap=data["domains"]).exists():
             return Response(
                 {"error": "A rule already exists for one or more of these domains"},
                 status=status.HTTP_400_BAD_REQUEST,
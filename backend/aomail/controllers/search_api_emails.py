@@ -8,7 +8,7 @@ Endpoints:
 
 import json
 import logging
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.http import HttpRequest
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -189,93 +189,53 @@ def get_api_emails_ids(request: HttpRequest) -> Response:
     date_from: str = data.get("dateFrom")
     search_in: dict = data.get("searchIn")
 
-    def append_to_result(provider: str, email: str, data: list):
-        if len(data) > 0:
-            if provider not in result:
-                result[provider] = {}
-            result[provider][email] = data
-
-    result = {}
-    for provider in email_provider:
-        social_apis = SocialAPI.objects.filter(user=user, type_api=provider)
-
-        for social_api in social_apis:
-            email = social_api.email
-            social_api = SocialAPI.objects.get(email=email)
-            type_api = social_api.type_api
+    search_parameters = (
+        query,
+        max_results,
+        file_extensions,
+        filenames,
+        advanced,
+        search_in,
+        from_addresses,
+        to_addresses,
+        subject,
+        body,
+        date_from,
+    )
+
+    def search_account(social_api: SocialAPI) -> list:
+        email = social_api.email
+        if social_api.imap_config:
+            return email_operations_imap.search_emails_manually(
+                social_api, *search_parameters
+            )
+        elif social_api.type_api == GOOGLE:
+            services = auth_google.authenticate_service(user, email, ["gmail"])
+            return email_operations_google.search_emails_manually(
+                services, *search_parameters
+            )
+        elif social_api.type_api == MICROSOFT:
+            access_token = auth_microsoft.refresh_access_token(
+                auth_microsoft.get_social_api(user, email)
+            )
+            return email_operations_microsoft.search_emails_manually(
+                access_token, *search_parameters
+            )
+        return []
 
-            if type_api == GOOGLE and not social_api.imap_config:
-                services = auth_google.authenticate_service(user, email, ["gmail"])
-                search_result = threading.Thread(
-                    target=append_to_result,
-                    args=(
-                        GOOGLE,
-                        email,
-                        email_operations_google.search_emails_manually(
-                            services,
-                            query,
-                            max_results,
-                            file_extensions,
-                            filenames,
-                            advanced,
-                            search_in,
-                            from_addresses,
-                            to_addresses,
-                            subject,
-                            body,
-                            date_from,
-                        ),
-                    ),
-                )
-            elif type_api == MICROSOFT and not social_api.imap_config:
-                access_token = auth_microsoft.refresh_access_token(
-                    auth_microsoft.get_social_api(user, email)
-                )
-                search_result = threading.Thread(
-                    target=append_to_result,
-                    args=(
-                        MICROSOFT,
-                        email,
-                        email_operations_microsoft.search_emails_manually(
-                            access_token,
-                            query,
-                            max_results,
-                            file_extensions,
-                            filenames,
-                            advanced,
-                            search_in,
-                            from_addresses,
-                            to_addresses,
-                            subject,
-                            body,
-                            date_from,
-                        ),
-                    ),
-                )
-            elif social_api.imap_config:
-                search_result = threading.Thread(
-                    target=append_to_result,
-                    args=(
-                        social_api.type_api,
-                        social_api.email,
-                        email_operations_imap.search_emails_manually(
-                            social_api,
-                            query,
-                            max_results,
-                            file_extensions,
-                            filenames,
-                            advanced,
-                            search_in,
-                            from_addresses,
-                            to_addresses,
-                            subject,
-                            body,
-                            date_from,
-                        ),
-                    ),
-                )
+    social_apis = list(SocialAPI.objects.filter(user=user, type_api__in=email_provider))
 
-            search_result.start()
-            search_result.join()
+    # Each account is searched in its own thread, so that the provider round trips
+    # overlap instead of adding up
+    result = {}
+    if social_apis:
+        with ThreadPoolExecutor(max_workers=len(social_apis)) as executor:
+            search_results = list(executor.map(search_account, social_apis))
+
+        for social_api, search_result in zip(social_apis, search_results):
+            if search_result:
+                result.setdefault(social_api.type_api, {})[
+                    social_api.email
+                ] = search_result
 
     return Response(result, status=status.HTTP_200_OK)
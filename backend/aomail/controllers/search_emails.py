@@ -28,7 +28,7 @@ from aomail.constants import (
 )
 from datetime import timedelta
 from django.utils import timezone
-from aomail.models import Category, SocialAPI, Email, Subscription
+from aomail.models import Category, SocialAPI, Email, EmailBody, Subscription
 from aomail.utils.security import subscription, decrypt_text
 from django.contrib.auth.models import User
 from aomail.email_providers.imap.emails_sync import save_emails_to_db
@@ -157,10 +157,12 @@ def get_email_content(request: HttpRequest) -> Response:
         )
 
     try:
-        email = Email.objects.get(user=request.user, id=email_id)
-        decrypted_content = decrypt_text(EMAIL_HTML_CONTENT_KEY, email.html_content)
+        email_body = EmailBody.objects.get(email__user=request.user, email_id=email_id)
+        decrypted_content = decrypt_text(
+            EMAIL_HTML_CONTENT_KEY, email_body.html_content
+        )
         return Response({"content": decrypted_content}, status=status.HTTP_200_OK)
-    except Email.DoesNotExist:
+    except EmailBody.DoesNotExist:
         return Response(
             {"error": "email does not exist"}, status=status.HTTP_400_BAD_REQUEST
         )
@@ -15,7 +15,7 @@ import importlib
 import json
 import logging
 import os
-import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpRequest, FileResponse, Http404
 from aomail.email_providers.google import authentication as auth_google
@@ -346,90 +346,54 @@ def search_emails(request: HttpRequest) -> Response:
     date_from: str = data["date_from"]
     search_in: dict = data["search_in"]
 
-    def append_to_result(provider: str, email: str, data: list):
-        if len(data) > 0:
-            if provider not in result:
-                result[provider] = {}
-            result[provider][email] = data
-
-    result = {}
-    for email in emails:
-        social_api = SocialAPI.objects.get(email=email)
-        type_api = social_api.type_api
+    search_parameters = (
+        query,
+        max_results,
+        file_extensions,
+        filenames,
+        advanced,
+        search_in,
+        from_addresses,
+        to_addresses,
+        subject,
+        body,
+        date_from,
+    )
 
-        if type_api == GOOGLE and not social_api.imap_config:
+    def search_account(social_api: SocialAPI) -> list:
+        email = social_api.email
+        if social_api.imap_config:
+            return email_operations_imap.search_emails_manually(
+                social_api, *search_parameters
+            )
+        elif social_api.type_api == GOOGLE:
             services = auth_google.authenticate_service(user, email, ["gmail"])
-            search_result = threading.Thread(
-                target=append_to_result,
-                args=(
-                    GOOGLE,
-                    email,
-                    email_operations_google.search_emails_manually(
-                        services,
-                        query,
-                        max_results,
-                        file_extensions,
-                        filenames,
-                        advanced,
-                        search_in,
-                        from_addresses,
-                        to_addresses,
-                        subject,
-                        body,
-                        date_from,
-                    ),
-                ),
+            return email_operations_google.search_emails_manually(
+                services, *search_parameters
             )
-        elif type_api == MICROSOFT and not social_api.imap_config:
+        elif social_api.type_api == MICROSOFT:
             access_token = auth_microsoft.refresh_access_token(
                 auth_microsoft.get_social_api(user, email)
             )
-            search_result = threading.Thread(
-                target=append_to_result,
-                args=(
-                    MICROSOFT,
-                    email,
-                    email_operations_microsoft.search_emails_manually(
-                        access_token,
-                        query,
-                        max_results,
-                        file_extensions,
-                        filenames,
-                        advanced,
-                        search_in,
-                        from_addresses,
-                        to_addresses,
-                        subject,
-                        body,
-                        date_from,
-                    ),
-                ),
-            )
-        elif social_api.imap_config:
-            search_result = threading.Thread(
-                target=append_to_result,
-                args=(
-                    social_api.type_api,
-                    social_api.email,
-                    email_operations_imap.search_emails_manually(
-                        social_api,
-                        query,
-                        max_results,
-                        file_extensions,
-                        filenames,
-                        advanced,
-                        search_in,
-                        from_addresses,
-                        to_addresses,
-                        subject,
-                        body,
-                        date_from,
-                    ),
-                ),
+            return email_operations_microsoft.search_emails_manually(
+                access_token, *search_parameters
             )
+        return []
+
+    social_apis = [SocialAPI.objects.get(email=email) for email in emails]
 
-        search_result.start()
-        search_result.join()
+    # Each account is searched in its own thread, so that the provider round trips
+    # overlap instead of adding up
+    result = {}
+    if social_apis:
+        with ThreadPoolExecutor(max_workers=len(social_apis)) as executor:
+            search_results = list(executor.map(search_account, social_apis))
+
+        for social_api, search_result in zip(social_apis, search_results):
+            if search_result:
+                result.setdefault(social_api.type_api, {})[
+                    social_api.email
+                ] = search_result
 
     return Response(result, status=status.HTTP_200_OK)
 
@@ -9,22 +9,34 @@ Endpoints:
 
 import json
 import logging
-from datetime import datetime
+import threading
+import time
+import httplib2
+from cachetools import LRUCache, TTLCache
+from datetime import datetime, timezone
+from functools import lru_cache
 from django.http import HttpRequest, HttpResponseRedirect
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.shortcuts import redirect
 from google.auth import exceptions as auth_exceptions
 from google.auth.transport.requests import Request
 from google.oauth2 import credentials
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import Resource, build_from_document
 from google_auth_oauthlib.flow import Flow
 from aomail.utils import security
 from aomail.utils.security import subscription
 from aomail.constants import (
     ALLOWED_PLANS,
+    GOOGLE_API_MAX_CONCURRENT_REQUESTS,
+    GOOGLE_API_MAX_REQUESTS_PER_SECOND,
+    GOOGLE_API_NUM_RETRIES,
     GOOGLE_CLIENT_ID,
     GOOGLE_CLIENT_SECRET,
     GOOGLE_TOKEN_URI,
@@ -41,6 +53,25 @@ from aomail.models import SocialAPI, Subscription
 LOGGER = logging.getLogger(__name__)
 
 
+######################## CREDENTIALS CACHE ########################
+CREDENTIALS_CACHE_TTL = 3000  # time in seconds, below the 1h access token lifetime
+CREDENTIALS_CACHE = TTLCache(maxsize=1024, ttl=CREDENTIALS_CACHE_TTL)
+CREDENTIALS_CACHE_LOCK = threading.Lock()
+CREDENTIALS_REFRESH_LOCKS = LRUCache(maxsize=1024)
+
+
+######################## HTTP CLIENTS ########################
+HTTP_LOCAL = threading.local()
+THREAD_SERVICES_MAXSIZE = 32
+
+
+######################## RATE LIMITING ########################
+GOOGLE_API_SEMAPHORE = threading.BoundedSemaphore(GOOGLE_API_MAX_CONCURRENT_REQUESTS)
+GOOGLE_API_REQUEST_INTERVAL = 1 / GOOGLE_API_MAX_REQUESTS_PER_SECOND
+GOOGLE_API_RATE_LOCK = threading.Lock()
+google_api_next_request_at = 0.0
+
+
 def generate_auth_url(request: HttpRequest) -> HttpResponseRedirect:
     """
     Generate a connection URL to obtain the authorization code.
@@ -161,8 +192,12 @@ def fetch_email_ids_since(service, email: str, start_date: datetime) -> list[str
         results = (
             service.users()
             .messages()
-            .list(userId="me", q=f"after:{int(start_date.timestamp())} -from:{email}")
-            .execute()
+            .list(
+                userId="me",
+                q=f"after:{int(start_date.timestamp())} -from:{email}",
+                fields="messages/id",
+            )
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
         messages = results.get("messages", [])
         email_ids = [message["id"] for message in messages]
@@ -263,6 +298,9 @@ def get_credentials(user: User, email: str) -> credentials.Credentials | None:
     """
     Retrieve and return Google API credentials for the specified user and email.
 
+    The credentials data is kept in a short-lived cache so that authenticated views
+    do not query and decrypt the SocialAPI on every request.
+
     Args:
         user (User): The user object.
         email (str): The email address associated with the user's Google account.
@@ -270,8 +308,21 @@ def get_credentials(user: User, email: str) -> credentials.Credentials | None:
     Returns:
         credentials.Credentials or None: The Google API credentials, or None if not found.
     """
-    try:
-        social_api = SocialAPI.objects.get(user=user, email=email)
+    cache_key = (user.id, email)
+    with CREDENTIALS_CACHE_LOCK:
+        creds_data = CREDENTIALS_CACHE.get(cache_key)
+
+    if not creds_data:
+        try:
+            social_api = SocialAPI.objects.only(
+                "access_token", "access_token_expiry", "refresh_token"
+            ).get(user=user, email=email)
+        except SocialAPI.DoesNotExist:
+            LOGGER.error(
+                f"No credentials for user with ID {user.id} and email: {email}"
+            )
+            return None
+
         refresh_token_encrypted = social_api.refresh_token
         refresh_token = security.decrypt_text(
             SOCIAL_API_REFRESH_TOKEN_KEY, refresh_token_encrypted
@@ -284,12 +335,38 @@ def get_credentials(user: User, email: str) -> credentials.Credentials | None:
             "client_secret": GOOGLE_CLIENT_SECRET,
             "scopes": GOOGLE_SCOPES,
         }
-        creds = credentials.Credentials.from_authorized_user_info(creds_data)
-    except SocialAPI.DoesNotExist:
-        LOGGER.error(f"No credentials for user with ID {user.id} and email: {email}")
-        creds = None
+        if social_api.access_token_expiry:
+            # google-auth expects a naive UTC expiry
+            expiry = social_api.access_token_expiry.astimezone(timezone.utc)
+            creds_data["expiry"] = expiry.replace(tzinfo=None).isoformat() + "Z"
+        with CREDENTIALS_CACHE_LOCK:
+            CREDENTIALS_CACHE[cache_key] = creds_data
 
-    return creds
+    return credentials.Credentials.from_authorized_user_info(creds_data)
+
+
+def get_refresh_lock(cache_key: tuple[int, str]) -> threading.Lock:
+    """
+    Returns the lock that serializes the token refreshes of a Google account.
+
+    Args:
+        cache_key (tuple[int, str]): The user ID and the email address of the account.
+
+    Returns:
+        threading.Lock: The refresh lock of the account.
+    """
+    with CREDENTIALS_CACHE_LOCK:
+        lock = CREDENTIALS_REFRESH_LOCKS.get(cache_key)
+        if lock is None:
+            lock = CREDENTIALS_REFRESH_LOCKS[cache_key] = threading.Lock()
+    return lock
+
+
+@receiver([post_save, post_delete], sender=SocialAPI)
+def forget_credentials(sender, instance: SocialAPI, **kwargs):
+    """Removes the cached credentials of a modified or deleted SocialAPI."""
+    with CREDENTIALS_CACHE_LOCK:
+        CREDENTIALS_CACHE.pop((instance.user_id, instance.email), None)
 
 
 def get_social_api(user: User, email: str) -> SocialAPI | None:
@@ -337,19 +414,144 @@ def save_credentials(creds: credentials.Credentials, user: User, email: str):
     """
     Update the database with the new access token for the specified user and email.
 
+    The refreshed credentials are saved and cached together with their expiry, so
+    that the next calls, from this process or another worker, reuse the token and
+    refresh it ahead of time instead of sending requests that fail with 401 and
+    refresh it again.
+
     Args:
         creds (credentials.Credentials): The updated Google API credentials.
         user (User): The user object.
         email (str): The email address associated with the user's social API.
     """
     try:
-        social_api = SocialAPI.objects.get(user=user, email=email)
-        social_api.access_token = creds.token
-        social_api.save()
+        SocialAPI.objects.filter(user=user, email=email).update(
+            access_token=creds.token,
+            access_token_expiry=(
+                creds.expiry.replace(tzinfo=timezone.utc) if creds.expiry else None
+            ),
+        )
+        creds_data = {
+            "token": creds.token,
+            "refresh_token": creds.refresh_token,
+            "token_uri": GOOGLE_TOKEN_URI,
+            "client_id": GOOGLE_CLIENT_ID,
+            "client_secret": GOOGLE_CLIENT_SECRET,
+            "scopes": GOOGLE_SCOPES,
+        }
+        if creds.expiry:
+            creds_data["expiry"] = creds.expiry.isoformat() + "Z"
+        with CREDENTIALS_CACHE_LOCK:
+            CREDENTIALS_CACHE[(user.id, email)] = creds_data
     except Exception as e:
         LOGGER.error(f"Failed to save credentials: {str(e)}")
 
 
+def wait_for_request_slot():
+    """
+    Blocks until the process may send its next Google API request.
+
+    Requests are spaced by at least GOOGLE_API_REQUEST_INTERVAL so that concurrent
+    workers do not exceed GOOGLE_API_MAX_REQUESTS_PER_SECOND together.
+    """
+    global google_api_next_request_at
+
+    with GOOGLE_API_RATE_LOCK:
+        now = time.monotonic()
+        request_at = max(now, google_api_next_request_at)
+        google_api_next_request_at = request_at + GOOGLE_API_REQUEST_INTERVAL
+
+    if request_at > now:
+        time.sleep(request_at - now)
+
+
+class ThrottledHttp(AuthorizedHttp):
+    """
+    Authorized HTTP client that caps the number of Google API requests in flight
+    and their rate across all threads of the process.
+
+    AuthorizedHttp calls request again after refreshing an expired token, that nested
+    call runs under the permit its outer call already holds.
+    """
+
+    def request(self, *args, **kwargs):
+        if getattr(HTTP_LOCAL, "holds_request_permit", False):
+            return super().request(*args, **kwargs)
+
+        wait_for_request_slot()
+        with GOOGLE_API_SEMAPHORE:
+            HTTP_LOCAL.holds_request_permit = True
+            try:
+                return super().request(*args, **kwargs)
+            finally:
+                HTTP_LOCAL.holds_request_permit = False
+
+
+def get_thread_http() -> httplib2.Http:
+    """
+    Returns the HTTP client of the current thread, creating it on first use.
+
+    Services built in the same thread share this client so that connections to Google
+    APIs are kept alive between calls. httplib2 clients are not thread-safe, hence one
+    client per thread.
+
+    Returns:
+        httplib2.Http: The HTTP client of the current thread.
+    """
+    http = getattr(HTTP_LOCAL, "http", None)
+    if http is None:
+        http = HTTP_LOCAL.http = httplib2.Http()
+    return http
+
+
+@lru_cache(maxsize=None)
+def get_discovery_document(service_name: str, version: str) -> dict:
+    """
+    Returns the discovery document of a Google API, parsed once per process.
+
+    Args:
+        service_name (str): The name of the Google API (e.g. "gmail").
+        version (str): The version of the Google API (e.g. "v1").
+
+    Returns:
+        dict: The parsed discovery document bundled with the API client library.
+    """
+    return json.loads(discovery_cache.get_static_doc(service_name, version))
+
+
+def build_service(
+    service_name: str, version: str, creds: credentials.Credentials
+) -> Resource:
+    """
+    Builds a Google API service from its cached discovery document.
+
+    Services are kept by the thread that built them and reused for as long as the
+    access token is unchanged, so the resource tree is not rebuilt on every call.
+
+    Args:
+        service_name (str): The name of the Google API (e.g. "gmail").
+        version (str): The version of the Google API (e.g. "v1").
+        creds (credentials.Credentials): The Google API credentials to use for the service.
+
+    Returns:
+        Resource: The Google API service object.
+    """
+    thread_services = getattr(HTTP_LOCAL, "services", None)
+    if thread_services is None:
+        thread_services = HTTP_LOCAL.services = LRUCache(
+            maxsize=THREAD_SERVICES_MAXSIZE
+        )
+
+    key = (service_name, version, creds.token)
+    service = thread_services.get(key)
+    if service is None:
+        service = thread_services[key] = build_from_document(
+            get_discovery_document(service_name, version),
+            http=ThrottledHttp(creds, http=get_thread_http()),
+        )
+    return service
+
+
 def build_services(
     creds: credentials.Credentials, required_services: list[str] = ["gmail", "people"]
 ) -> dict:
@@ -365,10 +567,8 @@ def build_services(
               where keys are service names and values are the initialized service objects.
     """
     available_services = {
-        "gmail": lambda: build("gmail", "v1", cache_discovery=False, credentials=creds),
-        "people": lambda: build(
-            "people", "v1", cache_discovery=False, credentials=creds
-        ),
+        "gmail": lambda: build_service("gmail", "v1", creds),
+        "people": lambda: build_service("people", "v1", creds),
     }
 
     services = {
@@ -398,16 +598,24 @@ def authenticate_service(
                       or None if authentication fails or if no valid services are specified.
     """
     creds = get_credentials(user, email)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds = refresh_credentials(creds)
-        if creds:
-            save_credentials(creds, user, email)
-        else:
-            LOGGER.error(
-                f"Failed to authenticate for user with ID {user.id} and email: {email}"
-            )
-            return None
+    if creds and not creds.valid:
+        # A single thread refreshes the token of an account, the others wait for it.
+        # The row is read again, another worker may have refreshed the token already
+        with get_refresh_lock((user.id, email)):
+            with CREDENTIALS_CACHE_LOCK:
+                CREDENTIALS_CACHE.pop((user.id, email), None)
+            creds = get_credentials(user, email)
+            if creds and not creds.valid:
+                if creds.expired and creds.refresh_token:
+                    creds = refresh_credentials(creds)
+                if creds:
+                    save_credentials(creds, user, email)
+
+    if not creds:
+        LOGGER.error(
+            f"Failed to authenticate for user with ID {user.id} and email: {email}"
+        )
+        return None
 
     services = build_services(creds, required_services or ["gmail", "people"])
     return services
@@ -5,18 +5,27 @@ Endpoints:
 - ✅ send_email: Sends an email using the Gmail API.
 """
 
+import io
 import logging
 import threading
 from rest_framework import status
+from django.contrib.auth.models import User
 from django.http import HttpRequest
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from aomail.utils.security import subscription
-from aomail.constants import ALLOW_ALL
+from aomail.constants import (
+    ALLOW_ALL,
+    GOOGLE_API_NUM_RETRIES,
+    GOOGLE_MEDIA_UPLOAD_THRESHOLD,
+)
 from aomail.email_providers.google.authentication import (
     authenticate_service,
 )
@@ -30,6 +39,32 @@ from aomail.ai_providers.utils import update_tokens_stats
 LOGGER = logging.getLogger(__name__)
 
 
+def send_message(service: Resource, message_bytes: bytes) -> dict:
+    """
+    Sends a serialized MIME message with the Gmail API.
+
+    Large messages are sent as a resumable media upload of the raw bytes rather than
+    being base64-encoded into the JSON body.
+
+    Args:
+        service (Resource): The authenticated Gmail API service.
+        message_bytes (bytes): The message, as returned by its as_bytes method.
+
+    Returns:
+        dict: The Gmail API representation of the sent message.
+    """
+    messages = service.users().messages()
+
+    if len(message_bytes) > GOOGLE_MEDIA_UPLOAD_THRESHOLD:
+        media_body = MediaIoBaseUpload(
+            io.BytesIO(message_bytes), mimetype="message/rfc822", resumable=True
+        )
+        return messages.send(userId="me", body={}, media_body=media_body).execute()
+
+    raw_message = urlsafe_b64encode(message_bytes).decode("ascii")
+    return messages.send(userId="me", body={"raw": raw_message}).execute()
+
+
 @api_view(["POST"])
 @subscription(ALLOW_ALL)
 def send_email(request: HttpRequest) -> Response:
@@ -59,49 +94,62 @@ def send_email(request: HttpRequest) -> Response:
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        service = authenticate_service(user, email, ["gmail"])["gmail"]
+        services = authenticate_service(user, email, ["gmail"])
+        if not services:
+            return Response(
+                {"error": "Failed to authenticate with Gmail"},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        service = services["gmail"]
 
         multipart_message = MIMEMultipart()
         multipart_message["subject"] = subject
         multipart_message["from"] = "me"
         multipart_message["to"] = ", ".join(to)
-
-        all_recipients = to
-
         if cc:
             multipart_message["cc"] = ", ".join(cc)
-            all_recipients += cc
         if bcc:
             multipart_message["bcc"] = ", ".join(bcc)
-            all_recipients += bcc
 
         multipart_message.attach(MIMEText(message, "html"))
 
-        if attachments:
-            for uploaded_file in attachments:
-                file_content = uploaded_file.read()
-                part = MIMEApplication(file_content)
-                part.add_header(
-                    "Content-Disposition", "attachment", filename=uploaded_file.name
-                )
-                multipart_message.attach(part)
-
-        raw_message = urlsafe_b64encode(
-            multipart_message.as_string().encode("UTF-8")
-        ).decode()
+        for uploaded_file in attachments:
+            part = MIMEApplication(uploaded_file.read())
+            part.add_header(
+                "Content-Disposition", "attachment", filename=uploaded_file.name
+            )
+            multipart_message.attach(part)
 
-        body = {"raw": raw_message}
-        service.users().messages().send(userId="me", body=body).execute()
+        # Not retried here: a failed send may still have been delivered by Gmail
+        send_message(service, multipart_message.as_bytes())
 
         threading.Thread(
             target=email_processing.save_contacts,
-            args=(user, all_recipients),
+            args=(user, to + cc + bcc),
         ).start()
 
         return Response(
             {"message": "Email sent successfully!"}, status=status.HTTP_200_OK
         )
 
+    except HttpError as e:
+        LOGGER.error(
+            f"Gmail rejected the email of user ID {request.user.id} with status {e.resp.status}: {str(e)}"
+        )
+        if e.resp.status == 429:
+            return Response(
+                {"error": "Gmail rate limit reached, try again later"},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        if e.resp.status < 500:
+            return Response(
+                {"error": "Gmail rejected the email"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {"error": "Gmail failed to send the email"},
+            status=status.HTTP_502_BAD_GATEWAY,
+        )
     except Exception as e:
         LOGGER.error(f"Failed to send email: {str(e)}")
         return Response(
@@ -166,7 +214,7 @@ def transfer_email(email_id: str, social_api: SocialAPI, recipients: list[str])
                             messageId=email_id,
                             id=attachment["attachmentId"],
                         )
-                        .execute()
+                        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
                     )
 
                     file_data = urlsafe_b64decode(
@@ -189,12 +237,7 @@ def transfer_email(email_id: str, social_api: SocialAPI, recipients: list[str])
                     )
                     continue
 
-        raw_message = urlsafe_b64encode(
-            multipart_message.as_string().encode("UTF-8")
-        ).decode()
-
-        body = {"raw": raw_message}
-        service.users().messages().send(userId="me", body=body).execute()
+        send_message(service, multipart_message.as_bytes())
 
         threading.Thread(
             target=email_processing.save_contacts,
@@ -244,7 +287,7 @@ def reply_email_google(email_entry: Email, prompt: str) -> bool:
 
         response = generate_email_response(
             email_entry.subject,
-            email_entry.html_content,
+            email_entry.body.html_content,
             prompt,
             agent_settings,
             signature,
@@ -266,12 +309,7 @@ def reply_email_google(email_entry: Email, prompt: str) -> bool:
         multipart_message["to"] = ", ".join(to)
         multipart_message.attach(MIMEText(message, "html"))
 
-        raw_message = urlsafe_b64encode(
-            multipart_message.as_string().encode("UTF-8")
-        ).decode()
-
-        body = {"raw": raw_message}
-        service.users().messages().send(userId="me", body=body).execute()
+        send_message(service, multipart_message.as_bytes())
 
         threading.Thread(
             target=email_processing.save_contacts,
@@ -10,9 +10,12 @@ import os
 from urllib.parse import unquote
 from django.contrib.auth.models import User
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from httpx import HTTPError
 from email.utils import parsedate_to_datetime
 from aomail.constants import (
+    GOOGLE_API_NUM_RETRIES,
+    GOOGLE_BATCH_MAX_REQUESTS,
     MEDIA_ROOT,
     MEDIA_URL,
     BASE_URL_API,
@@ -29,6 +32,11 @@ from bs4 import BeautifulSoup
 LOGGER = logging.getLogger(__name__)
 
 
+######################## REGULAR EXPRESSIONS ########################
+NAME_EMAIL_PATTERN = re.compile(r"(.*)\s*<(.+)>")
+BASE64_IMAGE_PATTERN = re.compile(r'<img[^>]+src="data:image/([^;]+);base64,([^"]+)"')
+
+
 def delete_email(user: User, email: str, email_id: str) -> dict:
     """
     Moves the email with the specified ID to the bin of the user's Gmail account.
@@ -47,19 +55,24 @@ def delete_email(user: User, email: str, email_id: str) -> dict:
         return {"error": "No gmail service provided"}
 
     try:
-        response = gmail.users().messages().trash(userId="me", id=email_id).execute()
+        response = (
+            gmail.users()
+            .messages()
+            .trash(userId="me", id=email_id)
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
 
         if "id" in response:
             return {"message": "Email moved to trash successfully!"}
         else:
-            LOGGER.error(f"Failed to move email with ID: {email_id} to trash")
+            LOGGER.error("Failed to move email with ID: %s to trash", email_id)
             return {"error": "Failed to move email to trash"}
     except HTTPError as e:
         if "Requested entity was not found" in str(e):
             return {"message": "Email moved to trash successfully!"}
         else:
             LOGGER.error(
-                f"Error when deleting email for user ID: {user.id}. Error: {str(e)}"
+                "Error when deleting email for user ID: %s. Error: %s", user.id, e
             )
             return {"error": "Internal server error"}
 
@@ -80,10 +93,10 @@ def set_email_read(user: User, email: str, email_id: str) -> dict:
     try:
         service.users().messages().modify(
             userId="me", id=email_id, body={"removeLabelIds": ["UNREAD"]}
-        ).execute()
+        ).execute(num_retries=GOOGLE_API_NUM_RETRIES)
         return {"message": "Email marked as read successfully!"}
     except Exception as e:
-        LOGGER.error(f"Failed to mark email ID {email_id} as read: {str(e)}")
+        LOGGER.error("Failed to mark email ID %s as read: %s", email_id, e)
         return {"error": "Internal server error"}
 
 
@@ -103,10 +116,10 @@ def set_email_unread(user: User, email: str, email_id: str) -> dict:
     try:
         service.users().messages().modify(
             userId="me", id=email_id, body={"addLabelIds": ["UNREAD"]}
-        ).execute()
+        ).execute(num_retries=GOOGLE_API_NUM_RETRIES)
         return {"message": "Email marked as unread successfully!"}
     except Exception as e:
-        LOGGER.error(f"Failed to mark email ID {email_id} as unread: {str(e)}")
+        LOGGER.error("Failed to mark email ID %s as unread: %s", email_id, e)
         return {"error": "Internal server error"}
 
 
@@ -192,15 +205,15 @@ def search_emails_ai(
         results: dict = (
             service.users()
             .messages()
-            .list(userId="me", q=query, maxResults=max_results)
-            .execute()
+            .list(userId="me", q=query, maxResults=max_results, fields="messages/id")
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
         messages = results.get("messages", [])
 
         return [message["id"] for message in messages]
 
     except Exception as e:
-        LOGGER.error(f"Failed to search emails from Google API with AI help: {str(e)}")
+        LOGGER.error("Failed to search emails from Google API with AI help: %s", e)
         return []
 
 
@@ -250,8 +263,13 @@ def search_emails_manually(
             results: dict = (
                 service.users()
                 .messages()
-                .list(userId="me", q=query, maxResults=max_results)
-                .execute()
+                .list(
+                    userId="me",
+                    q=query,
+                    maxResults=max_results,
+                    fields="messages/id,resultSizeEstimate",
+                )
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES)
             )
 
             if results.get("resultSizeEstimate") == 0:
@@ -259,7 +277,7 @@ def search_emails_manually(
             return results.get("messages", [])
         except Exception as e:
             LOGGER.error(
-                f"Failed to execute the search emails query from Google API: {str(e)}"
+                "Failed to execute the search emails query from Google API: %s", e
             )
             return []
 
@@ -320,7 +338,7 @@ def search_emails_manually(
         return [message["id"] for message in messages]
 
     except Exception as e:
-        LOGGER.error(f"Failed to search emails from Google API: {str(e)}")
+        LOGGER.error("Failed to search emails from Google API: %s", e)
         return []
 
 
@@ -341,14 +359,106 @@ def get_demo_list(user: User, email: str) -> list[str]:
     results: dict = (
         service.users()
         .messages()
-        .list(userId="me", labelIds=["INBOX"], maxResults=5)
-        .execute()
+        .list(userId="me", labelIds=["INBOX"], maxResults=5, fields="messages/id")
+        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
     )
     messages = results.get("messages", [])
 
     return [msg["id"] for msg in messages] if messages else []
 
 
+def save_history_id(social_api: SocialAPI, history_id: str):
+    """
+    Stores the Gmail history ID from which the next new messages will be listed.
+
+    Args:
+        social_api (SocialAPI): The social API instance of the Gmail account.
+        history_id (str): The Gmail history ID to store.
+    """
+    SocialAPI.objects.filter(id=social_api.id).update(history_id=str(history_id))
+    social_api.history_id = str(history_id)
+
+
+def get_new_email_ids(social_api: SocialAPI) -> list[str] | None:
+    """
+    Lists the inbox messages added since the last synced Gmail history ID.
+
+    Only the history delta is transferred instead of re-listing the inbox, and the
+    stored history ID is moved forward.
+
+    Args:
+        social_api (SocialAPI): The social API instance of the Gmail account.
+
+    Returns:
+        list[str] | None: The IDs of the new messages, oldest first, or None if no
+                          usable history ID is stored and the inbox must be read instead.
+    """
+    service = authenticate_service(social_api.user, social_api.email, ["gmail"])[
+        "gmail"
+    ]
+    last_history_id = (
+        SocialAPI.objects.filter(id=social_api.id)
+        .values_list("history_id", flat=True)
+        .first()
+    )
+
+    if not last_history_id:
+        profile = (
+            service.users()
+            .getProfile(userId="me")
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
+        save_history_id(social_api, profile["historyId"])
+        return None
+
+    email_ids = []
+    page_token = None
+    try:
+        while True:
+            response: dict = (
+                service.users()
+                .history()
+                .list(
+                    userId="me",
+                    startHistoryId=last_history_id,
+                    historyTypes=["messageAdded"],
+                    labelId="INBOX",
+                    pageToken=page_token,
+                    fields="history/messagesAdded/message/id,historyId,nextPageToken",
+                )
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+            )
+            for history in response.get("history", []):
+                for added in history.get("messagesAdded", []):
+                    email_id = added["message"]["id"]
+                    if email_id not in email_ids:
+                        email_ids.append(email_id)
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+    except HttpError as e:
+        # Gmail only keeps about a week of history, older IDs are rejected with a 404
+        if e.resp.status != 404:
+            raise
+        LOGGER.warning(
+            "Gmail history ID %s expired for user ID: %s",
+            last_history_id,
+            social_api.user.id,
+        )
+        profile = (
+            service.users()
+            .getProfile(userId="me")
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
+        save_history_id(social_api, profile["historyId"])
+        return None
+
+    save_history_id(social_api, response["historyId"])
+    return email_ids
+
+
 def get_mail_to_db(social_api: SocialAPI, email_id: str = None) -> dict:
     """
     Retrieves detailed email information from the Gmail API, processing it for storage in the database.
@@ -381,8 +491,8 @@ def get_mail_to_db(social_api: SocialAPI, email_id: str = None) -> dict:
         results: dict = (
             service.users()
             .messages()
-            .list(userId="me", labelIds=["INBOX"], maxResults=1)
-            .execute()
+            .list(userId="me", labelIds=["INBOX"], maxResults=1, fields="messages/id")
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
         messages = results.get("messages", [])
         if not messages:
@@ -392,7 +502,10 @@ def get_mail_to_db(social_api: SocialAPI, email_id: str = None) -> dict:
         email_id = message["id"]
 
     msg: dict[str, dict[str, dict[str]]] = (
-        service.users().messages().get(userId="me", id=email_id).execute()
+        service.users()
+        .messages()
+        .get(userId="me", id=email_id)
+        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
     )
     email_data = msg["payload"]["headers"]
 
@@ -427,23 +540,17 @@ def get_mail_to_db(social_api: SocialAPI, email_id: str = None) -> dict:
         if part["mimeType"] == "text/plain":
             if "data" in part["body"]:
                 data = part["body"]["data"]
-                decoded_data = base64.urlsafe_b64decode(data.encode("UTF-8")).decode(
-                    "utf-8"
-                )
+                decoded_data = base64.urlsafe_b64decode(data).decode("utf-8")
                 email_txt_html += f"<pre>{decoded_data}</pre>"
         elif part["mimeType"] == "text/html":
             if "data" in part["body"]:
                 email_detect_html = True
                 data = part["body"]["data"]
-                decoded_data = base64.urlsafe_b64decode(data.encode("UTF-8")).decode(
-                    "utf-8"
-                )
+                decoded_data = base64.urlsafe_b64decode(data).decode("utf-8")
                 email_html += decoded_data
 
                 # Find and replace base64 encoded images in the HTML
-                img_tags = re.findall(
-                    r'<img[^>]+src="data:image/([^;]+);base64,([^"]+)"', decoded_data
-                )
+                img_tags = BASE64_IMAGE_PATTERN.findall(decoded_data)
                 for img_type, img_data in img_tags:
                     image_filename = f"{uuid.uuid4()}.{img_type}"
                     image_files.append(image_filename)
@@ -480,7 +587,7 @@ def get_mail_to_db(social_api: SocialAPI, email_id: str = None) -> dict:
                     .messages()
                     .attachments()
                     .get(userId="me", messageId=email_id, id=attachment_id)
-                    .execute()
+                    .execute(num_retries=GOOGLE_API_NUM_RETRIES)
                 )
                 file_data = base64.urlsafe_b64decode(attachment["data"].encode("UTF-8"))
             elif "data" in part["body"]:
@@ -524,13 +631,13 @@ def get_mail_to_db(social_api: SocialAPI, email_id: str = None) -> dict:
         if src.startswith("cid:"):
             cid_ref = src[4:].strip().strip("<>").strip()
             cid_ref = unquote(cid_ref).lower()
-            LOGGER.info(f"Found CID in HTML: '{cid_ref}'")
+            LOGGER.debug("Found CID in HTML: '%s'", cid_ref)
             if cid_ref in cid_to_filename:
                 img["src"] = (
                     f"{BASE_URL_API}pictures/{cid_to_filename[cid_ref]}?v={uuid.uuid4()}"
                 )
             else:
-                LOGGER.error(f"CID '{cid_ref}' not found in mapping")
+                LOGGER.error("CID '%s' not found in mapping", cid_ref)
 
     cleaned_html = email_processing.html_clear(str(soup))
     preprocessed_data = email_processing.preprocess_email(cleaned_html)
@@ -567,11 +674,20 @@ def get_mail_id(services: dict, int_mail: int) -> str:
     """
     service = services["gmail"]
 
+    # Only the IDs up to the requested index are needed
     results: dict = (
-        service.users().messages().list(userId="me", labelIds=["INBOX"]).execute()
+        service.users()
+        .messages()
+        .list(
+            userId="me",
+            labelIds=["INBOX"],
+            maxResults=int_mail + 1,
+            fields="messages/id",
+        )
+        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
     )
     messages = results.get("messages", [])
-    if not messages:
+    if len(messages) <= int_mail:
         return None
 
     return messages[int_mail]["id"]
@@ -597,12 +713,11 @@ def get_mails_batch(services: dict, email_ids: list[str]) -> list[dict]:
             bcc_info (list[tuple[str, str]]): List of BCC recipients (name, email).
     """
     service = services["gmail"]
-    batch = service.new_batch_http_request()
     email_info = {}
 
     def callback(request_id, response, exception):
         if exception is not None:
-            LOGGER.error(f"Error fetching email {request_id}: {str(exception)}")
+            LOGGER.error("Error fetching email %s: %s", request_id, exception)
             return
 
         email_id = request_id
@@ -625,41 +740,14 @@ def get_mails_batch(services: dict, email_ids: list[str]) -> list[dict]:
                     parse_name_and_email(bcc) for bcc in values["value"].split(",")
                 ]
 
-        has_attachments = False
         is_reply = "in-reply-to" in {
             header["name"].lower() for header in msg["payload"]["headers"]
         }
-        email_html = ""
-        email_txt_html = ""
-
-        def process_part(part):
-            nonlocal email_html, email_txt_html, has_attachments
-
-            if part["mimeType"] == "text/plain":
-                if "data" in part["body"]:
-                    data = part["body"]["data"]
-                    decoded_data = base64.urlsafe_b64decode(
-                        data.encode("UTF-8")
-                    ).decode("utf-8")
-                    email_txt_html += f"<pre>{decoded_data}</pre>"
-            elif part["mimeType"] == "text/html":
-                if "data" in part["body"]:
-                    data = part["body"]["data"]
-                    decoded_data = base64.urlsafe_b64decode(
-                        data.encode("UTF-8")
-                    ).decode("utf-8")
-                    email_html += decoded_data
-            elif "filename" in part:
-                has_attachments = True
-
-        if "parts" in msg["payload"]:
-            for part in msg["payload"]["parts"]:
-                process_part(part)
-        else:
-            process_part(msg["payload"])
-
-        if not email_html:
-            email_html = email_txt_html
+        parts = msg["payload"].get("parts", [msg["payload"]])
+        has_attachments = any(
+            part["mimeType"] not in ("text/plain", "text/html") and "filename" in part
+            for part in parts
+        )
 
         email_info[email_id] = {
             "subject": subject,
@@ -674,20 +762,30 @@ def get_mails_batch(services: dict, email_ids: list[str]) -> list[dict]:
     # Ensure email_ids are unique
     unique_email_ids = list(set(email_ids))
 
-    for email_id in unique_email_ids:
+    # Only the headers and the structure of the parts are requested, the bodies are
+    # not needed, and a batch holds at most GOOGLE_BATCH_MAX_REQUESTS calls
+    for start in range(0, len(unique_email_ids), GOOGLE_BATCH_MAX_REQUESTS):
+        batch = service.new_batch_http_request()
+        for email_id in unique_email_ids[start : start + GOOGLE_BATCH_MAX_REQUESTS]:
+            try:
+                batch.add(
+                    service.users()
+                    .messages()
+                    .get(
+                        userId="me",
+                        id=email_id,
+                        fields="payload(headers,mimeType,filename,parts(mimeType,filename))",
+                    ),
+                    callback=callback,
+                    request_id=email_id,
+                )
+            except Exception as e:
+                LOGGER.error("Error adding email %s to batch: %s", email_id, e)
+
         try:
-            batch.add(
-                service.users().messages().get(userId="me", id=email_id),
-                callback=callback,
-                request_id=email_id,
-            )
+            batch.execute()
         except Exception as e:
-            LOGGER.error(f"Error adding email {email_id} to batch: {str(e)}")
-
-    try:
-        batch.execute()
-    except Exception as e:
-        LOGGER.error(f"Error executing batch request: {str(e)}")
+            LOGGER.error("Error executing batch request: %s", e)
 
     return list(email_info.values())
 
@@ -712,22 +810,22 @@ def get_mail(services: dict, int_mail: int = None, id_mail: str = None) -> tuple
             - sent_date (datetime.datetime): Date and time the email was sent.
     """
     service = services["gmail"]
+    # Shared with process_part, which flags it once a plain text part is found
     plaintext_var = [0]
-    plaintext_var[0] = 0
 
     if int_mail:
-        results = (
-            service.users().messages().list(userId="me", labelIds=["INBOX"]).execute()
-        )
-        messages = results.get("messages", [])
-        if not messages:
+        email_id = get_mail_id(services, int_mail)
+        if not email_id:
             return None
-        message = messages[int_mail]
-        email_id = message["id"]
     elif id_mail:
         email_id = id_mail
 
-    msg = service.users().messages().get(userId="me", id=email_id).execute()
+    msg = (
+        service.users()
+        .messages()
+        .get(userId="me", id=email_id)
+        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+    )
 
     subject = from_info = decoded_data = None
     cc_info = bcc_info = []
@@ -755,8 +853,9 @@ def get_mail(services: dict, int_mail: int = None, id_mail: str = None) -> tuple
                 )
     elif "body" in msg["payload"]:
         data = msg["payload"]["body"]["data"]
-        data = data.replace("-", "+").replace("_", "/")
-        decoded_data_temp = base64.b64decode(data).decode("utf-8")
+        decoded_data_temp = base64.urlsafe_b64decode(data).decode(
+            "utf-8", errors="replace"
+        )
         decoded_data = email_processing.html_clear(decoded_data_temp)
 
     return (
@@ -794,8 +893,16 @@ def get_attachment_data(
             return {}
 
         gmail_service = services["gmail"]
+        # Only the names and IDs of the attachments are needed to find the right one
         message = (
-            gmail_service.users().messages().get(userId="me", id=email_id).execute()
+            gmail_service.users()
+            .messages()
+            .get(
+                userId="me",
+                id=email_id,
+                fields="payload/parts(filename,body/attachmentId)",
+            )
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
 
         if "payload" in message:
@@ -810,7 +917,7 @@ def get_attachment_data(
                             .messages()
                             .attachments()
                             .get(userId="me", messageId=email_id, id=attachment_id)
-                            .execute()
+                            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
                         )
 
                         data = attachment["data"]
@@ -824,7 +931,10 @@ def get_attachment_data(
 
     except Exception as e:
         LOGGER.error(
-            f"Failed to get attachment data for email ID {email_id} and attachment {attachment_name}: {str(e)}"
+            "Failed to get attachment data for email ID %s and attachment %s: %s",
+            email_id,
+            attachment_name,
+            e,
         )
         return {}
 
@@ -844,7 +954,7 @@ def parse_name_and_email(header_value: str) -> tuple[str | None, str]:
     if not header_value:
         return None, None
 
-    match = re.match(r"(.*)\s*<(.+)>", header_value)
+    match = NAME_EMAIL_PATTERN.match(header_value)
     if match:
         name, email = match.groups()
         return name.strip(), email.strip()
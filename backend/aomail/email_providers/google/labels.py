@@ -17,6 +17,7 @@ from aomail.constants import (
     HIGHLY_RELEVANT,
     POSSIBLY_RELEVANT,
     NOT_RELEVANT,
+    GOOGLE_API_NUM_RETRIES,
 )
 
 
@@ -45,10 +46,15 @@ def replicate_labels(social_api: SocialAPI, ai_output: dict, email_id: str):
         ai_output (dict): AI output containing email categorization details.
         email_id (str): ID of the email to update.
     """
-    LOGGER.info(f"Replication of labels on Gmail for {social_api.email} started")
+    LOGGER.info("Replication of labels on Gmail for %s started", social_api.email)
 
     gmail = authenticate_service(social_api.user, social_api.email, ["gmail"])["gmail"]
-    labels_list = gmail.users().labels().list(userId="me").execute()
+    labels_list = (
+        gmail.users()
+        .labels()
+        .list(userId="me")
+        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+    )
     existing_labels = labels_list.get("labels", [])
 
     allowed_colors = {
@@ -214,8 +220,10 @@ def replicate_labels(social_api: SocialAPI, ai_output: dict, email_id: str):
         userId="me",
         id=email_id,
         body={"addLabelIds": label_ids},
-    ).execute()
+    ).execute(num_retries=GOOGLE_API_NUM_RETRIES)
 
     LOGGER.info(
-        f"Labels replicated successfully on Gmail for {social_api.email} and email_id: {email_id}"
+        "Labels replicated successfully on Gmail for %s and email_id: %s",
+        social_api.email,
+        email_id,
     )
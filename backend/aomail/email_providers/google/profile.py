@@ -7,33 +7,47 @@ Endpoints:
 
 import datetime
 import logging
-import re
+import threading
 import time
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import getaddresses
 from rest_framework import status
 from django.http import HttpRequest
 from django.contrib.auth.models import User
-from collections import defaultdict
+from django.db import transaction
 from google.oauth2 import credentials
-from googleapiclient.discovery import build
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from aomail.utils.security import subscription
 from aomail.constants import (
     ALLOW_ALL,
+    GOOGLE_API_NUM_RETRIES,
+    GOOGLE_BATCH_FALLBACK_MAX_WORKERS,
+    GOOGLE_BATCH_MAX_REQUESTS,
     GOOGLE_CLIENT_ID,
     GOOGLE_CLIENT_SECRET,
     GOOGLE_SCOPES,
     GOOGLE_TOKEN_URI,
 )
-from aomail.email_providers.google.authentication import authenticate_service
+from aomail.email_providers.google.authentication import (
+    authenticate_service,
+    build_service,
+)
 from aomail.utils import email_processing
-from aomail.models import SocialAPI
+from aomail.models import Contact, SocialAPI
 
 
 ######################## LOGGING CONFIGURATION ########################
 LOGGER = logging.getLogger(__name__)
 
 
+######################## STATISTICS CACHE ########################
+STATISTICS_CACHE_TTL = 10  # time in seconds
+STATISTICS_CACHE = TTLCache(maxsize=1024, ttl=STATISTICS_CACHE_TTL)
+STATISTICS_CACHE_LOCK = threading.Lock()
+
+
 def get_email(access_token: str, refresh_token: str) -> dict:
     """
     Returns the primary email of the user from Google People API.
@@ -57,11 +71,11 @@ def get_email(access_token: str, refresh_token: str) -> dict:
     creds = credentials.Credentials.from_authorized_user_info(creds_data)
 
     try:
-        service = build("people", "v1", credentials=creds)
+        service = build_service("people", "v1", creds)
         user_info: dict[str, list[dict]] = (
             service.people()
             .get(resourceName="people/me", personFields="emailAddresses")
-            .execute()
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
         email = user_info.get("emailAddresses", [{}])[0].get("value", "")
         if email:
@@ -97,7 +111,7 @@ def get_info_contacts(services: dict) -> list[dict]:
             pageSize=1000,
             personFields="names,emailAddresses",
         )
-        .execute()
+        .execute(num_retries=GOOGLE_API_NUM_RETRIES)
     )
 
     contacts = results.get("connections", [])
@@ -126,137 +140,263 @@ def set_all_contacts(user: User, email: str):
     )
     start = time.time()
 
-    def refresh_services():
-        """Authenticate and return the necessary Google API services."""
-        return authenticate_service(user, email, ["people", "gmail"])
+    # Each service is built by the worker thread that uses it, as services are not thread-safe
+    services = threading.local()
 
-    services = refresh_services()
-    contacts_service = services["people"]
-    gmail = services["gmail"]
-
-    try:
-        all_contacts = defaultdict(set)
-        email_count = 0
+    def refresh_service(service_name: str):
+        """Authenticate and store the given Google API service for the current thread."""
+        setattr(
+            services,
+            service_name,
+            authenticate_service(user, email, [service_name])[service_name],
+        )
 
-        def make_service_call(service_function):
-            nonlocal contacts_service, gmail
-            for attempt in range(2):
-                try:
-                    return service_function()
-                except Exception as e:
-                    if attempt == 0:
-                        LOGGER.warning(
-                            f"Service authorization failed, retrying with refreshed token. Error: {str(e)}"
-                        )
-                        new_services = refresh_services()
-                        contacts_service = new_services["people"]
-                        gmail = new_services["gmail"]
-                    else:
-                        LOGGER.error("Request failed after token refresh.")
-                        raise Exception(
-                            "Token refresh failed, cannot continue request."
-                        )
-
-        # Part 1: Retrieve contacts from Google Contacts
-        next_page_token = None
-        while True:
-
-            def fetch_contacts():
-                """Fetch connections from Google Contacts."""
-                return (
-                    contacts_service.people()
-                    .connections()
-                    .list(
-                        resourceName="people/me",
-                        personFields="names,emailAddresses,metadata",
-                        pageSize=1000,
-                        pageToken=next_page_token,
+    def make_service_call(service_function, service_name: str):
+        for attempt in range(2):
+            try:
+                return service_function()
+            except Exception as e:
+                if attempt == 0:
+                    LOGGER.warning(
+                        f"Service authorization failed, retrying with refreshed token. Error: {str(e)}"
                     )
-                    .execute()
-                )
+                    refresh_service(service_name)
+                else:
+                    LOGGER.error("Request failed after token refresh.")
+                    raise Exception("Token refresh failed, cannot continue request.")
+
+    def get_from_header(message: dict) -> str | None:
+        headers = message.get("payload", {}).get("headers", [])
+        return next((item["value"] for item in headers if item["name"] == "From"), None)
+
+    # Part 1: Retrieve contacts and other contacts from Google Contacts
+    def list_contacts_page(page_token: str | None) -> dict:
+        """List one page of connections from Google Contacts."""
+        return make_service_call(
+            lambda: services.people.people()
+            .connections()
+            .list(
+                resourceName="people/me",
+                personFields="names,emailAddresses,metadata",
+                pageSize=1000,
+                pageToken=page_token,
+            )
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES),
+            "people",
+        )
 
-            response = make_service_call(fetch_contacts)
-            connections = response.get("connections", [])
-            next_page_token = response.get("nextPageToken")
-
-            for contact in connections:
-                names = contact.get("names", [{}])
-                email_addresses = contact.get("emailAddresses", [])
-                metadata = contact.get("metadata", {})
-                contact_id = metadata.get("sources", [{}])[0].get("id", "")
-                name = names[0].get("displayName", "") if names else ""
-
-                for email_info in email_addresses:
-                    email_address = email_info.get("value", "")
-                    if email_address:
-                        all_contacts[(name, email_address, user.id, contact_id)].add(
-                            email_address
-                        )
-
-            if not next_page_token:
-                break
-
-        # Part 2: Retrieve the latest emails from Gmail, up to 5,000 messages
-        messages_endpoint = gmail.users().messages().list(userId="me", q="")
-        while email_count < 5000:
-            response = make_service_call(lambda: messages_endpoint.execute())
-            messages = response.get("messages", [])
+    def list_other_contacts_page(page_token: str | None) -> dict:
+        """List one page of the other contacts (people emailed but not saved)."""
+        return make_service_call(
+            lambda: services.people.otherContacts()
+            .list(
+                readMask="names,emailAddresses,metadata",
+                pageSize=1000,
+                pageToken=page_token,
+            )
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES),
+            "people",
+        )
 
-            for msg in messages:
-                if email_count >= 5000:
-                    break
+    def fetch_people(list_page, people_key: str) -> list[tuple]:
+        """Fetch every page of a People API listing, prefetching the next page."""
+        contacts = []
+        # Every People API call runs on the single page worker so the service and its
+        # thread-local connection are only ever used from that thread
+        with ThreadPoolExecutor(max_workers=1) as page_executor:
+            page_executor.submit(refresh_service, "people").result()
+            page_future = page_executor.submit(list_page, None)
+            while page_future:
+                response = page_future.result()
+                next_page_token = response.get("nextPageToken")
+                page_future = (
+                    page_executor.submit(list_page, next_page_token)
+                    if next_page_token
+                    else None
+                )
 
-                message = make_service_call(
-                    lambda: gmail.users()
+                for contact in response.get(people_key, []):
+                    names = contact.get("names", [{}])
+                    email_addresses = contact.get("emailAddresses", [])
+                    metadata = contact.get("metadata", {})
+                    contact_id = metadata.get("sources", [{}])[0].get("id", "")
+                    name = names[0].get("displayName", "") if names else ""
+
+                    for email_info in email_addresses:
+                        email_address = email_info.get("value", "")
+                        if email_address:
+                            contacts.append((name, email_address, user.id, contact_id))
+
+        return contacts
+
+    # Part 2: Retrieve the latest emails from Gmail, up to 5,000 messages
+    thread_local = threading.local()
+
+    def fetch_from_header(message_id: str) -> str | None:
+        """Fetch the From header of a message with a Gmail service owned by the current thread."""
+        try:
+            if not hasattr(thread_local, "gmail"):
+                thread_local.gmail = authenticate_service(user, email, ["gmail"])[
+                    "gmail"
+                ]
+            message = (
+                thread_local.gmail.users()
+                .messages()
+                .get(
+                    userId="me",
+                    id=message_id,
+                    format="metadata",
+                    metadataHeaders=["From"],
+                    fields="payload/headers",
+                )
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+            )
+            return get_from_header(message)
+        except Exception as e:
+            LOGGER.warning(f"Error fetching sender of message {message_id}: {str(e)}")
+            return None
+
+    def fetch_from_headers(message_ids: list[str]) -> list[str]:
+        """Fetch the From header of messages with batched Gmail requests."""
+        gmail = services.gmail
+        from_values = []
+        failed_ids = []
+
+        def collect_from_header(request_id, response, exception):
+            if exception is not None:
+                failed_ids.append(request_id)
+                return
+            from_value = get_from_header(response)
+            if from_value:
+                from_values.append(from_value)
+
+        for start in range(0, len(message_ids), GOOGLE_BATCH_MAX_REQUESTS):
+            batch = gmail.new_batch_http_request(callback=collect_from_header)
+            for message_id in message_ids[start : start + GOOGLE_BATCH_MAX_REQUESTS]:
+                batch.add(
+                    gmail.users()
                     .messages()
                     .get(
                         userId="me",
-                        id=msg["id"],
+                        id=message_id,
                         format="metadata",
                         metadataHeaders=["From"],
-                    )
-                    .execute()
+                        fields="payload/headers",
+                    ),
+                    request_id=message_id,
                 )
-                headers = message.get("payload", {}).get("headers", [])
-                from_header = next(
-                    (item for item in headers if item["name"] == "From"), None
+            batch.execute()
+
+        # Requests rejected inside a batch (e.g. rate limited) are retried concurrently
+        if failed_ids:
+            LOGGER.warning(
+                f"Retrying {len(failed_ids)} Gmail requests that failed in batch for user ID: {user.id}"
+            )
+            with ThreadPoolExecutor(
+                max_workers=GOOGLE_BATCH_FALLBACK_MAX_WORKERS
+            ) as executor:
+                from_values.extend(
+                    from_value
+                    for from_value in executor.map(fetch_from_header, failed_ids)
+                    if from_value
                 )
 
-                if from_header:
-                    from_value = from_header["value"]
-                    if "reply" in from_value.lower():
-                        continue
-
-                    email_match = re.search(r"[\w\.-]+@[\w\.-]+", from_value)
-                    name_match = re.search(r'(?:"?([^"]*)"?\s)?', from_value)
+        return from_values
 
-                    email = email_match.group(0) if email_match else None
-                    name = (
-                        name_match.group(1)
-                        if name_match and name_match.group(1)
-                        else email
+    def fetch_message_senders() -> list[tuple]:
+        """Fetch the senders of the latest Gmail messages."""
+        refresh_service("gmail")
+        senders = []
+        email_count = 0
+        page_token = None
+        while email_count < 5000:
+            response = make_service_call(
+                lambda: services.gmail.users()
+                .messages()
+                .list(
+                    userId="me",
+                    pageToken=page_token,
+                    fields="messages/id,nextPageToken",
+                )
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES),
+                "gmail",
+            )
+            message_ids = [
+                msg["id"] for msg in response.get("messages", [])[: 5000 - email_count]
+            ]
+            from_values = make_service_call(
+                lambda: fetch_from_headers(message_ids), "gmail"
+            )
+
+            for from_value in from_values:
+                if "reply" in from_value.lower():
+                    continue
+
+                sender_name, sender_email = getaddresses([from_value])[0]
+                if "@" in sender_email:
+                    senders.append(
+                        (sender_name or sender_email, sender_email, user.id, "")
                     )
 
-                    if email and (name, email, user.id, "") not in all_contacts:
-                        all_contacts[(name, email, user.id, "")].add(email)
-
-                email_count += 1
+            email_count += len(message_ids)
 
             # Pagination for Gmail messages
-            if "nextPageToken" in response and email_count < 5000:
-                messages_endpoint = (
-                    gmail.users()
-                    .messages()
-                    .list(userId="me", pageToken=response["nextPageToken"])
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return senders
+
+        return senders
+
+    try:
+        # Contacts, other contacts and message senders are independent and fetched concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                "contacts": executor.submit(
+                    fetch_people, list_contacts_page, "connections"
+                ),
+                "other contacts": executor.submit(
+                    fetch_people, list_other_contacts_page, "otherContacts"
+                ),
+                "message senders": executor.submit(fetch_message_senders),
+            }
+            # One entry per email, the first named source wins: saved contacts, then
+            # other contacts, then message senders
+            all_contacts: dict[str, tuple[str, str]] = {}
+            for source, future in futures.items():
+                # A failing source does not discard the contacts of the others
+                try:
+                    source_contacts = future.result()
+                except Exception as e:
+                    LOGGER.error(
+                        f"Error fetching {source} from Google API for user ID {user.id}: {str(e)}"
+                    )
+                    continue
+
+                for name, contact_email, _, contact_id in source_contacts:
+                    if name and contact_email:
+                        all_contacts.setdefault(contact_email, (name, contact_id))
+
+        # Part 3: Save the new contacts to the database in a single round trip
+        existing_emails = set(
+            Contact.objects.filter(user=user).values_list("email", flat=True)
+        )
+        new_contacts = []
+        for contact_email, (name, contact_id) in all_contacts.items():
+            if contact_email in existing_emails or email_processing.is_no_reply_email(
+                contact_email
+            ):
+                continue
+            new_contacts.append(
+                Contact(
+                    user=user,
+                    username=name,
+                    email=contact_email,
+                    provider_id=contact_id,
                 )
-            else:
-                break
+            )
 
-        # Part 3: Save contacts to the database
-        for contact_info in all_contacts.keys():
-            name, email, _, contact_id = contact_info
-            if name and email:
-                email_processing.save_email_sender(user, name, email, contact_id)
+        with transaction.atomic():
+            Contact.objects.bulk_create(new_contacts, batch_size=500)
 
         formatted_time = str(datetime.timedelta(seconds=time.time() - start))
         LOGGER.info(
@@ -289,7 +429,7 @@ def get_profile_image(request: HttpRequest) -> Response:
         profile = (
             service.people()
             .get(resourceName="people/me", personFields="photos")
-            .execute()
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
 
         if "photos" in profile:
@@ -317,57 +457,65 @@ def get_data(social_api: SocialAPI) -> dict:
     """
     Retrieve email statistics for a given Google social API.
 
+    The counters are read from the Gmail profile and system labels in a single batch
+    request, and kept for a few seconds to absorb bursts of statistics refreshes.
+
     Args:
         social_api (SocialAPI): The social API instance for the user.
 
     Returns:
         dict: A dictionary containing email statistics.
     """
+    with STATISTICS_CACHE_LOCK:
+        data = STATISTICS_CACHE.get(social_api.id)
+    if data is not None:
+        return data
+
     gmail_service = authenticate_service(social_api.user, social_api.email, ["gmail"])[
         "gmail"
     ]
+    users = gmail_service.users()
+    responses = {}
+    errors = []
 
-    # Use the Gmail API to get counts directly
-    num_emails_received = (
-        gmail_service.users()
-        .messages()
-        .list(userId="me")
-        .execute()
-        .get("resultSizeEstimate", 0)
-    )
-    num_emails_read = (
-        gmail_service.users()
-        .messages()
-        .list(userId="me", q="is:read")
-        .execute()
-        .get("resultSizeEstimate", 0)
-    )
-    num_emails_archived = (
-        gmail_service.users()
-        .messages()
-        .list(userId="me", q="in:archive")
-        .execute()
-        .get("resultSizeEstimate", 0)
-    )
-    num_emails_starred = (
-        gmail_service.users()
-        .messages()
-        .list(userId="me", q="is:starred")
-        .execute()
-        .get("resultSizeEstimate", 0)
+    def collect_response(request_id, response, exception):
+        if exception is not None:
+            errors.append(exception)
+        else:
+            responses[request_id] = response
+
+    # Label counters are exact and cheap, only archived emails need a search query.
+    # Partial responses keep each part of the batch down to the counter it is read for
+    batch = gmail_service.new_batch_http_request(callback=collect_response)
+    batch.add(
+        users.getProfile(userId="me", fields="messagesTotal"), request_id="profile"
     )
-    num_emails_sent = (
-        gmail_service.users()
-        .messages()
-        .list(userId="me", q="in:sent")
-        .execute()
-        .get("resultSizeEstimate", 0)
+    for label_id in ("UNREAD", "STARRED", "SENT"):
+        batch.add(
+            users.labels().get(userId="me", id=label_id, fields="messagesTotal"),
+            request_id=label_id,
+        )
+    batch.add(
+        users.messages().list(
+            userId="me", q="in:archive", maxResults=1, fields="resultSizeEstimate"
+        ),
+        request_id="archive",
     )
+    batch.execute()
+    if errors:
+        raise errors[0]
 
-    return {
+    num_emails_received = responses["profile"].get("messagesTotal", 0)
+    data = {
         "num_emails_received": num_emails_received,
-        "num_emails_read": num_emails_read,
-        "num_emails_archived": num_emails_archived,
-        "num_emails_starred": num_emails_starred,
-        "num_emails_sent": num_emails_sent,
+        "num_emails_read": max(
+            num_emails_received - responses["UNREAD"].get("messagesTotal", 0), 0
+        ),
+        "num_emails_archived": responses["archive"].get("resultSizeEstimate", 0),
+        "num_emails_starred": responses["STARRED"].get("messagesTotal", 0),
+        "num_emails_sent": responses["SENT"].get("messagesTotal", 0),
     }
+    with STATISTICS_CACHE_LOCK:
+        STATISTICS_CACHE[social_api.id] = data
+
+    return data
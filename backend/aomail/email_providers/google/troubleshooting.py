@@ -8,7 +8,6 @@ Endpoints:
 
 import json
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from django.http import HttpRequest
 from rest_framework.response import Response
 from rest_framework import status
@@ -22,7 +21,7 @@ from aomail.email_providers.google.authentication import (
     authenticate_service,
     fetch_email_ids_since,
 )
-from aomail.email_providers.utils import email_to_db
+from aomail.email_providers.utils import emails_to_db
 from aomail.email_providers.google.webhook import (
     check_and_resubscribe_to_missing_resources,
 )
@@ -102,24 +101,14 @@ def synchronize(request: HttpRequest) -> Response:
         f"Starting to process {len(email_ids)} emails for user ID: {user.id} and social API ID: {social_api.id}"
     )
 
-    nb_processed_emails = 0
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_email_id = {}
-
-        for email_id in email_ids:
-            if Email.objects.filter(provider_id=email_id).exists():
-                continue
-
-            future = executor.submit(email_to_db, social_api, email_id)
-            future_to_email_id[future] = email_id
-
-        for future in as_completed(future_to_email_id):
-            email_id = future_to_email_id[future]
-            try:
-                if future.result():  # Increment count if email_to_db returns True
-                    nb_processed_emails += 1
-            except Exception as e:
-                LOGGER.error(f"Error processing email ID {email_id}: {str(e)}")
+    saved_ids = set(
+        Email.objects.filter(provider_id__in=email_ids).values_list(
+            "provider_id", flat=True
+        )
+    )
+    nb_processed_emails = emails_to_db(
+        social_api, [email_id for email_id in email_ids if email_id not in saved_ids]
+    )
 
     LOGGER.info(
         f"All emails have been processed. Processed: {nb_processed_emails}, Missed: {nb_missed_emails}"
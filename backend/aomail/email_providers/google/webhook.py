@@ -7,23 +7,23 @@ Endpoints:
 
 import base64
 import logging
+import orjson
 import threading
-import json
+from asgiref.sync import sync_to_async
 from rest_framework import status
 from django.utils import timezone
-from django.http import HttpRequest
+from django.http import HttpRequest, JsonResponse
 from django.contrib.auth.models import User
-from django.db import IntegrityError
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from aomail.constants import (
+    GOOGLE_API_NUM_RETRIES,
     GOOGLE_PROJECT_ID,
     GOOGLE_TOPIC_NAME,
 )
 from aomail.email_providers.google.authentication import authenticate_service
 from aomail.models import GoogleListener, SocialAPI, Subscription
-from aomail.email_providers.utils import email_to_db
+from aomail.email_providers.utils import enqueue_email_to_db
 from aomail.email_providers.google import authentication as auth_google
 
 
@@ -48,55 +48,66 @@ def check_and_resubscribe_to_missing_resources(user: User, email: str):
         )
 
 
-@api_view(["POST"])
-@permission_classes([AllowAny])
-def receive_mail_notifications(request: HttpRequest) -> Response:
+@csrf_exempt
+@require_POST
+async def receive_mail_notifications(request: HttpRequest) -> JsonResponse:
     """
     Process email notifications from Google listener.
 
+    The view is asynchronous so that waiting on the routing queries does not hold a
+    worker thread while Google waits for the acknowledgement.
+
     Args:
         request (HttpRequest): The HTTP request object containing the email notification data.
 
     Returns:
-        Response: A JSON response indicating the status of the notification processing.
+        JsonResponse: A JSON response indicating the status of the notification processing.
     """
     try:
-        envelope = json.loads(request.body.decode("utf-8"))
+        envelope = orjson.loads(request.body)
         message_data = envelope["message"]
 
-        decoded_data = base64.b64decode(message_data["data"]).decode("utf-8")
-        decoded_json: dict = json.loads(decoded_data)
+        # The decoded bytes are parsed directly, without an intermediate str
+        decoded_json: dict = orjson.loads(base64.b64decode(message_data["data"]))
         email = decoded_json.get("emailAddress")
 
         LOGGER.info(
-            f"Email notification received from Google API. Starting email processing for: {email}"
+            "Email notification received from Google API. Starting email processing for: %s",
+            email,
         )
 
+        # Only the lookups needed to route the notification and storing it as pending run
+        # before the ack, the emails are fetched and processed in the background
         try:
-            social_api = SocialAPI.objects.get(email=email)
-            subscription = Subscription.objects.get(user=social_api.user)
+            social_api = await SocialAPI.objects.select_related("user").aget(
+                email=email
+            )
+            is_blocked = await Subscription.objects.filter(
+                user_id=social_api.user_id, is_block=True
+            ).aexists()
 
-            if subscription.is_block:
+            if is_blocked:
                 LOGGER.info(
-                    f"User with email: {email} is blocked. Unsubscribing user from Google notifications."
+                    "User with email: %s is blocked. Unsubscribing user from Google notifications.",
+                    email,
                 )
-                unsubscribe_from_email_notifications(social_api.user, email)
+                threading.Thread(
+                    target=unsubscribe_from_email_notifications,
+                    args=(social_api.user, email),
+                ).start()
             else:
-                threading.Thread(target=email_to_db, args=(social_api,)).start()
+                await sync_to_async(enqueue_email_to_db)(social_api)
 
         except SocialAPI.DoesNotExist:
             pass
 
-        return Response({"status": "Notification received"}, status=status.HTTP_200_OK)
-
-    except IntegrityError:
-        return Response(
-            {"status": "Email already exists in database"}, status=status.HTTP_200_OK
+        return JsonResponse(
+            {"status": "Notification received"}, status=status.HTTP_200_OK
         )
 
     except Exception as e:
-        LOGGER.error(f"Error processing the notification: {str(e)}")
-        return Response(
+        LOGGER.error("Error processing the notification: %s", e)
+        return JsonResponse(
             {"error": "Internal server error"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
@@ -115,7 +126,9 @@ def subscribe_to_email_notifications(user: User, email: str) -> bool:
     """
     try:
         LOGGER.info(
-            f"Initiating subscription to Google email notifications for user ID: {user.id} with email: {email}"
+            "Initiating subscription to Google email notifications for user ID: %s with email: %s",
+            user.id,
+            email,
         )
         services = authenticate_service(user, email, ["gmail"])
         if services is None:
@@ -128,22 +141,36 @@ def subscribe_to_email_notifications(user: User, email: str) -> bool:
             "topicName": f"projects/{GOOGLE_PROJECT_ID}/topics/{GOOGLE_TOPIC_NAME}",
         }
 
-        response = gmail.users().watch(userId="me", body=request_body).execute()
+        response = (
+            gmail.users()
+            .watch(userId="me", body=request_body)
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
 
         if "historyId" in response:
+            # New emails will be listed from the Gmail history starting at this point
+            SocialAPI.objects.filter(
+                user=user, email=email, history_id__isnull=True
+            ).update(history_id=response["historyId"])
             LOGGER.info(
-                f"Successfully subscribed to email notifications for user ID {user.id} and email {email}"
+                "Successfully subscribed to email notifications for user ID %s and email %s",
+                user.id,
+                email,
             )
             return True
         else:
             LOGGER.error(
-                f"Failed to subscribe to email notifications for user with ID: {user.id} and email {email}"
+                "Failed to subscribe to email notifications for user with ID: %s and email %s",
+                user.id,
+                email,
             )
             return False
 
     except Exception as e:
         LOGGER.error(
-            f"An error occurred while subscribing to Google email notifications for user ID: {user.id}: {str(e)}"
+            "An error occurred while subscribing to Google email notifications for user ID: %s: %s",
+            user.id,
+            e,
         )
         return False
 
@@ -166,21 +193,33 @@ def unsubscribe_from_email_notifications(user: User, email: str) -> bool:
 
         service = services["gmail"]
 
-        response = service.users().stop(userId="me").execute()
+        response = (
+            service.users()
+            .stop(userId="me")
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
 
         if not response:
             LOGGER.info(
-                f"Successfully unsubscribed user ID {user.id} ({email}) from all notifications."
+                "Successfully unsubscribed user ID %s (%s) from all notifications.",
+                user.id,
+                email,
             )
             return True
         else:
             LOGGER.error(
-                f"Failed to unsubscribe user ID {user.id} with email: {email}. Response: {response}"
+                "Failed to unsubscribe user ID %s with email: %s. Response: %s",
+                user.id,
+                email,
+                response,
             )
             return False
 
     except Exception as e:
         LOGGER.error(
-            f"An error occurred while unsubscribing user ID {user.id} with email: {email}: {str(e)}"
+            "An error occurred while unsubscribing user ID %s with email: %s: %s",
+            user.id,
+            email,
+            e,
         )
         return False
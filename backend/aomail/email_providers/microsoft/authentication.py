@@ -9,14 +9,23 @@ Endpoints:
 
 import json
 import logging
+import threading
+import time
+import orjson
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone as dt_timezone
+from email.utils import parsedate_to_datetime
 from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
 from urllib.parse import urlencode
 from rest_framework.decorators import api_view
 from django.contrib.auth.models import User
 from django.http import HttpRequest, HttpResponseRedirect
 from django.shortcuts import redirect
+from django.utils import timezone
 from rest_framework.response import Response
 from rest_framework import status
 from msal import ConfidentialClientApplication
@@ -24,12 +33,17 @@ from aomail.utils.security import subscription
 from aomail.utils import security
 from aomail.constants import (
     ALLOWED_PLANS,
+    GRAPH_MAX_CONCURRENT_WRITES,
+    GRAPH_MAX_RETRIES,
+    GRAPH_POOL_MAXSIZE,
+    GRAPH_RETRY_BACKOFF_FACTOR,
     GRAPH_URL,
     MICROSOFT_AUTHORITY,
     MICROSOFT_CLIENT_ID,
     MICROSOFT_CLIENT_SECRET,
     MICROSOFT_CLIENT_STATE,
     MICROSOFT_SCOPES,
+    MICROSOFT_TOKEN_EXPIRY_MARGIN,
     REDIRECT_URI_LINK_EMAIL,
     REDIRECT_URI_SIGNUP,
     SOCIAL_API_REFRESH_TOKEN_KEY,
@@ -41,6 +55,77 @@ from aomail.models import SocialAPI, Subscription
 LOGGER = logging.getLogger(__name__)
 
 
+######################## HTTP SESSIONS ########################
+# Shared keep-alive sessions so that Graph API and token calls reuse TLS connections.
+# Throttled or failed idempotent requests are retried, honoring Retry-After
+GRAPH_RETRY = Retry(
+    total=GRAPH_MAX_RETRIES,
+    backoff_factor=GRAPH_RETRY_BACKOFF_FACTOR,
+    status_forcelist=[429, 500, 502, 503, 504],
+    raise_on_status=False,
+)
+GRAPH_WRITE_SEMAPHORE = threading.BoundedSemaphore(GRAPH_MAX_CONCURRENT_WRITES)
+
+
+def get_retry_delay(response: requests.Response, attempt: int) -> float:
+    """
+    Returns how long to wait before sending a throttled Graph API request again.
+
+    Args:
+        response (requests.Response): The 429 response sent by Graph.
+        attempt (int): The number of retries already made, starting at 0.
+
+    Returns:
+        float: The delay in seconds from the Retry-After header, given either as a
+            number of seconds or as an HTTP date, or an exponential back-off when the
+            header is missing or invalid.
+    """
+    retry_after = response.headers.get("Retry-After", "")
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+        return max((retry_date - datetime.now(dt_timezone.utc)).total_seconds(), 0)
+    except (TypeError, ValueError):
+        return 2**attempt
+
+
+class GraphSession(requests.Session):
+    """
+    Session that caps the number of Graph API writes in flight across the process.
+
+    POST and PATCH requests are not retried by the adapter, so the ones Graph throttles
+    are sent again after the delay given in its Retry-After header. JSON bodies are
+    serialized with orjson, the headers from get_headers already set their type.
+    """
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        if kwargs.get("json") is not None and kwargs.get("data") is None:
+            kwargs["data"] = orjson.dumps(kwargs.pop("json"))
+
+        if method.upper() not in ("POST", "PATCH"):
+            return super().request(method, url, *args, **kwargs)
+
+        for attempt in range(GRAPH_MAX_RETRIES + 1):
+            with GRAPH_WRITE_SEMAPHORE:
+                response = super().request(method, url, *args, **kwargs)
+            if response.status_code != 429 or attempt == GRAPH_MAX_RETRIES:
+                return response
+            # The permit is released while waiting so that other writes keep going
+            time.sleep(get_retry_delay(response, attempt))
+
+
+GRAPH_SESSION = GraphSession()
+GRAPH_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_maxsize=GRAPH_POOL_MAXSIZE, max_retries=GRAPH_RETRY),
+)
+LOGIN_SESSION = requests.Session()
+
+
 def generate_auth_url(request: HttpRequest) -> HttpResponseRedirect:
     """
     Generate a connection URL to obtain the authorization code for Microsoft.
@@ -173,7 +258,7 @@ def fetch_email_ids_since(access_token: str, start_date: datetime) -> list[str]:
     start_date_str = start_date.strftime("%Y-%m-%dT%H:%M:%S") + "Z"
 
     try:
-        response = requests.get(
+        response = GRAPH_SESSION.get(
             f"{GRAPH_URL}me/messages?$filter=receivedDateTime ge {start_date_str}",
             headers=headers,
         )
@@ -275,22 +360,26 @@ def link_email_tokens(authorization_code: str) -> tuple[str, str] | tuple[None,
         return None, None
 
 
-def get_headers(access_token: str) -> dict:
+@lru_cache(maxsize=256)
+def get_headers(access_token: str) -> MappingProxyType:
     """
     Returns the default headers for making authenticated API requests.
 
+    The result is cached per access token and returned as a read-only mapping
+    so that it can be safely shared between calls.
+
     Args:
         access_token (str): The access token obtained from OAuth2 authentication.
 
     Returns:
-        dict: A dictionary containing the HTTP headers with 'Content-Type' set to 'application/json'
+        MappingProxyType: A read-only mapping containing the HTTP headers with 'Content-Type' set to 'application/json'
               and 'Authorization' set to the provided access token using the Bearer scheme.
     """
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {access_token}",
     }
-    return headers
+    return MappingProxyType(headers)
 
 
 def get_social_api(user: User, email: str) -> SocialAPI | None:
@@ -314,36 +403,26 @@ def get_social_api(user: User, email: str) -> SocialAPI | None:
         return None
 
 
-def is_token_valid(access_token: str) -> bool:
-    """
-    Checks if the access token is still valid by making a sample request to a sample URL.
-
-    Args:
-        access_token (str): The access token to be validated.
-
-    Returns:
-        bool: True if the access token is valid (status code 200), False otherwise.
-    """
-    sample_url = f"{GRAPH_URL}me"
-    headers = get_headers(access_token)
-    response = requests.get(sample_url, headers=headers)
-    return response.status_code == 200
-
-
-def refresh_access_token(social_api: SocialAPI) -> str | None:
+def refresh_access_token(
+    social_api: SocialAPI, force_refresh: bool = False
+) -> str | None:
     """
     Returns a valid access token for the provided SocialAPI instance.
 
+    The stored token is reused until MICROSOFT_TOKEN_EXPIRY_MARGIN seconds before its
+    expiry without asking Graph whether it is still valid. Tokens of unknown expiry
+    are refreshed once to learn it.
+
     Args:
         social_api (SocialAPI): The SocialAPI instance containing the access and refresh tokens.
+        force_refresh (bool): Whether to refresh a token that Graph rejected before its expiry.
 
     Returns:
         str | None: A valid access token if successfully refreshed, otherwise None.
     """
-    access_token = social_api.access_token
-
-    if is_token_valid(access_token):
-        return access_token
+    expiry = social_api.access_token_expiry
+    if not force_refresh and expiry and timezone.now() < expiry:
+        return social_api.access_token
 
     refresh_url = f"{MICROSOFT_AUTHORITY}/oauth2/v2.0/token"
     refresh_token_encrypted = social_api.refresh_token
@@ -358,13 +437,17 @@ def refresh_access_token(social_api: SocialAPI) -> str | None:
         "scope": " ".join(MICROSOFT_SCOPES),
     }
 
-    response = requests.post(refresh_url, data=data)
+    response = LOGIN_SESSION.post(refresh_url, data=data)
     response_data: defaultdict = response.json()
 
     if "access_token" in response_data:
         access_token = response_data["access_token"]
         social_api.access_token = access_token
-        social_api.save()
+        social_api.access_token_expiry = timezone.now() + timedelta(
+            seconds=response_data["expires_in"] - MICROSOFT_TOKEN_EXPIRY_MARGIN
+        )
+        # Only the token fields are saved, the caller's other fields may be stale
+        social_api.save(update_fields=["access_token", "access_token_expiry"])
         return access_token
     else:
         error = response_data.get("error_description", response.reason)
@@ -9,16 +9,14 @@ Endpoints:
 import base64
 import logging
 import threading
-import requests
 from django.http import HttpRequest
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from aomail.utils.security import subscription
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from django.core.files.uploadedfile import UploadedFile
 from aomail.email_providers.microsoft.authentication import (
+    GRAPH_SESSION,
     get_headers,
     get_social_api,
     refresh_access_token,
@@ -34,6 +32,52 @@ from aomail.ai_providers.google.client import generate_email_response
 LOGGER = logging.getLogger(__name__)
 
 
+def build_email_content(
+    subject: str,
+    message: str,
+    to: list[str],
+    cc: list[str],
+    bcc: list[str],
+    attachments: list[UploadedFile],
+) -> dict:
+    """
+    Builds the body of a Microsoft Graph sendMail request.
+
+    Attachments are sent as file attachments, each file being read and base64-encoded
+    once, without building a MIME message.
+
+    Args:
+        subject (str): The subject of the email.
+        message (str): The HTML body of the email.
+        to (list[str]): The email addresses of the main recipients.
+        cc (list[str]): The email addresses of the CC recipients.
+        bcc (list[str]): The email addresses of the BCC recipients.
+        attachments (list[UploadedFile]): The files to attach.
+
+    Returns:
+        dict: The sendMail request body.
+    """
+    return {
+        "message": {
+            "subject": subject,
+            "body": {"contentType": "HTML", "content": message},
+            "toRecipients": [{"emailAddress": {"address": email}} for email in to],
+            "ccRecipients": [{"emailAddress": {"address": email}} for email in cc],
+            "bccRecipients": [{"emailAddress": {"address": email}} for email in bcc],
+            "attachments": [
+                {
+                    "@odata.type": "#microsoft.graph.fileAttachment",
+                    "name": uploaded_file.name,
+                    "contentBytes": base64.b64encode(uploaded_file.read()).decode(
+                        "ascii"
+                    ),
+                }
+                for uploaded_file in attachments
+            ],
+        }
+    }
+
+
 @api_view(["POST"])
 @subscription(ALLOW_ALL)
 def send_schedule_email(request: HttpRequest) -> Response:
@@ -75,66 +119,12 @@ def send_schedule_email(request: HttpRequest) -> Response:
         graph_endpoint = f"{GRAPH_URL}me/sendMail"
         headers = get_headers(access_token)
 
-        multipart_message = MIMEMultipart()
-        multipart_message["subject"] = subject
-        multipart_message["from"] = "me"
-        multipart_message["to"] = ", ".join(to)
-
-        all_recipients = to
+        all_recipients = to + cc + bcc
+        email_content = build_email_content(subject, message, to, cc, bcc, attachments)
 
-        if cc:
-            multipart_message["cc"] = ", ".join(cc)
-            all_recipients += cc
-        if bcc:
-            multipart_message["bcc"] = ", ".join(bcc)
-            all_recipients += bcc
-
-        multipart_message.attach(MIMEText(message, "html"))
-
-        if attachments:
-            for uploaded_file in attachments:
-                file_content = uploaded_file.read()
-                part = MIMEApplication(file_content)
-                part.add_header(
-                    "Content-Disposition", "attachment", filename=uploaded_file.name
-                )
-                multipart_message.attach(part)
-
-        raw_message = base64.b64encode(
-            multipart_message.as_string().encode("utf-8")
-        ).decode("utf-8")
-
-        email_content = {
-            "message": {
-                "subject": subject,
-                "body": {"contentType": "HTML", "content": message},
-                "toRecipients": [{"emailAddress": {"address": email}} for email in to],
-                "ccRecipients": (
-                    [{"emailAddress": {"address": email}} for email in cc] if cc else []
-                ),
-                "bccRecipients": (
-                    [{"emailAddress": {"address": email}} for email in bcc]
-                    if bcc
-                    else []
-                ),
-                "attachments": (
-                    [
-                        {
-                            "@odata.type": "#microsoft.graph.fileAttachment",
-                            "name": uploaded_file.name,
-                            "contentBytes": base64.b64encode(
-                                uploaded_file.read()
-                            ).decode("utf-8"),
-                        }
-                        for uploaded_file in attachments
-                    ]
-                    if attachments
-                    else []
-                ),
-            }
-        }
-
-        response = requests.post(graph_endpoint, headers=headers, json=email_content)
+        response = GRAPH_SESSION.post(
+            graph_endpoint, headers=headers, json=email_content
+        )
 
         if response.status_code == 202:
             threading.Thread(
@@ -204,66 +194,12 @@ def send_email(request: HttpRequest) -> Response:
         graph_endpoint = f"{GRAPH_URL}me/sendMail"
         headers = get_headers(access_token)
 
-        multipart_message = MIMEMultipart()
-        multipart_message["subject"] = subject
-        multipart_message["from"] = "me"
-        multipart_message["to"] = ", ".join(to)
-
-        all_recipients = to
-
-        if cc:
-            multipart_message["cc"] = ", ".join(cc)
-            all_recipients += cc
-        if bcc:
-            multipart_message["bcc"] = ", ".join(bcc)
-            all_recipients += bcc
-
-        multipart_message.attach(MIMEText(message, "html"))
-
-        if attachments:
-            for uploaded_file in attachments:
-                file_content = uploaded_file.read()
-                part = MIMEApplication(file_content)
-                part.add_header(
-                    "Content-Disposition", "attachment", filename=uploaded_file.name
-                )
-                multipart_message.attach(part)
-
-        raw_message = base64.b64encode(
-            multipart_message.as_string().encode("utf-8")
-        ).decode("utf-8")
-
-        email_content = {
-            "message": {
-                "subject": subject,
-                "body": {"contentType": "HTML", "content": message},
-                "toRecipients": [{"emailAddress": {"address": email}} for email in to],
-                "ccRecipients": (
-                    [{"emailAddress": {"address": email}} for email in cc] if cc else []
-                ),
-                "bccRecipients": (
-                    [{"emailAddress": {"address": email}} for email in bcc]
-                    if bcc
-                    else []
-                ),
-                "attachments": (
-                    [
-                        {
-                            "@odata.type": "#microsoft.graph.fileAttachment",
-                            "name": uploaded_file.name,
-                            "contentBytes": base64.b64encode(
-                                uploaded_file.read()
-                            ).decode("utf-8"),
-                        }
-                        for uploaded_file in attachments
-                    ]
-                    if attachments
-                    else []
-                ),
-            }
-        }
+        all_recipients = to + cc + bcc
+        email_content = build_email_content(subject, message, to, cc, bcc, attachments)
 
-        response = requests.post(graph_endpoint, headers=headers, json=email_content)
+        response = GRAPH_SESSION.post(
+            graph_endpoint, headers=headers, json=email_content
+        )
 
         if response.status_code == 202:
             threading.Thread(
@@ -335,7 +271,9 @@ def transfer_email(email_id: str, social_api: SocialAPI, recipients: list[str])
                 try:
                     # As we can not forward directly via Microsoft API, we must re-download each attachment
                     attachment_url = f"{GRAPH_URL}me/messages/{email_id}/attachments/{attachment['id']}"
-                    attachment_response = requests.get(attachment_url, headers=headers)
+                    attachment_response = GRAPH_SESSION.get(
+                        attachment_url, headers=headers
+                    )
 
                     if attachment_response.status_code == 200:
                         attachment_data = attachment_response.json()
@@ -360,7 +298,9 @@ def transfer_email(email_id: str, social_api: SocialAPI, recipients: list[str])
                     continue
 
         graph_endpoint = f"{GRAPH_URL}me/sendMail"
-        response = requests.post(graph_endpoint, headers=headers, json=email_content)
+        response = GRAPH_SESSION.post(
+            graph_endpoint, headers=headers, json=email_content
+        )
 
         if response.status_code == 202:
             threading.Thread(
@@ -418,7 +358,7 @@ def reply_email_microsoft(email_entry: Email, prompt: str) -> bool:
 
         response = generate_email_response(
             email_entry.subject,
-            email_entry.html_content,
+            email_entry.body.html_content,
             prompt,
             agent_settings,
             signature,
@@ -443,7 +383,9 @@ def reply_email_microsoft(email_entry: Email, prompt: str) -> bool:
         }
 
         graph_endpoint = f"{GRAPH_URL}me/sendMail"
-        response = requests.post(graph_endpoint, headers=headers, json=email_content)
+        response = GRAPH_SESSION.post(
+            graph_endpoint, headers=headers, json=email_content
+        )
 
         if response.status_code == 202:
             threading.Thread(
@@ -4,10 +4,12 @@ Provides email search and operation functions using Microsoft Graph API.
 
 import datetime
 import logging
+import orjson
 import requests
 from django.utils.timezone import make_aware
 from django.contrib.auth.models import User
 from aomail.email_providers.microsoft.authentication import (
+    GRAPH_SESSION,
     get_headers,
     get_social_api,
     refresh_access_token,
@@ -100,7 +102,7 @@ def delete_email(social_api: SocialAPI, email_id: str) -> dict:
     url = f"{GRAPH_URL}/me/messages/{email_id}/move"
     data = {"destinationId": "deleteditems"}
 
-    response = requests.post(url, headers=headers, json=data)
+    response = GRAPH_SESSION.post(url, headers=headers, json=data)
 
     if "id" in response.text:
         return {"message": "Email moved to trash successfully!"}
@@ -124,7 +126,9 @@ def set_email_read(social_api: SocialAPI, email_id: int):
     access_token = refresh_access_token(social_api)
     headers = get_headers(access_token)
     data = {"isRead": True}
-    requests.patch(f"{GRAPH_URL}/me/messages/{email_id}/", headers=headers, json=data)
+    GRAPH_SESSION.patch(
+        f"{GRAPH_URL}/me/messages/{email_id}/", headers=headers, json=data
+    )
 
 
 def set_email_unread(social_api: SocialAPI, email_id: int):
@@ -138,7 +142,9 @@ def set_email_unread(social_api: SocialAPI, email_id: int):
     access_token = refresh_access_token(social_api)
     headers = get_headers(access_token)
     data = {"isRead": False}
-    requests.patch(f"{GRAPH_URL}/me/messages/{email_id}/", headers=headers, json=data)
+    GRAPH_SESSION.patch(
+        f"{GRAPH_URL}/me/messages/{email_id}/", headers=headers, json=data
+    )
 
 
 def search_emails_ai(
@@ -209,8 +215,8 @@ def search_emails_ai(
     def run_request(graph_endpoint: str):
         """Function to run the email search request"""
         try:
-            headers = {"Authorization": f"Bearer {access_token}"}
-            response = requests.get(graph_endpoint, headers=headers, params=params)
+            headers = get_headers(access_token)
+            response = GRAPH_SESSION.get(graph_endpoint, headers=headers, params=params)
             response.raise_for_status()
             data: dict = response.json()
             messages = data.get("value", [])
@@ -302,14 +308,14 @@ def search_emails_manually(
     Returns:
         list[str]: A list of email IDs that match the criteria.
     """
-    headers = {"Authorization": f"Bearer {access_token}"}
+    headers = get_headers(access_token)
     folder_url = f"{GRAPH_URL}me/mailFolders/"
     graph_endpoint = f"{folder_url}inbox/messages"
     message_ids = []
 
     def run_request(graph_endpoint, params):
         try:
-            response = requests.get(graph_endpoint, headers=headers, params=params)
+            response = GRAPH_SESSION.get(graph_endpoint, headers=headers, params=params)
             response.raise_for_status()
             data: dict = response.json()
             messages = data.get("value", [])
@@ -359,7 +365,7 @@ def search_emails_manually(
             """
             params["$filter"] = filter_expression
 
-        response = requests.get(graph_endpoint, headers=headers, params=params)
+        response = GRAPH_SESSION.get(graph_endpoint, headers=headers, params=params)
         response.raise_for_status()
         response_data: dict = response.json()
         messages = response_data.get("value", [])
@@ -423,7 +429,7 @@ def get_demo_list(user: User, email: str) -> list[str]:
         "$top": 5,
         "$select": "id",
     }
-    response = requests.get(url, headers=headers, params=params)
+    response = GRAPH_SESSION.get(url, headers=headers, params=params)
     messages = response.json().get("value", [])
 
     return [msg["id"] for msg in messages] if messages else []
@@ -444,7 +450,7 @@ def fetch_attachments(social_api: SocialAPI, email_id: str) -> list:
     headers = get_headers(access_token)
 
     attachments_url = f"{GRAPH_URL}me/messages/{email_id}/attachments"
-    response = requests.get(attachments_url, headers=headers)
+    response = GRAPH_SESSION.get(attachments_url, headers=headers)
 
     if response.status_code != 200:
         raise Exception(
@@ -483,14 +489,14 @@ def get_mail_to_db(social_api: SocialAPI, email_id: str) -> dict:
     access_token = refresh_access_token(social_api)
     headers = get_headers(access_token)
 
-    response = requests.get(url, headers=headers)
+    response = GRAPH_SESSION.get(url, headers=headers)
 
     if response.status_code != 200:
         raise Exception(
             f"Failed to fetch email: {response.status_code}, {response.text}"
         )
 
-    message_data: dict = response.json()
+    message_data: dict = orjson.loads(response.content)
 
     has_attachments = message_data.get("hasAttachments", False)
     subject: str = message_data.get("subject", "")
@@ -568,11 +574,14 @@ def get_mail(access_token: str, int_mail: int = None, id_mail: str = None) -> tu
     headers = get_headers(access_token)
 
     if int_mail:
-        response = requests.get(url, headers=headers)
+        # Only the IDs up to the requested index are needed
+        response = GRAPH_SESSION.get(
+            url, headers=headers, params={"$top": int_mail + 1, "$select": "id"}
+        )
         response_data: dict = response.json()
         messages = response_data.get("value", [])
 
-        if not messages:
+        if len(messages) <= int_mail:
             return None
 
         email_id = messages[int_mail]["id"]
@@ -580,7 +589,7 @@ def get_mail(access_token: str, int_mail: int = None, id_mail: str = None) -> tu
         email_id = id_mail
 
     message_url = f"{url}/{email_id}"
-    response = requests.get(message_url, headers=headers)
+    response = GRAPH_SESSION.get(message_url, headers=headers)
     message_data: dict = response.json()
 
     subject = message_data.get("subject")
@@ -642,7 +651,7 @@ def get_attachment_data(
         attachment_url = (
             f"{GRAPH_URL}me/messages/{email_id}/attachments/{attachment.id_api}/$value"
         )
-        response = requests.get(attachment_url, headers=headers)
+        response = GRAPH_SESSION.get(attachment_url, headers=headers)
 
         if response.status_code != 200:
             LOGGER.error(
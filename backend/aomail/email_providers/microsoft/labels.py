@@ -6,9 +6,9 @@ Features:
 """
 
 import logging
-import requests
 from aomail.models import SocialAPI
 from aomail.email_providers.microsoft.authentication import (
+    GRAPH_SESSION,
     get_headers,
     refresh_access_token,
 )
@@ -27,7 +27,7 @@ def replicate_labels(social_api: SocialAPI, ai_output: dict, email_id: str):
         ai_output (dict): AI output containing email categorization details.
         email_id (str): ID of the email to update.
     """
-    LOGGER.info(f"Replication of labels on Outlook for {social_api.email} started")
+    LOGGER.info("Replication of labels on Outlook for %s started", social_api.email)
 
     category_colors = {
         "important": "Preset16",  # Orange
@@ -63,45 +63,47 @@ def replicate_labels(social_api: SocialAPI, ai_output: dict, email_id: str):
 
         # Update the email with categories (labels)
         update_payload = {"categories": categories_to_apply}
-        LOGGER.info(f"Attempting to apply categories: {categories_to_apply}")
+        LOGGER.info("Attempting to apply categories: %s", categories_to_apply)
 
-        update_response = requests.patch(
+        update_response = GRAPH_SESSION.patch(
             email_url, headers=headers, json=update_payload
         )
 
         if update_response.status_code != 200:
-            LOGGER.error(f"Failed to apply categories: {update_response.json()}")
+            LOGGER.error("Failed to apply categories: %s", update_response.json())
 
         # Move email to category folder
         folder_id = ensure_folder_exists(headers, ai_output["topic"])
         if folder_id:
             move_url = f"{GRAPH_URL}me/messages/{email_id}/move"
-            move_response = requests.post(
+            move_response = GRAPH_SESSION.post(
                 move_url, headers=headers, json={"destinationId": folder_id}
             )
 
             if move_response.status_code != 201:
-                LOGGER.error(f"Failed to move email: {move_response.json()}")
+                LOGGER.error("Failed to move email: %s", move_response.json())
 
         LOGGER.info(
-            f"Labels replicated successfully for email_id: {email_id} and social_api email: {social_api.email}"
+            "Labels replicated successfully for email_id: %s and social_api email: %s",
+            email_id,
+            social_api.email,
         )
 
     except Exception as e:
-        LOGGER.error(f"Failed to replicate labels: {str(e)}")
+        LOGGER.error("Failed to replicate labels: %s", e)
 
 
 def get_existing_categories(headers):
     """Get existing categories from Outlook."""
     try:
-        response = requests.get(
+        response = GRAPH_SESSION.get(
             f"{GRAPH_URL}me/outlook/masterCategories", headers=headers
         )
         if response.status_code == 200:
             return {cat["displayName"] for cat in response.json().get("value", [])}
         return set()
     except Exception as e:
-        LOGGER.error(f"Failed to get existing categories: {str(e)}")
+        LOGGER.error("Failed to get existing categories: %s", e)
         return set()
 
 
@@ -109,16 +111,18 @@ def create_category(headers: dict, category_name: str, color: str) -> bool:
     """Create a category in Outlook."""
     try:
         payload = {"displayName": category_name, "color": color}
-        response = requests.post(
+        response = GRAPH_SESSION.post(
             f"{GRAPH_URL}me/outlook/masterCategories", headers=headers, json=payload
         )
         if response.status_code == 201:
-            LOGGER.info(f"Created category: {category_name}")
+            LOGGER.info("Created category: %s", category_name)
             return True
-        LOGGER.warning(f"Failed to create category {category_name}: {response.json()}")
+        LOGGER.warning(
+            "Failed to create category %s: %s", category_name, response.json()
+        )
         return False
     except Exception as e:
-        LOGGER.error(f"Error creating category {category_name}: {str(e)}")
+        LOGGER.error("Error creating category %s: %s", category_name, e)
         return False
 
 
@@ -126,7 +130,7 @@ def ensure_folder_exists(headers: dict, folder_name: str) -> str | None:
     """Ensure folder exists and return its ID."""
     try:
         # First try to find existing folder
-        response = requests.get(f"{GRAPH_URL}me/mailFolders", headers=headers)
+        response = GRAPH_SESSION.get(f"{GRAPH_URL}me/mailFolders", headers=headers)
         if response.status_code == 200:
             folders = response.json().get("value", [])
             for folder in folders:
@@ -134,7 +138,7 @@ def ensure_folder_exists(headers: dict, folder_name: str) -> str | None:
                     return folder["id"]
 
         # Create new folder if not found
-        response = requests.post(
+        response = GRAPH_SESSION.post(
             f"{GRAPH_URL}me/mailFolders",
             headers=headers,
             json={"displayName": folder_name},
@@ -142,8 +146,8 @@ def ensure_folder_exists(headers: dict, folder_name: str) -> str | None:
         if response.status_code == 201:
             return response.json()["id"]
 
-        LOGGER.error(f"Failed to create folder: {response.json()}")
+        LOGGER.error("Failed to create folder: %s", response.json())
         return None
     except Exception as e:
-        LOGGER.error(f"Error managing folder {folder_name}: {str(e)}")
+        LOGGER.error("Error managing folder %s: %s", folder_name, e)
         return None
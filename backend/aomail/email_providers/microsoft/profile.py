@@ -8,9 +8,10 @@ Endpoints:
 import base64
 import datetime
 import logging
+import threading
 import time
-import requests
-from collections import defaultdict
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from django.contrib.auth.models import User
 from django.http import HttpRequest
 from rest_framework import status
@@ -18,13 +19,14 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from aomail.utils.security import subscription
 from aomail.email_providers.microsoft.authentication import (
+    GRAPH_SESSION,
     get_headers,
     get_social_api,
     refresh_access_token,
 )
 from aomail.utils import email_processing
-from aomail.constants import ALLOW_ALL, GRAPH_URL
-from aomail.models import SocialAPI
+from aomail.constants import ALLOW_ALL, GRAPH_URL, MICROSOFT_PROFILE_PHOTO_SIZE
+from aomail.models import Contact, SocialAPI
 
 
 ######################## LOGGING CONFIGURATION ########################
@@ -43,7 +45,7 @@ def verify_license(access_token: str) -> bool:
     """
     graph_endpoint = f"{GRAPH_URL}me/licenseDetails"
     headers = get_headers(access_token)
-    response = requests.get(graph_endpoint, headers=headers)
+    response = GRAPH_SESSION.get(graph_endpoint, headers=headers)
 
     if response.status_code == 200:
         data: dict = response.json()
@@ -69,9 +71,9 @@ def get_email(access_token: str) -> dict:
         return {"error": "Access token is missing"}
 
     try:
-        graph_api_endpoint = f"{GRAPH_URL}me"
+        graph_api_endpoint = f"{GRAPH_URL}me?$select=mail"
         headers = get_headers(access_token)
-        response = requests.get(graph_api_endpoint, headers=headers)
+        response = GRAPH_SESSION.get(graph_api_endpoint, headers=headers)
         json_data: dict = response.json()
 
         if response.status_code == 200:
@@ -103,7 +105,7 @@ def get_info_contacts(access_token: str) -> list:
         headers = get_headers(access_token)
         params = {"$top": 1000}
 
-        response = requests.get(graph_endpoint, headers=headers, params=params)
+        response = GRAPH_SESSION.get(graph_endpoint, headers=headers, params=params)
         response.raise_for_status()
         response_data: dict = response.json()
 
@@ -157,16 +159,24 @@ def get_profile_image(request: HttpRequest) -> Response:
 
     try:
         headers = get_headers(access_token)
-        graph_endpoint = f"{GRAPH_URL}me/photo/$value"
-        response = requests.get(graph_endpoint, headers=headers)
+        # The small thumbnail is enough for an avatar, the full size photo is only
+        # downloaded when Graph does not have that size
+        for graph_endpoint in (
+            f"{GRAPH_URL}me/photos/{MICROSOFT_PROFILE_PHOTO_SIZE}/$value",
+            f"{GRAPH_URL}me/photo/$value",
+        ):
+            response = GRAPH_SESSION.get(graph_endpoint, headers=headers)
+            if response.status_code != 404:
+                break
 
         if response.status_code == 200:
             photo_data = response.content
 
             if photo_data:
                 # Convert image to URL
-                photo_data_base64 = base64.b64encode(photo_data).decode("utf-8")
-                photo_url = f"data:image/png;base64,{photo_data_base64}"
+                content_type = response.headers.get("Content-Type", "image/jpeg")
+                photo_data_base64 = base64.b64encode(photo_data).decode("ascii")
+                photo_url = f"data:{content_type};base64,{photo_data_base64}"
                 return Response(
                     {"profileImageUrl": photo_url}, status=status.HTTP_200_OK
                 )
@@ -210,84 +220,138 @@ def set_all_contacts(user: User, email: str):
     )
     start = time.time()
 
-    def refresh_and_get_headers():
-        access_token = refresh_access_token(get_social_api(user, email))
+    def refresh_and_get_headers(force_refresh: bool = False):
+        access_token = refresh_access_token(get_social_api(user, email), force_refresh)
         return get_headers(access_token)
 
     headers = refresh_and_get_headers()
-    graph_api_contacts_endpoint = f"{GRAPH_URL}me/contacts"
-    graph_api_messages_endpoint = f"{GRAPH_URL}me/messages?$top=100"
+    # Shared by the request threads, only one of them refreshes a rejected token
+    headers_lock = threading.Lock()
+    # Largest pages Graph allows, with only the fields read below
+    page_size = 1000
+    graph_api_contacts_endpoint = (
+        f"{GRAPH_URL}me/contacts?$top={page_size}&$select=displayName,emailAddresses"
+    )
+    graph_api_messages_endpoint = (
+        f"{GRAPH_URL}me/messages?$top={page_size}&$select=from"
+    )
 
     try:
-        all_contacts = defaultdict(set)
-        message_count = 0
+        names: list[str] = []
+        email_addresses: list[str] = []
+        provider_ids: list[str] = []
+        seen_emails = set(
+            Contact.objects.filter(user=user).values_list("email", flat=True)
+        )
+
+        def add_contact(name: str, email_address: str, provider_id: str):
+            if (
+                not email_address
+                or email_address in seen_emails
+                or email_processing.is_no_reply_email(email_address)
+            ):
+                return
+            seen_emails.add(email_address)
+            names.append(name)
+            email_addresses.append(email_address)
+            provider_ids.append(provider_id)
 
         def make_request(endpoint):
             nonlocal headers
+            request_headers = headers
             for attempt in range(2):
-                response = requests.get(endpoint, headers=headers)
+                response = GRAPH_SESSION.get(endpoint, headers=request_headers)
                 if response.status_code == 401 and attempt == 0:
-                    LOGGER.warning("Access token expired, attempting to refresh.")
-                    headers = refresh_and_get_headers()
+                    with headers_lock:
+                        # Another thread may already have refreshed the rejected token
+                        if headers is request_headers:
+                            LOGGER.warning(
+                                "Access token expired, attempting to refresh."
+                            )
+                            headers = refresh_and_get_headers(force_refresh=True)
+                        request_headers = headers
                 else:
                     response.raise_for_status()
-                    return response.json()
+                    return orjson.loads(response.content)
 
             LOGGER.error("Request failed after token refresh.")
             raise Exception("Token refresh failed, cannot continue request.")
 
         # Part 1: Retrieve contacts from Microsoft Contacts with pagination
-        contacts_endpoint = graph_api_contacts_endpoint
-        while contacts_endpoint:
-            response_data = make_request(contacts_endpoint)
-            contacts: list[dict] = response_data.get("value", [])
-
-            for contact in contacts:
-                name = contact.get("displayName", "")
-                email_address = contact.get("emailAddresses", [{}])[0].get(
-                    "address", ""
-                )
-                provider_id = contact.get("id", "")
-                all_contacts[(user, name, email_address, provider_id)].add(
-                    email_address
-                )
-
-            contacts_endpoint = response_data.get("@odata.nextLink")
-
-        # Part 2: Retrieve contacts from Outlook messages with pagination, up to 5,000 messages
-        messages_endpoint = graph_api_messages_endpoint
-        while messages_endpoint and message_count < 5000:
-            data = make_request(messages_endpoint)
+        def fetch_contacts() -> list[tuple[str, str, str]]:
+            contacts_info = []
+            contacts_endpoint = graph_api_contacts_endpoint
+            while contacts_endpoint:
+                response_data = make_request(contacts_endpoint)
+                contacts: list[dict] = response_data.get("value", [])
+
+                for contact in contacts:
+                    contact_addresses = contact.get("emailAddresses")
+                    email_address = (
+                        contact_addresses[0].get("address", "")
+                        if contact_addresses
+                        else ""
+                    )
+                    contacts_info.append(
+                        (
+                            contact.get("displayName", ""),
+                            email_address,
+                            contact.get("id", ""),
+                        )
+                    )
+
+                contacts_endpoint = response_data.get("@odata.nextLink")
+            return contacts_info
+
+        # Part 2: Retrieve contacts from the latest 5,000 Outlook messages. Message pages
+        # are addressed by offset, the next ones are requested at once when the first
+        # page is full
+        def fetch_message_page(skip: int) -> list[str]:
+            data = make_request(f"{graph_api_messages_endpoint}&$skip={skip}")
             messages: list[dict] = data.get("value", [])
+            return [
+                message.get("from", {}).get("emailAddress", {}).get("address", "")
+                for message in messages
+            ]
 
-            for message in messages:
-                if message_count >= 5000:
-                    break
-                sender: str = (
-                    message.get("from", {}).get("emailAddress", {}).get("address", "")
-                )
-                if sender:
-                    name = sender.split("@")[0]
-                    if (user, name, sender, "") not in all_contacts:
-                        all_contacts[(user, name, sender, "")].add(sender)
-                message_count += 1
-
-            messages_endpoint = data.get("@odata.nextLink")
-            if not messages:
-                LOGGER.info("Fewer than 5,000 messages found; stopping early.")
-                break
+        def fetch_message_senders() -> list[str]:
+            senders = fetch_message_page(0)
+            if len(senders) == page_size:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    for page in executor.map(
+                        fetch_message_page, range(page_size, 5000, page_size)
+                    ):
+                        senders.extend(page)
+            return [sender for sender in senders if sender]
+
+        # Contacts and messages are independent, fetch them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            contacts_future = executor.submit(fetch_contacts)
+            senders_future = executor.submit(fetch_message_senders)
+
+            for name, email_address, provider_id in contacts_future.result():
+                add_contact(name, email_address, provider_id)
+            for sender in senders_future.result():
+                add_contact(sender.partition("@")[0], sender, "")
 
         # Part 3: Save the contacts to the database
-        for contact_info, emails in all_contacts.items():
-            _, name, email_address, provider_id = contact_info
-            for _ in emails:
-                email_processing.save_email_sender(
-                    user, name, email_address, provider_id
+        Contact.objects.bulk_create(
+            [
+                Contact(
+                    user=user,
+                    username=name,
+                    email=email_address,
+                    provider_id=provider_id,
                 )
+                for name, email_address, provider_id in zip(
+                    names, email_addresses, provider_ids
+                )
+            ]
+        )
 
         formatted_time = str(datetime.timedelta(seconds=time.time() - start))
         LOGGER.info(
-            f"Retrieved {len(all_contacts)} unique contacts in {formatted_time} from Microsoft Graph API for user ID: {user.id}"
+            f"Retrieved {len(names)} unique contacts in {formatted_time} from Microsoft Graph API for user ID: {user.id}"
         )
 
     except Exception as e:
@@ -309,30 +373,19 @@ def get_data(social_api: SocialAPI) -> dict:
     access_token = refresh_access_token(social_api)
     headers = get_headers(access_token)
 
-    # Use the Microsoft Graph API to get counts directly
-    num_emails_received = requests.get(
-        f"{GRAPH_URL}/me/messages/$count", headers=headers
-    ).json()
-    num_emails_read = requests.get(
-        f"{GRAPH_URL}/me/messages/$count?$filter=isRead eq true", headers=headers
-    ).json()
-    num_emails_archived = requests.get(
-        f"{GRAPH_URL}/me/messages/$count?$filter=categories/any(c:c eq 'archive')",
-        headers=headers,
-    ).json()
-    num_emails_starred = requests.get(
-        f"{GRAPH_URL}/me/messages/$count?$filter=categories/any(c:c eq 'starred')",
-        headers=headers,
-    ).json()
-    num_emails_sent = requests.get(
-        f"{GRAPH_URL}/me/messages/$count?$filter=categories/any(c:c eq 'sent')",
-        headers=headers,
-    ).json()
-
-    return {
-        "num_emails_received": num_emails_received,
-        "num_emails_read": num_emails_read,
-        "num_emails_archived": num_emails_archived,
-        "num_emails_starred": num_emails_starred,
-        "num_emails_sent": num_emails_sent,
+    # Use the Microsoft Graph API to get counts directly, all requests are independent
+    count_urls = {
+        "num_emails_received": f"{GRAPH_URL}/me/messages/$count",
+        "num_emails_read": f"{GRAPH_URL}/me/messages/$count?$filter=isRead eq true",
+        "num_emails_archived": f"{GRAPH_URL}/me/messages/$count?$filter=categories/any(c:c eq 'archive')",
+        "num_emails_starred": f"{GRAPH_URL}/me/messages/$count?$filter=categories/any(c:c eq 'starred')",
+        "num_emails_sent": f"{GRAPH_URL}/me/messages/$count?$filter=categories/any(c:c eq 'sent')",
     }
+
+    def get_count(url: str):
+        return GRAPH_SESSION.get(url, headers=headers).json()
+
+    with ThreadPoolExecutor(max_workers=len(count_urls)) as executor:
+        counts = executor.map(get_count, count_urls.values())
+
+    return dict(zip(count_urls.keys(), counts))
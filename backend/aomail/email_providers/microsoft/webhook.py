@@ -8,11 +8,14 @@ Endpoints:
 """
 
 import datetime
-import json
 import logging
 import threading
-import requests
+import orjson
+from asgiref.sync import sync_to_async
+from cachetools import TTLCache
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -20,6 +23,7 @@ from rest_framework import status
 from rest_framework.views import View
 from rest_framework.response import Response
 from aomail.email_providers.microsoft.authentication import (
+    GRAPH_SESSION,
     get_headers,
     get_social_api,
     refresh_access_token,
@@ -37,7 +41,7 @@ from aomail.models import (
     SocialAPI,
     Subscription,
 )
-from aomail.email_providers.utils import email_to_db
+from aomail.email_providers.utils import enqueue_email_to_db
 from aomail.email_providers.microsoft import webhook as webhook_microsoft
 
 
@@ -45,6 +49,135 @@ from aomail.email_providers.microsoft import webhook as webhook_microsoft
 LOGGER = logging.getLogger(__name__)
 
 
+######################## LISTENER CACHE ########################
+# Other processes only see a modified or deleted listener once their entry expires
+LISTENER_CACHE_TTL = 60  # time in seconds
+LISTENER_CACHE = TTLCache(maxsize=1024, ttl=LISTENER_CACHE_TTL)
+LISTENER_CACHE_LOCK = threading.Lock()
+
+
+def get_microsoft_listeners(
+    subscription_ids: set[str],
+) -> dict[str, MicrosoftListener]:
+    """
+    Returns the MicrosoftListeners of several subscriptions with their users already loaded.
+
+    Listeners are kept in a short-lived cache so that bursts of notifications
+    for the same subscriptions do not hit the database each time. Listeners
+    missing from the cache are fetched with a single query. A modified or deleted
+    listener is only removed from the cache of the current process, other workers
+    keep serving it for up to LISTENER_CACHE_TTL seconds.
+
+    Args:
+        subscription_ids (set[str]): The IDs of the Microsoft subscriptions.
+
+    Returns:
+        dict[str, MicrosoftListener]: The listeners found, indexed by subscription ID.
+    """
+    with LISTENER_CACHE_LOCK:
+        listeners = {
+            subscription_id: LISTENER_CACHE[subscription_id]
+            for subscription_id in subscription_ids
+            if subscription_id in LISTENER_CACHE
+        }
+
+    missing_ids = subscription_ids - listeners.keys()
+    if missing_ids:
+        fetched_listeners = MicrosoftListener.objects.select_related("user").in_bulk(
+            missing_ids, field_name="subscription_id"
+        )
+        with LISTENER_CACHE_LOCK:
+            LISTENER_CACHE.update(fetched_listeners)
+        listeners.update(fetched_listeners)
+
+    return listeners
+
+
+def get_blocked_user_ids(listeners: list[MicrosoftListener]) -> set[int]:
+    """
+    Returns the IDs of the blocked users among the owners of the given listeners.
+
+    Args:
+        listeners (list[MicrosoftListener]): The listeners to check.
+
+    Returns:
+        set[int]: The IDs of the blocked users.
+    """
+    return set(
+        Subscription.objects.filter(
+            user_id__in={listener.user_id for listener in listeners}, is_block=True
+        ).values_list("user_id", flat=True)
+    )
+
+
+def get_valid_notifications(
+    notification_data: dict,
+) -> tuple[list[dict], dict[str, MicrosoftListener], set[int]]:
+    """
+    Filters the notifications of a webhook payload and resolves their listeners.
+
+    Args:
+        notification_data (dict): The decoded body of the Microsoft Graph webhook request.
+
+    Returns:
+        tuple: A tuple containing:
+            list[dict]: The notifications with a valid client state.
+            dict[str, MicrosoftListener]: The listeners of those notifications, indexed by subscription ID.
+            set[int]: The IDs of the blocked users owning those listeners.
+    """
+    notifications = [
+        notification
+        for notification in notification_data["value"]
+        if notification["clientState"] == MICROSOFT_CLIENT_STATE
+    ]
+    listeners = get_microsoft_listeners(
+        {notification["subscriptionId"] for notification in notifications}
+    )
+    blocked_user_ids = get_blocked_user_ids(list(listeners.values()))
+    return notifications, listeners, blocked_user_ids
+
+
+def unsubscribe_blocked_listener(microsoft_listener: MicrosoftListener):
+    """
+    Deletes the subscription of a blocked user.
+
+    Args:
+        microsoft_listener (MicrosoftListener): The listener of the blocked user.
+    """
+    LOGGER.info(
+        "User with email: %s is blocked. Unsubscribing user from subscription %s.",
+        microsoft_listener.email,
+        microsoft_listener.subscription_id,
+    )
+    delete_subscription(
+        microsoft_listener.user,
+        microsoft_listener.email,
+        microsoft_listener.subscription_id,
+    )
+
+
+def forget_microsoft_listener(subscription_id: str):
+    """
+    Removes a subscription from the listener cache.
+
+    Args:
+        subscription_id (str): The ID of the Microsoft subscription.
+    """
+    with LISTENER_CACHE_LOCK:
+        LISTENER_CACHE.pop(subscription_id, None)
+
+
+@receiver([post_save, post_delete], sender=MicrosoftListener)
+def forget_modified_microsoft_listener(sender, instance: MicrosoftListener, **kwargs):
+    """
+    Removes a modified or deleted MicrosoftListener from the listener cache.
+
+    Only the cache of the current process is cleared, other workers see the change
+    once their entry expires after LISTENER_CACHE_TTL seconds.
+    """
+    forget_microsoft_listener(instance.subscription_id)
+
+
 def calculate_expiration_date(days=0, hours=0, minutes=0) -> str:
     """
     Returns the expiration date as a string formatted in UTC.
@@ -75,10 +208,10 @@ def check_and_resubscribe_to_missing_resources(user: User, email: str):
     url = f"{GRAPH_URL}subscriptions"
     access_token = refresh_access_token(get_social_api(user, email))
     headers = get_headers(access_token)
-    response = requests.get(url, headers=headers)
+    response = GRAPH_SESSION.get(url, headers=headers)
 
     if response.status_code == 200:
-        subscription_data = response.json()
+        subscription_data = orjson.loads(response.content)
 
         active_email_subscription = False
         active_contact_subscription = False
@@ -91,18 +224,143 @@ def check_and_resubscribe_to_missing_resources(user: User, email: str):
             if "me/contacts" in resource:
                 active_contact_subscription = True
 
-        if not active_email_subscription:
+        if not active_email_subscription and not active_contact_subscription:
+            webhook_microsoft.subscribe_all(user, email)
+        elif not active_email_subscription:
             webhook_microsoft.subscribe_to_email_notifications(user, email)
-
-        if not active_contact_subscription:
+        elif not active_contact_subscription:
             webhook_microsoft.subscribe_to_contact_notifications(user, email)
 
     else:
         LOGGER.error(
-            f"Failed to fetch subscriptions. Status code: {response.status_code}"
+            "Failed to fetch subscriptions. Status code: %s", response.status_code
         )
 
 
+def get_email_subscription_body() -> dict:
+    """
+    Returns the request body used to subscribe to inbox email notifications.
+
+    Returns:
+        dict: The subscription body expected by the Microsoft Graph API.
+    """
+    return {
+        "changeType": "created,deleted",
+        "notificationUrl": f"{BASE_URL}aomail/microsoft/receive_mail_notifications/",
+        "lifecycleNotificationUrl": f"{BASE_URL}aomail/microsoft/receive_subscription_notifications/",
+        "resource": "me/mailFolders('inbox')/messages",
+        "expirationDateTime": calculate_expiration_date(minutes=4230),
+        "clientState": MICROSOFT_CLIENT_STATE,
+    }
+
+
+def get_contact_subscription_body() -> dict:
+    """
+    Returns the request body used to subscribe to contact notifications.
+
+    Returns:
+        dict: The subscription body expected by the Microsoft Graph API.
+    """
+    return {
+        "changeType": "created,updated,deleted",
+        "notificationUrl": f"{BASE_URL}aomail/microsoft/receive_contact_notifications/",
+        "lifecycleNotificationUrl": f"{BASE_URL}aomail/microsoft/receive_subscription_notifications/",
+        "resource": "me/contacts",
+        "expirationDateTime": calculate_expiration_date(minutes=4230),
+        "clientState": MICROSOFT_CLIENT_STATE,
+    }
+
+
+def subscribe_all(user: User, email: str) -> bool:
+    """
+    Subscribe the user to both email and contact notifications with a single Microsoft Graph $batch request.
+
+    Args:
+        user (User): The Django User object.
+        email (str): The email address of the user.
+
+    Returns:
+        bool: True if both subscriptions were successful, False otherwise.
+    """
+    LOGGER.info(
+        "Initiating subscription to Microsoft email and contact notifications for user ID: %s with email: %s",
+        user.id,
+        email,
+    )
+    access_token = refresh_access_token(get_social_api(user, email))
+    headers = get_headers(access_token)
+    batch_body = {
+        "requests": [
+            {
+                "id": "email",
+                "method": "POST",
+                "url": "/subscriptions",
+                "body": get_email_subscription_body(),
+                "headers": {"Content-Type": "application/json"},
+            },
+            {
+                "id": "contact",
+                "method": "POST",
+                "url": "/subscriptions",
+                "body": get_contact_subscription_body(),
+                "headers": {"Content-Type": "application/json"},
+            },
+        ]
+    }
+
+    try:
+        response = GRAPH_SESSION.post(
+            f"{GRAPH_URL}$batch", json=batch_body, headers=headers
+        )
+
+        if not status.is_success(response.status_code):
+            LOGGER.error(
+                "Failed to subscribe to Microsoft notifications for user with ID: %s and email %s: %s",
+                user.id,
+                email,
+                response.reason,
+            )
+            return False
+
+        listeners = []
+        for batch_response in orjson.loads(response.content).get("responses", []):
+            if batch_response.get("status") != 201:
+                LOGGER.error(
+                    "Failed to subscribe to Microsoft %s notifications for user with ID: %s and email %s: %s",
+                    batch_response.get("id"),
+                    user.id,
+                    email,
+                    batch_response.get("body"),
+                )
+                continue
+
+            listeners.append(
+                MicrosoftListener(
+                    subscription_id=batch_response["body"]["id"],
+                    user=user,
+                    email=email,
+                )
+            )
+
+        MicrosoftListener.objects.bulk_create(listeners)
+
+        if len(listeners) == len(batch_body["requests"]):
+            LOGGER.info(
+                "Successfully subscribed user ID: %s to Microsoft email and contact notifications",
+                user.id,
+            )
+            return True
+        return False
+
+    except Exception as e:
+        LOGGER.error(
+            "An error occurred while subscribing to Microsoft notifications for user ID: %s: %s",
+            user.id,
+            e,
+        )
+        return False
+
+
 def subscribe_to_email_notifications(user: User, email: str) -> bool:
     """
     Subscribe the user to email notifications via Microsoft Graph API.
@@ -115,34 +373,28 @@ def subscribe_to_email_notifications(user: User, email: str) -> bool:
         bool: True if subscription was successful, False otherwise.
     """
     LOGGER.info(
-        f"Initiating subscription to Microsoft email notifications for user ID: {user.id} with email: {email}"
+        "Initiating subscription to Microsoft email notifications for user ID: %s with email: %s",
+        user.id,
+        email,
     )
     access_token = refresh_access_token(get_social_api(user, email))
-    notification_url = f"{BASE_URL}aomail/microsoft/receive_mail_notifications/"
-    lifecycle_notification_url = (
-        f"{BASE_URL}aomail/microsoft/receive_subscription_notifications/"
-    )
-    subscription_body = {
-        "changeType": "created,deleted",
-        "notificationUrl": notification_url,
-        "lifecycleNotificationUrl": lifecycle_notification_url,
-        "resource": "me/mailFolders('inbox')/messages",
-        "expirationDateTime": calculate_expiration_date(minutes=4230),
-        "clientState": MICROSOFT_CLIENT_STATE,
-    }
+    subscription_body = get_email_subscription_body()
     url = f"{GRAPH_URL}subscriptions"
     headers = get_headers(access_token)
 
     try:
-        response = requests.post(url, json=subscription_body, headers=headers)
+        response = GRAPH_SESSION.post(url, json=subscription_body, headers=headers)
 
         if not status.is_success(response.status_code):
             LOGGER.error(
-                f"Failed to subscribe to Microsoft email notifications for user with ID: {user.id} and email {email}: {response.reason}"
+                "Failed to subscribe to Microsoft email notifications for user with ID: %s and email %s: %s",
+                user.id,
+                email,
+                response.reason,
             )
             return False
 
-        response_data = response.json()
+        response_data = orjson.loads(response.content)
 
         social_api = SocialAPI.objects.get(user=user, email=email)
         subscription_id = response_data["id"]
@@ -155,18 +407,24 @@ def subscribe_to_email_notifications(user: User, email: str) -> bool:
 
         if response.status_code == 201:
             LOGGER.info(
-                f"Successfully subscribed user ID: {user.id} to Microsoft email notifications"
+                "Successfully subscribed user ID: %s to Microsoft email notifications",
+                user.id,
             )
             return True
         else:
             LOGGER.error(
-                f"Failed to subscribe to Microsoft email notifications for user with ID: {user.id} and email {email}: {response.reason}"
+                "Failed to subscribe to Microsoft email notifications for user with ID: %s and email %s: %s",
+                user.id,
+                email,
+                response.reason,
             )
             return False
 
     except Exception as e:
         LOGGER.error(
-            f"An error occurred while subscribing to Microsoft email notifications for user ID: {user.id}: {str(e)}"
+            "An error occurred while subscribing to Microsoft email notifications for user ID: %s: %s",
+            user.id,
+            e,
         )
         return False
 
@@ -183,27 +441,18 @@ def subscribe_to_contact_notifications(user: User, email: str) -> bool:
         bool: True if subscription was successful, False otherwise.
     """
     LOGGER.info(
-        f"Initiating subscription to Microsoft contact notifications for user ID: {user.id} with email: {email}"
+        "Initiating subscription to Microsoft contact notifications for user ID: %s with email: %s",
+        user.id,
+        email,
     )
     access_token = refresh_access_token(get_social_api(user, email))
-    notification_url = f"{BASE_URL}aomail/microsoft/receive_contact_notifications/"
-    lifecycle_notification_url = (
-        f"{BASE_URL}aomail/microsoft/receive_subscription_notifications/"
-    )
-    subscription_body = {
-        "changeType": "created,updated,deleted",
-        "notificationUrl": notification_url,
-        "lifecycleNotificationUrl": lifecycle_notification_url,
-        "resource": "me/contacts",
-        "expirationDateTime": calculate_expiration_date(minutes=4230),
-        "clientState": MICROSOFT_CLIENT_STATE,
-    }
+    subscription_body = get_contact_subscription_body()
     url = f"{GRAPH_URL}subscriptions"
     headers = get_headers(access_token)
 
     try:
-        response = requests.post(url, json=subscription_body, headers=headers)
-        response_data = response.json()
+        response = GRAPH_SESSION.post(url, json=subscription_body, headers=headers)
+        response_data = orjson.loads(response.content)
 
         social_api = SocialAPI.objects.get(user=user, email=email)
         subscription_id = response_data["id"]
@@ -216,18 +465,24 @@ def subscribe_to_contact_notifications(user: User, email: str) -> bool:
 
         if response.status_code == 201:
             LOGGER.info(
-                f"Successfully subscribed user ID: {user.id} to Microsoft contact notifications"
+                "Successfully subscribed user ID: %s to Microsoft contact notifications",
+                user.id,
             )
             return True
         else:
             LOGGER.error(
-                f"Failed to subscribe to Microsoft contact notifications for user with ID: {user.id} and email {email}: {response.reason}"
+                "Failed to subscribe to Microsoft contact notifications for user with ID: %s and email %s: %s",
+                user.id,
+                email,
+                response.reason,
             )
             return False
 
     except Exception as e:
         LOGGER.error(
-            f"An error occurred while subscribing to Microsoft contact notifications for user ID: {user.id}: {str(e)}"
+            "An error occurred while subscribing to Microsoft contact notifications for user ID: %s: %s",
+            user.id,
+            e,
         )
         return False
 
@@ -245,27 +500,38 @@ def delete_subscription(user: User, email: str, subscription_id: str) -> bool:
         bool: True if subscription deletion was successful, False otherwise.
     """
     LOGGER.info(
-        f"Initiating Microsoft unsubscription for user ID: {user.id} and subscription ID: {subscription_id}"
+        "Initiating Microsoft unsubscription for user ID: %s and subscription ID: %s",
+        user.id,
+        subscription_id,
     )
     access_token = refresh_access_token(get_social_api(user, email))
     headers = get_headers(access_token)
     url = f"{GRAPH_URL}subscriptions/{subscription_id}"
 
     try:
-        response = requests.delete(url, headers=headers)
+        response = GRAPH_SESSION.delete(url, headers=headers)
 
         if response.status_code != 204:
             LOGGER.error(
-                f"Failed to delete the subscription {subscription_id} for user ID: {user.id}: {response.content}"
+                "Failed to delete the subscription %s for user ID: %s: %s",
+                subscription_id,
+                user.id,
+                response.content,
             )
             return False
         else:
-            LOGGER.info(f"Successfully deleted the subscription for user ID: {user.id}")
+            forget_microsoft_listener(subscription_id)
+            LOGGER.info(
+                "Successfully deleted the subscription for user ID: %s", user.id
+            )
             return True
 
     except Exception as e:
         LOGGER.error(
-            f"Failed to delete the subscription {subscription_id} for user ID: {user.id}: {str(e)}"
+            "Failed to delete the subscription %s for user ID: %s: %s",
+            subscription_id,
+            user.id,
+            e,
         )
         return False
 
@@ -280,7 +546,9 @@ def renew_subscription(user: User, email: str, subscription_id: str):
         subscription_id (str): The ID of the subscription to renew.
     """
     LOGGER.info(
-        f"Initiating renewal of Microsoft subscription for user ID: {user.id} and subscription ID: {subscription_id}"
+        "Initiating renewal of Microsoft subscription for user ID: %s and subscription ID: %s",
+        user.id,
+        subscription_id,
     )
     access_token = refresh_access_token(get_social_api(user, email))
     headers = get_headers(access_token)
@@ -289,20 +557,28 @@ def renew_subscription(user: User, email: str, subscription_id: str):
 
     try:
         payload = {"expirationDateTime": new_expiration_date}
-        response = requests.patch(url, headers=headers, json=payload)
+        response = GRAPH_SESSION.patch(url, headers=headers, json=payload)
 
         if response.status_code == 200:
             LOGGER.info(
-                f"Successfully renewed the subscription for user ID: {user.id} and subscription ID: {subscription_id}"
+                "Successfully renewed the subscription for user ID: %s and subscription ID: %s",
+                user.id,
+                subscription_id,
             )
         else:
             LOGGER.error(
-                f"Failed to renew the subscription {subscription_id} for user ID: {user.id}: {response.content}"
+                "Failed to renew the subscription %s for user ID: %s: %s",
+                subscription_id,
+                user.id,
+                response.content,
             )
 
     except Exception as e:
         LOGGER.error(
-            f"Failed to renew the subscription {subscription_id} for user ID: {user.id}: {str(e)}"
+            "Failed to renew the subscription %s for user ID: %s: %s",
+            subscription_id,
+            user.id,
+            e,
         )
 
 
@@ -316,27 +592,37 @@ def reauthorize_subscription(user: User, email: str, subscription_id: str):
         subscription_id (str): The ID of the subscription to reauthorize.
     """
     LOGGER.info(
-        f"Initiating reauthorization of Microsoft subscription for user ID: {user.id} and subscription ID: {subscription_id}"
+        "Initiating reauthorization of Microsoft subscription for user ID: %s and subscription ID: %s",
+        user.id,
+        subscription_id,
     )
     access_token = refresh_access_token(get_social_api(user, email))
     headers = get_headers(access_token)
 
     try:
         url = f"{GRAPH_URL}subscriptions/{subscription_id}/reauthorize"
-        response = requests.post(url, headers=headers)
+        response = GRAPH_SESSION.post(url, headers=headers)
 
         if response.status_code == 200:
             LOGGER.info(
-                f"Successfully reauthorized the subscription for user ID: {user.id} and subscription ID: {subscription_id}"
+                "Successfully reauthorized the subscription for user ID: %s and subscription ID: %s",
+                user.id,
+                subscription_id,
             )
         else:
             LOGGER.error(
-                f"Failed to reauthorize the subscription {subscription_id} for user ID: {user.id}: {response.reason}"
+                "Failed to reauthorize the subscription %s for user ID: %s: %s",
+                subscription_id,
+                user.id,
+                response.reason,
             )
 
     except Exception as e:
         LOGGER.error(
-            f"Failed to reauthorize the subscription {subscription_id} for user ID: {user.id}: {str(e)}"
+            "Failed to reauthorize the subscription %s for user ID: %s: %s",
+            subscription_id,
+            user.id,
+            e,
         )
 
 
@@ -368,49 +654,38 @@ class MicrosoftSubscriptionNotification(View):
             return HttpResponse(validation_token, content_type="text/plain")
 
         try:
-            subscription_data = json.loads(request.body.decode("utf-8"))
+            subscription_data = orjson.loads(request.body)
+            notifications, listeners, blocked_user_ids = get_valid_notifications(
+                subscription_data
+            )
+            current_datetime = datetime.datetime.now(datetime.timezone.utc)
 
-            if subscription_data["value"][0]["clientState"] == MICROSOFT_CLIENT_STATE:
-                lifecycle_event = subscription_data["value"][0]["lifecycleEvent"]
-                expiration_date_str = subscription_data["value"][0][
-                    "subscriptionExpirationDateTime"
-                ]
+            for notification in notifications:
+                lifecycle_event = notification["lifecycleEvent"]
+                expiration_date_str = notification["subscriptionExpirationDateTime"]
                 subscription_expiration_date = datetime.datetime.fromisoformat(
                     expiration_date_str
                 )
-                subscription_id = subscription_data["value"][0]["subscriptionId"]
-                microsoft_listener = MicrosoftListener.objects.filter(
-                    subscription_id=subscription_id
-                )
-                current_datetime = datetime.datetime.now(datetime.timezone.utc)
-                subscription = Subscription.objects.get(
-                    user=microsoft_listener.first().user
-                )
+                subscription_id = notification["subscriptionId"]
+                microsoft_listener = listeners.get(subscription_id)
 
-                if not microsoft_listener.exists():
-                    pass
-                elif subscription.is_block:
-                    LOGGER.info(
-                        f"User with email: {microsoft_listener.first().email} is blocked. Unsubscribing user from subscription {subscription_id}."
-                    )
-                    delete_subscription(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
-                        microsoft_listener.first().subscription_id,
-                    )
+                if not microsoft_listener:
+                    continue
+                elif microsoft_listener.user_id in blocked_user_ids:
+                    unsubscribe_blocked_listener(microsoft_listener)
                 elif (
                     subscription_expiration_date - current_datetime
                     <= datetime.timedelta(minutes=15)
                 ):
                     renew_subscription(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
+                        microsoft_listener.user,
+                        microsoft_listener.email,
                         subscription_id,
                     )
                 elif lifecycle_event == "reauthorizationRequired":
                     reauthorize_subscription(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
+                        microsoft_listener.user,
+                        microsoft_listener.email,
                         subscription_id,
                     )
 
@@ -419,11 +694,14 @@ class MicrosoftSubscriptionNotification(View):
                     or lifecycle_event == "missed"
                 ):
                     LOGGER.error(
-                        f"{lifecycle_event}: current time: {current_datetime}, expiration time: {expiration_date_str}"
+                        "%s: current time: %s, expiration time: %s",
+                        lifecycle_event,
+                        current_datetime,
+                        expiration_date_str,
                     )
                     check_and_resubscribe_to_missing_resources(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
+                        microsoft_listener.user,
+                        microsoft_listener.email,
                     )
 
             return JsonResponse(
@@ -432,7 +710,7 @@ class MicrosoftSubscriptionNotification(View):
 
         except Exception as e:
             LOGGER.error(
-                f"An error occurred in handling subscription notification: {str(e)}"
+                "An error occurred in handling subscription notification: %s", e
             )
             return JsonResponse(
                 {"error": "Internal Server Error"},
@@ -452,10 +730,13 @@ class MicrosoftEmailNotification(View):
         post(request: HttpRequest) -> Response: Handles HTTP POST requests containing email notifications.
     """
 
-    def post(self, request: HttpRequest) -> Response:
+    async def post(self, request: HttpRequest) -> Response:
         """
         Handles POST requests containing email notifications from Microsoft Graph API.
 
+        The handler is asynchronous and leaves Graph API calls to background threads so
+        that Microsoft gets its acknowledgement without waiting on another request.
+
         Args:
             request (HttpRequest): The HTTP request object.
 
@@ -472,59 +753,112 @@ class MicrosoftEmailNotification(View):
                 "Email notification received from Microsoft Graph API. Starting email processing"
             )
 
-            email_data = json.loads(request.body.decode("utf-8"))
+            email_data = orjson.loads(request.body)
+            notifications, listeners, blocked_user_ids = await sync_to_async(
+                get_valid_notifications
+            )(email_data)
 
-            if email_data["value"][0]["clientState"] == MICROSOFT_CLIENT_STATE:
-                change_type = email_data["value"][0]["changeType"]
-                email_id = email_data["value"][0]["resourceData"]["id"]
-                subscription_id = email_data["value"][0]["subscriptionId"]
-                microsoft_listener = MicrosoftListener.objects.filter(
-                    subscription_id=subscription_id
-                )
-                subscription = Subscription.objects.get(
-                    user=microsoft_listener.first().user
+            if not notifications:
+                LOGGER.error("Invalid client state in email notification")
+                return JsonResponse(
+                    {"error": "Invalid client state in email notification"},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-                if not microsoft_listener.exists():
-                    pass
-                elif subscription.is_block:
-                    LOGGER.info(
-                        f"User with email: {microsoft_listener.first().email} is blocked. Unsubscribing user from subscription {subscription_id}."
-                    )
-                    delete_subscription(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
-                        microsoft_listener.first().subscription_id,
-                    )
+            for notification in notifications:
+                change_type = notification["changeType"]
+                email_id = notification["resourceData"]["id"]
+                microsoft_listener = listeners.get(notification["subscriptionId"])
+
+                if not microsoft_listener:
+                    continue
+                elif microsoft_listener.user_id in blocked_user_ids:
+                    threading.Thread(
+                        target=unsubscribe_blocked_listener, args=(microsoft_listener,)
+                    ).start()
                 elif change_type == "deleted":
-                    Email.objects.get(provider_id=email_id).delete()
+                    await Email.objects.filter(provider_id=email_id).adelete()
                 else:
-                    social_api = get_social_api(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
+                    social_api = await sync_to_async(get_social_api)(
+                        microsoft_listener.user,
+                        microsoft_listener.email,
                     )
-                    threading.Thread(
-                        target=email_to_db, args=(social_api, email_id)
-                    ).start()
+                    if not social_api:
+                        LOGGER.warning(
+                            "Skipping email notification of subscription %s: no SocialAPI for user ID: %s",
+                            notification["subscriptionId"],
+                            microsoft_listener.user_id,
+                        )
+                        continue
+                    await sync_to_async(enqueue_email_to_db)(social_api, email_id)
 
-                return JsonResponse(
-                    {"status": "Notification received"}, status=status.HTTP_202_ACCEPTED
-                )
-            else:
-                LOGGER.error("Invalid client state in email notification")
-                return JsonResponse(
-                    {"error": "Invalid client state in email notification"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            return JsonResponse(
+                {"status": "Notification received"}, status=status.HTTP_202_ACCEPTED
+            )
 
         except Exception as e:
-            LOGGER.error(f"An error occurred in handling email notification: {str(e)}")
+            LOGGER.error("An error occurred in handling email notification: %s", e)
             return JsonResponse(
                 {"error": "Internal Server Error"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
 
+def process_contact_notification(
+    microsoft_listener: MicrosoftListener, change_type: str, id_contact: str
+) -> bool:
+    """
+    Creates or updates a contact from a Microsoft Graph API contact notification.
+
+    Args:
+        microsoft_listener (MicrosoftListener): The listener that received the notification.
+        change_type (str): The type of change ("created" or "updated").
+        id_contact (str): The ID of the contact in Microsoft Graph API.
+
+    Returns:
+        bool: True if the contact was processed successfully, False otherwise.
+    """
+    access_token = refresh_access_token(
+        get_social_api(
+            microsoft_listener.user,
+            microsoft_listener.email,
+        )
+    )
+    url = f"https://graph.microsoft.com/v1.0/me/contacts/{id_contact}"
+    headers = get_headers(access_token)
+
+    try:
+        response = GRAPH_SESSION.get(url, headers=headers)
+
+        if response.status_code != 200:
+            LOGGER.error("Failed to retrieve contact data: %s", response.reason)
+            return False
+
+        contact_data: dict[str, dict[str, dict]] = orjson.loads(response.content)
+        name = contact_data.get("displayName")
+        email = contact_data.get("emailAddresses")[0].get("address")
+
+        if change_type == "created":
+            email_processing.save_email_sender(
+                microsoft_listener.user,
+                name,
+                email,
+                id_contact,
+            )
+
+        if change_type == "updated":
+            contact = Contact.objects.get(provider_id=id_contact)
+            contact.username = name
+            contact.email = email
+            contact.save()
+
+        return True
+
+    except Exception as e:
+        LOGGER.error("An error occurred in handling contact notification: %s", e)
+        return False
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class MicrosoftContactNotification(View):
     """
@@ -558,100 +892,48 @@ class MicrosoftContactNotification(View):
                 "Contact notification received from Microsoft Graph API. Starting contact processing..."
             )
 
-            contact_data = json.loads(request.body.decode("utf-8"))
+            contact_data = orjson.loads(request.body)
+            notifications, listeners, blocked_user_ids = get_valid_notifications(
+                contact_data
+            )
 
-            if contact_data["value"][0]["clientState"] == MICROSOFT_CLIENT_STATE:
-                id_contact = contact_data["value"][0]["resourceData"]["id"]
-                subscription_id = contact_data["value"][0]["subscriptionId"]
-                microsoft_listener = MicrosoftListener.objects.filter(
-                    subscription_id=subscription_id
-                )
-                change_type = contact_data["value"][0]["changeType"]
-                subscription = Subscription.objects.get(
-                    user=microsoft_listener.first().user
+            if not notifications:
+                LOGGER.error("Invalid client state in contact notification")
+                return JsonResponse(
+                    {"error": "Invalid client state in contact notification"},
+                    status=status.HTTP_400_BAD_REQUEST,
                 )
 
-                if not microsoft_listener.exists():
-                    pass
-                elif subscription.is_block:
-                    LOGGER.info(
-                        f"User with email: {microsoft_listener.first().email} is blocked. Unsubscribing user from subscription {subscription_id}."
-                    )
-                    delete_subscription(
-                        microsoft_listener.first().user,
-                        microsoft_listener.first().email,
-                        microsoft_listener.first().subscription_id,
-                    )
+            all_processed = True
+            for notification in notifications:
+                id_contact = notification["resourceData"]["id"]
+                change_type = notification["changeType"]
+                microsoft_listener = listeners.get(notification["subscriptionId"])
+
+                if not microsoft_listener:
+                    continue
+                elif microsoft_listener.user_id in blocked_user_ids:
+                    unsubscribe_blocked_listener(microsoft_listener)
                 elif change_type == "deleted":
-                    contact = Contact.objects.get(provider_id=id_contact)
-                    contact.delete()
-                else:
-                    access_token = refresh_access_token(
-                        get_social_api(
-                            microsoft_listener.first().user,
-                            microsoft_listener.first().email,
-                        )
-                    )
-                    url = f"https://graph.microsoft.com/v1.0/me/contacts/{id_contact}"
-                    headers = get_headers(access_token)
-
-                    try:
-                        response = requests.get(url, headers=headers)
-
-                        if response.status_code == 200:
-                            contact_data: dict[str, dict[str, dict]] = response.json()
-                            name = contact_data.get("displayName")
-                            email = contact_data.get("emailAddresses")[0].get("address")
-
-                            if change_type == "created":
-                                email_processing.save_email_sender(
-                                    microsoft_listener.first().user,
-                                    name,
-                                    email,
-                                    id_contact,
-                                )
-
-                            if change_type == "updated":
-                                contact = Contact.objects.get(provider_id=id_contact)
-                                contact.username = name
-                                contact.email = email
-                                contact.save()
-
-                        else:
-                            LOGGER.error(
-                                f"Failed to retrieve contact data: {response.reason}"
-                            )
-                            return Response(
-                                {
-                                    "error": f"Failed to retrieve contact data: {response.reason}"
-                                },
-                                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            )
-
-                    except Exception as e:
-                        LOGGER.error(
-                            f"An error occurred in handling contact notification: {str(e)}"
-                        )
-                        return JsonResponse(
-                            {"error": "Internal server error"},
-                            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        )
+                    Contact.objects.filter(provider_id=id_contact).delete()
+                elif not process_contact_notification(
+                    microsoft_listener, change_type, id_contact
+                ):
+                    all_processed = False
 
+            if not all_processed:
                 return JsonResponse(
-                    {"status": "Notification received"},
-                    status=status.HTTP_202_ACCEPTED,
-                )
-            else:
-                LOGGER.error("Invalid client state in contact notification")
-                return JsonResponse(
-                    {"error": "Invalid client state in contact notification"},
-                    status=status.HTTP_400_BAD_REQUEST,
+                    {"error": "Internal server error"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 )
 
-        except Exception as e:
-            LOGGER.error(
-                f"An error occurred in handling contact notification: {str(e)}"
+            return JsonResponse(
+                {"status": "Notification received"},
+                status=status.HTTP_202_ACCEPTED,
             )
+
+        except Exception as e:
+            LOGGER.error("An error occurred in handling contact notification: %s", e)
             return JsonResponse(
                 {"error": "Internal server error"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
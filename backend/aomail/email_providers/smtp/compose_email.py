@@ -62,7 +62,7 @@ def send_email(request: HttpRequest) -> Response:
         request.POST.getlist("to")
         + request.POST.getlist("cc")
         + request.POST.getlist("bcc"),
-        msg.as_string(),
+        msg.as_bytes(),
     )
     smtp_connection.quit()
 
@@ -6,17 +6,27 @@ Features:
 """
 
 import logging
+import operator
+import threading
+from collections import Counter
+from cachetools import LRUCache, TTLCache
 from concurrent.futures import ThreadPoolExecutor
-from django.db import transaction
+from functools import partial
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from aomail.ai_providers import llm_functions
 from aomail.constants import (
     ANSWER_REQUIRED,
     DEFAULT_CATEGORY,
     EMAIL_ADMIN,
+    EMAIL_BATCH_MAX_WORKERS,
+    EMAIL_BATCH_SIZE,
     EMAIL_HTML_CONTENT_KEY,
     EMAIL_NO_REPLY,
     EMAIL_ONE_LINE_SUMMARY_KEY,
+    EMAIL_QUEUE_DELAY,
     EMAIL_SHORT_SUMMARY_KEY,
     GOOGLE,
     HIGHLY_RELEVANT,
@@ -33,7 +43,10 @@ from aomail.utils.tree_knowledge import Search
 from aomail.utils import email_processing
 from aomail.models import (
     Contact,
+    EmailBody,
+    EmailClaim,
     KeyPoint,
+    PendingEmail,
     Preference,
     Rule,
     SocialAPI,
@@ -70,12 +83,63 @@ from aomail.email_providers.microsoft.compose_email import (
     transfer_email as transfer_email_microsoft,
 )
 from django.db import models
+from django.db.models import F
 from django.template.loader import render_to_string
 from django.core.mail import send_mail
 from aomail.ai_providers.prompts import CATEGORIZE_AND_SUMMARIZE_EMAIL_PROMPT
 
 
 LOGGER = logging.getLogger(__name__)
+SENDER_ID_CACHE = LRUCache(maxsize=4096)
+KNOWN_CONTACTS_CACHE = LRUCache(maxsize=4096)
+CATEGORIES_CACHE_TTL = 60  # time in seconds
+CATEGORIES_CACHE = TTLCache(maxsize=1024, ttl=CATEGORIES_CACHE_TTL)
+CLAIMED_EMAIL_IDS_TTL = 300  # time in seconds
+CLAIMED_EMAIL_IDS = TTLCache(maxsize=10000, ttl=CLAIMED_EMAIL_IDS_TTL)
+ENTITY_CACHE_LOCK = threading.Lock()
+PENDING_EMAILS: dict[int, SocialAPI] = {}
+PENDING_EMAILS_LOCK = threading.Lock()
+EMAIL_CHILD_COLUMNS = {
+    EmailBody: (("email_id", "bigint"), ("html_content", "text")),
+    KeyPoint: (
+        ("is_reply", "boolean"),
+        ("position", "integer"),
+        ("category", "text"),
+        ("organization", "text"),
+        ("topic", "text"),
+        ("content", "text"),
+        ("email_id", "bigint"),
+    ),
+    CC_sender: (("email_object_id", "bigint"), ("email", "text"), ("name", "text")),
+    BCC_sender: (("email_object_id", "bigint"), ("email", "text"), ("name", "text")),
+    Picture: (("email_id", "bigint"), ("path", "text")),
+    Attachment: (("email_id", "bigint"), ("name", "text"), ("id_api", "text")),
+}
+SUMMARY_FIELDS = operator.itemgetter("category", "organization", "topic", "keypoints")
+FLAG_STATISTICS = {
+    "meeting": "nb_meeting",
+    "spam": "nb_spam",
+    "scam": "nb_scam",
+    "newsletter": "nb_newsletter",
+    "notification": "nb_notification",
+}
+STATISTICS_BY_FIELD = {
+    "importance": {
+        IMPORTANT: "nb_emails_important",
+        INFORMATIVE: "nb_emails_informative",
+        USELESS: "nb_emails_useless",
+    },
+    "response": {
+        ANSWER_REQUIRED: "nb_answer_required",
+        MIGHT_REQUIRE_ANSWER: "nb_might_require_answer",
+        NO_ANSWER_REQUIRED: "nb_no_answer_required",
+    },
+    "relevance": {
+        HIGHLY_RELEVANT: "nb_highly_relevant",
+        POSSIBLY_RELEVANT: "nb_possibly_relevant",
+        NOT_RELEVANT: "nb_not_relevant",
+    },
+}
 
 
 def email_to_db(social_api: SocialAPI, email_id: str = None) -> bool:
@@ -89,115 +153,459 @@ def email_to_db(social_api: SocialAPI, email_id: str = None) -> bool:
     Returns:
         bool: True if the email was successfully saved, False otherwise.
     """
+    return emails_to_db(social_api, [email_id]) == 1
+
+
+def emails_to_db(social_api: SocialAPI, email_ids: list[str | None]) -> int:
+    """
+    Save a list of emails from various email service APIs to the database.
+
+    Emails are fetched and processed concurrently, then the emails of each batch are
+    written together with one bulk insert per model.
+
+    Args:
+        social_api (SocialAPI): The SocialAPI instance associated with the user.
+        email_ids (list[str | None]): The IDs of the emails to save.
+
+    Returns:
+        int: The number of emails successfully saved.
+    """
     user = social_api.user
-    api_type = social_api.type_api
 
-    try:
-        with transaction.atomic():
-            subscription = Subscription.objects.get(user=user)
+    subscription = Subscription.objects.filter(user=user).first()
+    if not subscription:
+        LOGGER.error("No subscription found for user ID: %s.", user.id)
+        return 0
+    if subscription.is_block:
+        LOGGER.info("Skipping processing for blocked user ID: %s.", user.id)
+        return 0
+
+    email_ids = drop_claimed_email_ids(email_ids)
+    if not email_ids:
+        return 0
+
+    # Categories and rules are loaded once for every email of the call
+    categories = get_user_categories(user)
+    rules = list(Rule.objects.filter(user=user))
+    prepare = partial(prepare_email, social_api, categories=categories, rules=rules)
+
+    nb_saved_emails = 0
+    for start in range(0, len(email_ids), EMAIL_BATCH_SIZE):
+        batch_ids = email_ids[start : start + EMAIL_BATCH_SIZE]
+
+        if len(batch_ids) == 1:
+            processed_emails = [prepare(batch_ids[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=EMAIL_BATCH_MAX_WORKERS) as executor:
+                processed_emails = list(executor.map(prepare, batch_ids))
 
-            if subscription.is_block:
-                LOGGER.info(f"Skipping processing for blocked user ID: {user.id}.")
-                return False
+        processed_emails = [email for email in processed_emails if email]
+        if processed_emails:
+            nb_saved_emails += flush_emails_to_db(
+                processed_emails, user, social_api, rules
+            )
 
-            email_data = get_email_data(social_api, email_id)
-            if not email_data:
-                return False
+    return nb_saved_emails
 
-            if (
-                Email.objects.select_for_update(skip_locked=True)
-                .filter(provider_id=email_data["email_id"], user=user)
-                .exists()
-            ):
-                LOGGER.info(
-                    f"Email ID: {email_data['email_id']} already exists for user ID: {user.id}. Skipping."
-                )
-                return False
 
-            LOGGER.info(
-                f"Saving email to database for user ID: {user.id} using {api_type.capitalize()} API"
+def drop_claimed_email_ids(email_ids: list[str | None]) -> list[str | None]:
+    """
+    Removes the emails already claimed by an ingestion process or already saved before
+    they are fetched.
+
+    Redelivered notifications are skipped without calling the provider API or the LLM.
+    Claimed IDs are remembered for a few minutes to avoid querying the database again.
+
+    Args:
+        email_ids (list[str | None]): The IDs of the emails to save.
+
+    Returns:
+        list[str | None]: The IDs of the emails that are not claimed yet.
+    """
+    with ENTITY_CACHE_LOCK:
+        email_ids = [
+            email_id for email_id in email_ids if email_id not in CLAIMED_EMAIL_IDS
+        ]
+
+    known_ids = [email_id for email_id in email_ids if email_id is not None]
+    if not known_ids:
+        return email_ids
+
+    # Claims are dropped once their email is saved, so saved emails are checked too
+    claimed_ids = set(
+        EmailClaim.objects.filter(provider_id__in=known_ids)
+        .values_list("provider_id", flat=True)
+        .union(
+            Email.objects.filter(provider_id__in=known_ids).values_list(
+                "provider_id", flat=True
             )
+        )
+    )
+    if not claimed_ids:
+        return email_ids
+
+    with ENTITY_CACHE_LOCK:
+        for email_id in claimed_ids:
+            CLAIMED_EMAIL_IDS[email_id] = True
 
-            if delete_email_rule(user, email_data):
-                delete_email(social_api, email_data, user)
-                return False
+    LOGGER.info("Skipping %s emails already claimed.", len(claimed_ids))
+    return [email_id for email_id in email_ids if email_id not in claimed_ids]
 
-            processed_email = process_email(email_data, user, social_api)
 
-            ai_output: dict = processed_email["email_processed"].copy()
-            ai_output.pop("summary")
+def release_email_claims(provider_ids: list[str]):
+    """
+    Releases the claims of emails that could not be saved so that they can be processed again.
+
+    Args:
+        provider_ids (list[str]): The provider IDs of the emails.
+    """
+    EmailClaim.objects.filter(provider_id__in=provider_ids).delete()
+    with ENTITY_CACHE_LOCK:
+        for provider_id in provider_ids:
+            CLAIMED_EMAIL_IDS.pop(provider_id, None)
 
-            if social_api.type_api == GOOGLE and not social_api.imap_config:
-                google_labels.replicate_labels(
-                    social_api, ai_output, email_data["email_id"]
+
+def drop_email_claims(provider_ids: list[str]):
+    """
+    Deletes the claims of emails that are saved, their Email row now prevents them from
+    being processed again.
+
+    Args:
+        provider_ids (list[str]): The provider IDs of the saved emails.
+    """
+    EmailClaim.objects.filter(provider_id__in=provider_ids).delete()
+    with ENTITY_CACHE_LOCK:
+        for provider_id in provider_ids:
+            CLAIMED_EMAIL_IDS[provider_id] = True
+
+
+def enqueue_email_to_db(social_api: SocialAPI, email_id: str = None):
+    """
+    Queue an email notification to be saved to the database in the background.
+
+    The notification is stored as a PendingEmail before the provider is acknowledged,
+    so that it can be recovered if the process stops before saving the email.
+    Notifications received for the same account within EMAIL_QUEUE_DELAY seconds are
+    saved together as a single batch.
+
+    Args:
+        social_api (SocialAPI): The SocialAPI instance associated with the user.
+        email_id (Optional[str]): The ID of the email notification (if applicable).
+    """
+    PendingEmail.objects.create(social_api=social_api, provider_id=email_id)
+
+    with PENDING_EMAILS_LOCK:
+        if social_api.id in PENDING_EMAILS:
+            return
+        PENDING_EMAILS[social_api.id] = social_api
+
+    threading.Timer(EMAIL_QUEUE_DELAY, flush_pending_emails, args=(social_api,)).start()
+
+
+def flush_pending_emails(social_api: SocialAPI):
+    """
+    Save the emails queued for an account to the database.
+
+    The PendingEmail rows read are deleted once their emails are processed, rows
+    queued meanwhile are left for the next flush.
+
+    Args:
+        social_api (SocialAPI): The SocialAPI instance whose queued emails are saved.
+    """
+    with PENDING_EMAILS_LOCK:
+        PENDING_EMAILS.pop(social_api.id, None)
+
+    pending_emails = list(
+        PendingEmail.objects.filter(social_api=social_api).values_list(
+            "id", "provider_id"
+        )
+    )
+    if not pending_emails:
+        return
+    # Repeated notifications, including Gmail ones without an email ID, are read once
+    email_ids = list(dict.fromkeys(email_id for _, email_id in pending_emails))
+
+    try:
+        # Gmail notifications carry no email ID, the new emails are read from the history
+        if (
+            None in email_ids
+            and social_api.type_api == GOOGLE
+            and not social_api.imap_config
+        ):
+            try:
+                new_email_ids = email_operations_google.get_new_email_ids(social_api)
+            except Exception as e:
+                LOGGER.error(
+                    "Failed to list Gmail history for user ID %s: %s",
+                    social_api.user_id,
+                    str(e),
                 )
-            elif social_api.type_api == MICROSOFT and not social_api.imap_config:
-                microsoft_labels.replicate_labels(
-                    social_api, ai_output, email_data["email_id"]
+                new_email_ids = None
+
+            if new_email_ids is not None:
+                email_ids = [email_id for email_id in email_ids if email_id is not None]
+                email_ids.extend(
+                    email_id for email_id in new_email_ids if email_id not in email_ids
                 )
 
-            email_entry = save_email_to_db(processed_email, user, social_api)
+        LOGGER.info(
+            "Saving %s queued emails for user ID: %s",
+            len(email_ids),
+            social_api.user_id,
+        )
+        emails_to_db(social_api, email_ids)
+    finally:
+        PendingEmail.objects.filter(
+            id__in=[pending_email_id for pending_email_id, _ in pending_emails]
+        ).delete()
 
-            if is_shipping_label(email_data["subject"]):
-                process_label(
-                    email_data["from_info"][1],
-                    email_data["subject"],
-                    email_data["safe_html"],
-                    email_entry,
-                )
 
-            apply_rules(processed_email, user, email_entry)
+def prepare_email(
+    social_api: SocialAPI,
+    email_id: str = None,
+    categories: dict[str, Category] = None,
+    rules: list[Rule] = None,
+) -> dict | None:
+    """
+    Fetch, claim and process an email before it is saved to the database.
+
+    Args:
+        social_api (SocialAPI): The SocialAPI instance associated with the user.
+        email_id (Optional[str]): The ID of the email notification (if applicable).
+        categories (Optional[dict[str, Category]]): The categories of the user, indexed by name.
+        rules (Optional[list[Rule]]): The rules of the user.
+
+    Returns:
+        dict | None: The processed email, or None if the email must not be saved.
+    """
+    user = social_api.user
+    api_type = social_api.type_api
+    provider_id = email_id
+    claimed = False
 
+    try:
+        email_data = get_email_data(social_api, email_id)
+        if not email_data:
+            return None
+
+        # Claim the email before any AI processing so that concurrent notifications
+        # for the same email do not process it twice
+        provider_id = email_data["email_id"]
+        _, claimed = EmailClaim.objects.get_or_create(provider_id=provider_id)
+        if not claimed:
             LOGGER.info(
-                f"Email ID: {email_data['email_id']} saved successfully for social_api email: {social_api.email}"
+                "Email ID: %s already processed for user ID: %s. Skipping.",
+                provider_id,
+                user.id,
             )
-            return True
+            return None
 
-    except Exception as e:
-        if "duplicate key value violates unique constraint" in str(e):
+        # Another process may have saved the email and dropped its claim in between
+        if Email.objects.filter(provider_id=provider_id).exists():
+            drop_email_claims([provider_id])
             LOGGER.info(
-                f"Email ID already saved by another process for user ID: {user.id}. Skipping."
+                "Email ID: %s already saved for user ID: %s. Skipping.",
+                provider_id,
+                user.id,
             )
-            return False
-        LOGGER.error(
-            f"Error saving email ID: {email_data['email_id']} for user ID: {user.id}: {str(e)}"
+            return None
+
+        LOGGER.info(
+            "Processing email ID: %s for user ID: %s using %s API",
+            provider_id,
+            user.id,
+            api_type.capitalize(),
         )
-        return False
 
+        if delete_email_rule(user, email_data, rules):
+            delete_email(social_api, email_data, user)
+            return None
 
-def delete_email(social_api: SocialAPI, email_data: dict, user: User):
-    if social_api.type_api == GOOGLE and not social_api.imap_config:
-        result = email_operations_google.delete_email(
-            user, social_api.email, email_data["email_id"]
-        )
-        if "error" in result:
-            LOGGER.error(f"Error deleting email via Google: {result.get('error')}")
-        else:
+        processed_email = process_email(email_data, user, social_api, categories)
+
+        ai_output: dict = processed_email["email_processed"].copy()
+        ai_output.pop("summary")
+
+        if social_api.type_api == GOOGLE and not social_api.imap_config:
+            google_labels.replicate_labels(social_api, ai_output, provider_id)
+        elif social_api.type_api == MICROSOFT and not social_api.imap_config:
+            microsoft_labels.replicate_labels(social_api, ai_output, provider_id)
+
+        return processed_email
+
+    except Exception as e:
+        # Release the claim so that the email can be processed again later
+        if claimed:
+            release_email_claims([provider_id])
+
+        if "duplicate key value violates unique constraint" in str(e):
             LOGGER.info(
-                f"Result after deleting email via Google: {result.get('message')}"
+                "Email ID already saved by another process for user ID: %s. Skipping.",
+                user.id,
             )
-    elif social_api.type_api == MICROSOFT and not social_api.imap_config:
-        result = email_operations_microsoft.delete_email(
-            email_data["email_id"], social_api
-        )
-        if "error" in result:
-            LOGGER.error(f"Error deleting email via Microsoft: {result.get('error')}")
         else:
+            LOGGER.error(
+                "Error processing email ID: %s for user ID: %s: %s",
+                provider_id,
+                user.id,
+                e,
+            )
+        return None
+
+
+def flush_emails_to_db(
+    processed_emails: list[dict],
+    user: User,
+    social_api: SocialAPI,
+    rules: list[Rule] = None,
+) -> int:
+    """
+    Write a batch of processed emails to the database in a single transaction.
+
+    If the batch fails, its emails are written one by one so that a single faulty
+    email does not prevent the others from being saved.
+
+    Args:
+        processed_emails (list[dict]): The processed emails to save.
+        user (User): The user object associated with the emails.
+        social_api (SocialAPI): An object representing the social API being used.
+        rules (Optional[list[Rule]]): The rules of the user.
+
+    Returns:
+        int: The number of emails successfully saved.
+    """
+    provider_ids = [email["email_data"]["email_id"] for email in processed_emails]
+
+    # Drop the emails that are already saved so that a duplicate never reaches the
+    # INSERT and rolls back the whole batch
+    saved_ids = set(
+        Email.objects.filter(provider_id__in=provider_ids).values_list(
+            "provider_id", flat=True
+        )
+    )
+    if saved_ids:
+        LOGGER.info(
+            "Skipping %s emails already saved for user ID: %s.", len(saved_ids), user.id
+        )
+        drop_email_claims(list(saved_ids))
+        processed_emails = [
+            email
+            for email in processed_emails
+            if email["email_data"]["email_id"] not in saved_ids
+        ]
+        if not processed_emails:
+            return 0
+        provider_ids = [email["email_data"]["email_id"] for email in processed_emails]
+
+    try:
+        # All database writes share a single transaction that does not span the AI calls
+        with transaction.atomic():
+            email_entries = save_emails_to_db(processed_emails, user, social_api)
+
+            for processed_email, email_entry in zip(processed_emails, email_entries):
+                email_data = processed_email["email_data"]
+                if is_shipping_label(email_data["subject"]):
+                    process_label(
+                        email_data["from_info"][1],
+                        email_data["subject"],
+                        email_data["safe_html"],
+                        email_entry,
+                    )
+
+    except Exception as e:
+        if len(processed_emails) > 1:
+            LOGGER.warning(
+                "Error saving a batch of %s emails for user ID: %s, saving them one by one: %s",
+                len(processed_emails),
+                user.id,
+                e,
+            )
+            return sum(
+                flush_emails_to_db([processed_email], user, social_api, rules)
+                for processed_email in processed_emails
+            )
+
+        # Release the claim so that the email can be processed again later
+        release_email_claims(provider_ids)
+
+        if "duplicate key value violates unique constraint" in str(e):
             LOGGER.info(
-                f"Result after deleting email via Microsoft: {result.get('message')}"
+                "Email ID already saved by another process for user ID: %s. Skipping.",
+                user.id,
             )
-    elif social_api.imap_config:
-        result = email_operations_imap.delete_email(email_data["email_id"], social_api)
-        if "error" in result:
-            LOGGER.error(f"Error deleting email via IMAP: {result.get('error')}")
         else:
-            LOGGER.info(
-                f"Result after deleting email via IMAP: {result.get('message')}"
+            LOGGER.error(
+                "Error saving email ID: %s for user ID: %s: %s",
+                provider_ids[0],
+                user.id,
+                e,
             )
+        return 0
+
+    transaction.on_commit(partial(drop_email_claims, provider_ids))
+
+    for processed_email, email_entry in zip(processed_emails, email_entries):
+        try:
+            apply_rules(processed_email, user, email_entry, rules)
+        except Exception as e:
+            LOGGER.error(
+                "Error applying rules to email ID: %s for user ID: %s: %s",
+                email_entry.provider_id,
+                user.id,
+                e,
+            )
+
+        LOGGER.info(
+            "Email ID: %s saved successfully for social_api email: %s",
+            email_entry.provider_id,
+            social_api.email,
+        )
+
+    return len(email_entries)
+
+
+def delete_email(social_api: SocialAPI, email_data: dict, user: User):
+    """
+    Delete an email through the provider API of the given account.
+
+    Args:
+        social_api (SocialAPI): An object representing the social API being used.
+        email_data (dict): The fetched email data containing the provider email ID.
+        user (User): The user who owns the email.
+    """
+    email_id = email_data["email_id"]
+    if social_api.imap_config:
+        provider = "IMAP"
+        delete = partial(email_operations_imap.delete_email, social_api, email_id)
+    elif social_api.type_api == GOOGLE:
+        provider = "Google"
+        delete = partial(
+            email_operations_google.delete_email, user, social_api.email, email_id
+        )
+    elif social_api.type_api == MICROSOFT:
+        provider = "Microsoft"
+        delete = partial(email_operations_microsoft.delete_email, social_api, email_id)
+    else:
+        LOGGER.error("Unsupported API type: %s", social_api.type_api)
+        return
+
+    result = delete()
+    if "error" in result:
+        LOGGER.error("Error deleting email via %s: %s", provider, result.get("error"))
+    else:
+        LOGGER.info(
+            "Result after deleting email via %s: %s", provider, result.get("message")
+        )
+
 
+def apply_rules(
+    processed_email: dict, user: User, email_entry: Email, rules: list[Rule] = None
+):
+    if rules is None:
+        rules = Rule.objects.filter(user=user)
+    from_email = processed_email["email_data"]["from_info"][1]
+    updated_fields = set()
 
-def apply_rules(processed_email: dict, user: User, email_entry: Email):
-    rules = Rule.objects.filter(user=user)
     for rule in rules:
         if rule.logical_operator == "AND":
 
@@ -227,60 +635,48 @@ def apply_rules(processed_email: dict, user: User, email_entry: Email):
                 verify_condition(condition, processed_email, rule)
                 for condition in defined_conditions
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
 
         elif rule.logical_operator == "OR":
-            if (
-                Rule.objects.filter(user=user)
-                .filter(
-                    domains__contains=[
-                        processed_email["email_data"]["from_info"][1].split("@")[1]
-                    ]
-                )
-                .exists()
-            ):
-                apply_rule_actions(rule, email_entry)
-            elif (
-                Rule.objects.filter(user=user)
-                .filter(
-                    sender_emails__contains=[
-                        processed_email["email_data"]["from_info"][1]
-                    ]
-                )
-                .exists()
-            ):
-                apply_rule_actions(rule, email_entry)
+            if rule.domains and from_email.split("@")[1] in rule.domains:
+                updated_fields |= apply_rule_actions(rule, email_entry)
+            elif rule.sender_emails and from_email in rule.sender_emails:
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif (
                 rule.has_attachements
                 and processed_email["email_data"]["has_attachments"]
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif (
                 rule.categories
                 and processed_email["email_processed"]["category"] in rule.categories
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif (
                 rule.priorities
                 and processed_email["email_processed"]["priority"] in rule.priorities
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif (
                 rule.answers
                 and processed_email["email_processed"]["answer"] in rule.answers
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif (
                 rule.relevances
                 and processed_email["email_processed"]["relevance"] in rule.relevances
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif (
                 rule.flags and processed_email["email_processed"]["flags"] in rule.flags
             ):
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
             elif rule.action_transfer_recipients:
-                apply_rule_actions(rule, email_entry)
+                updated_fields |= apply_rule_actions(rule, email_entry)
+
+    # The actions of every matching rule are persisted with a single UPDATE
+    if updated_fields:
+        email_entry.save(update_fields=updated_fields)
 
 
 def verify_condition(condition: str, processed_email: dict, rule: Rule) -> bool:
@@ -312,26 +708,51 @@ def verify_condition(condition: str, processed_email: dict, rule: Rule) -> bool:
         return False
 
 
-def apply_rule_actions(rule: Rule, email_entry: Email):
+def apply_rule_actions(rule: Rule, email_entry: Email) -> set[str]:
+    """
+    Apply the actions of a rule to a saved email.
+
+    The fields changed on the email entry are returned so that the caller saves them
+    once for all the rules that match.
+
+    Args:
+        rule (Rule): The rule whose conditions are met.
+        email_entry (Email): The saved email the rule applies to.
+
+    Returns:
+        set[str]: The names of the Email fields updated by the actions.
+    """
+    updated_fields = set()
     if rule.action_mark_as:
         for action in rule.action_mark_as:
             if action == "read":
                 email_entry.read = True
+                updated_fields.add("read")
             elif action == "answerLater":
                 email_entry.answer_later = True
+                updated_fields.add("answer_later")
             elif action == "archive":
                 email_entry.archive = True
+                updated_fields.add("archive")
     if rule.action_set_answer:
         email_entry.answer = rule.action_set_answer
+        updated_fields.add("answer")
     if rule.action_set_priority:
         email_entry.priority = rule.action_set_priority
+        updated_fields.add("priority")
     if rule.action_set_relevance:
         email_entry.relevance = rule.action_set_relevance
+        updated_fields.add("relevance")
+    if rule.action_set_category_id:
+        # The ID is copied directly so that the Category is not loaded
+        email_entry.category_id = rule.action_set_category_id
+        updated_fields.add("category")
     if rule.action_set_flags:
         for flag in rule.action_set_flags:
-            process_email["email_processed"]["flags"][
-                email_processing.camel_to_snake(flag)
-            ] = True
+            flag_field = email_processing.camel_to_snake(flag)
+            if flag_field in FLAG_STATISTICS:
+                setattr(email_entry, flag_field, True)
+                updated_fields.add(flag_field)
     if rule.action_transfer_recipients:
         if email_entry.email_provider == GOOGLE:
             transfer_email_google(
@@ -357,6 +778,8 @@ def apply_rule_actions(rule: Rule, email_entry: Email):
                 rule.action_reply_prompt,
             )
 
+    return updated_fields
+
 
 def get_email_data(social_api: SocialAPI, email_id: str = None) -> dict:
     """
@@ -379,12 +802,13 @@ def get_email_data(social_api: SocialAPI, email_id: str = None) -> dict:
         raise ValueError(f"Unsupported API type: {social_api.type_api}")
 
 
-def delete_email_rule(user: User, email_data: dict) -> bool:
+def delete_email_rule(user: User, email_data: dict, rules: list[Rule] = None) -> bool:
     """
     Check if the email should be deleted.
 
     Args:
         email_data (dict): A dictionary containing the email data.
+        rules (Optional[list[Rule]]): The rules of the user, queried when not given.
 
     Returns:
         bool: True if the email should be deleted, False otherwise.
@@ -393,6 +817,16 @@ def delete_email_rule(user: User, email_data: dict) -> bool:
 
     sender_domain = from_email.split("@")[1]
 
+    if rules is not None:
+        return any(
+            rule.action_delete
+            and (
+                sender_domain in (rule.domains or [])
+                or from_email in (rule.sender_emails or [])
+            )
+            for rule in rules
+        )
+
     # Check if there's already a rule blocking this sender's domain or email
     existing_rule = (
         Rule.objects.filter(user=user)
@@ -410,7 +844,12 @@ def delete_email_rule(user: User, email_data: dict) -> bool:
         return False
 
 
-def process_email(email_data: dict, user: User, social_api: SocialAPI) -> dict:
+def process_email(
+    email_data: dict,
+    user: User,
+    social_api: SocialAPI,
+    categories: dict[str, Category] = None,
+) -> dict:
     """
     Process the email data.
 
@@ -418,6 +857,8 @@ def process_email(email_data: dict, user: User, social_api: SocialAPI) -> dict:
         email_data (dict): A dictionary containing the email data to be processed.
         user (User): The user object associated with the email.
         social_api (SocialAPI): An object representing the social API being used.
+        categories (Optional[dict[str, Category]]): The categories of the user, indexed by name.
+            Loaded from the database when not provided.
 
     Returns:
         dict: A dictionary containing the processed email data, including the original
@@ -426,11 +867,12 @@ def process_email(email_data: dict, user: User, social_api: SocialAPI) -> dict:
     try:
         user_description = social_api.user_description or ""
         language = Preference.objects.get(user=user).language
-        category_dict = email_processing.get_db_categories(user)
+        if categories is None:
+            categories = get_user_categories(user)
+        category_dict = email_processing.get_category_descriptions(categories.values())
 
-        email_content = email_processing.preprocess_email(
-            email_data["preprocessed_data"]
-        )
+        # Providers already return html-cleared and preprocessed content
+        email_content = email_data["preprocessed_data"]
         search = Search(user.id)
 
         from_email = email_data["from_info"][1]
@@ -454,7 +896,7 @@ def process_email(email_data: dict, user: User, social_api: SocialAPI) -> dict:
                     else CATEGORIZE_AND_SUMMARIZE_EMAIL_PROMPT
                 ),
                 email_data["subject"],
-                email_data["preprocessed_data"],
+                email_content,
                 category_dict,
                 user_description,
                 from_email,
@@ -481,10 +923,11 @@ def process_email(email_data: dict, user: User, social_api: SocialAPI) -> dict:
             "email_data": email_data,
             "email_processed": email_processed,
             "summary": summary,
+            "categories": categories,
         }
     except Exception as e:
         LOGGER.critical(
-            f"Failed to process email with AI for email: {social_api.email}"
+            "Failed to process email with AI for email: %s", social_api.email
         )
 
         context = {
@@ -504,7 +947,6 @@ def process_email(email_data: dict, user: User, social_api: SocialAPI) -> dict:
         )
 
 
-@transaction.atomic
 def save_email_to_db(processed_email: dict, user: User, social_api: SocialAPI) -> Email:
     """
     Save the processed email to the database.
@@ -517,110 +959,275 @@ def save_email_to_db(processed_email: dict, user: User, social_api: SocialAPI) -
     Returns:
         email_entry (Email): The saved Email model instance representing the stored email.
     """
-    email_data = processed_email["email_data"]
-    email_ai = processed_email["email_processed"]
-    summary = processed_email["summary"]
-    topic = email_ai["topic"]
-    is_reply = email_data["is_reply"]
-    from_info = email_data["from_info"]
+    return save_emails_to_db([processed_email], user, social_api)[0]
+
+
+def save_emails_to_db(
+    processed_emails: list[dict], user: User, social_api: SocialAPI
+) -> list[Email]:
+    """
+    Save a batch of processed emails to the database with one bulk insert per model.
+
+    Args:
+        processed_emails (list[dict]): The processed emails to save.
+        user (User): The user object associated with the emails.
+        social_api (SocialAPI): An object representing the social API being used.
 
-    category, sender = process_email_entities(topic, from_info, user)
+    Returns:
+        list[Email]: The saved Email model instances, in the order of processed_emails.
+    """
+    categories: dict[str, Category] = {}
+    senders: dict[str, str] = {}
+    sender_emails = []
+    for processed_email in processed_emails:
+        categories.update(processed_email["categories"])
+        sender_name, sender_email = processed_email["email_data"]["from_info"]
+        senders.setdefault(sender_email, sender_name)
+        sender_emails.append(sender_email)
+
+    sender_ids = get_or_create_sender_ids(senders)
+    ensure_contacts(user, senders)
+
+    email_entries = []
+    for processed_email, sender_email in zip(processed_emails, sender_emails):
+        email_data = processed_email["email_data"]
+        email_ai = processed_email["email_processed"]
+
+        topic = email_ai["topic"]
+        category = categories.get(topic)
+        if not category:
+            category = Category.objects.get_or_create(name=topic, user=user)[0]
+            categories[topic] = category
+
+        email_entries.append(
+            build_email_entry(
+                email_ai,
+                email_data,
+                user,
+                social_api,
+                category,
+                sender_ids[sender_email],
+            )
+        )
 
-    email_entry = create_email_entry(
-        email_ai, email_data, user, social_api, category, sender
+    Email.objects.bulk_create(email_entries)
+
+    body_rows = []
+    keypoint_rows = []
+    cc_sender_rows = []
+    bcc_sender_rows = []
+    picture_rows = []
+    attachment_rows = []
+    for processed_email, email_entry in zip(processed_emails, email_entries):
+        email_data = processed_email["email_data"]
+        email_id = email_entry.id
+        body_rows.append(
+            (
+                email_id,
+                encrypt_text(EMAIL_HTML_CONTENT_KEY, email_data.get("safe_html", "")),
+            )
+        )
+        build_keypoint_rows = (
+            build_reply_keypoint_rows
+            if email_data["is_reply"]
+            else build_email_keypoint_rows
+        )
+        keypoint_rows += build_keypoint_rows(processed_email["summary"], email_id)
+        cc_rows, bcc_rows = build_cc_bcc_sender_rows(email_data, email_id)
+        cc_sender_rows += cc_rows
+        bcc_sender_rows += bcc_rows
+        email_picture_rows, email_attachment_rows = build_picture_and_attachment_rows(
+            email_data, email_id
+        )
+        picture_rows += email_picture_rows
+        attachment_rows += email_attachment_rows
+
+    insert_email_children(
+        {
+            EmailBody: body_rows,
+            KeyPoint: keypoint_rows,
+            CC_sender: cc_sender_rows,
+            BCC_sender: bcc_sender_rows,
+            Picture: picture_rows,
+            Attachment: attachment_rows,
+        }
+    )
+    save_stats(
+        [processed_email["email_processed"] for processed_email in processed_emails],
+        user,
     )
-    create_keypoints(summary, is_reply, email_entry)
-    save_stats(email_ai, user)
-    create_cc_bcc_senders(email_data, email_entry)
-    create_pictures_and_attachments(email_data, email_entry)
 
-    return email_entry
+    return email_entries
 
 
-def save_stats(email_ai: dict, user: User):
+def save_stats(emails_ai: list[dict], user: User):
     """
-    Updates the statistical data for a user based on the AI analysis of an email.
+    Updates the statistical data for a user based on the AI analysis of emails.
 
     Args:
-        email_ai (dict): A dictionary containing AI-generated information about the email.
+        emails_ai (list[dict]): The AI-generated information about each email.
         user (User): The user object whose statistics are being updated.
     """
-    statistics = Statistics.objects.get(user=user)
+    counters = Counter(nb_emails_received=len(emails_ai))
+    for email_ai in emails_ai:
+        counters.update(
+            counter
+            for flag, counter in FLAG_STATISTICS.items()
+            if email_ai["flags"][flag]
+        )
+        for field, statistics_by_value in STATISTICS_BY_FIELD.items():
+            counter = statistics_by_value.get(email_ai[field])
+            if counter:
+                counters[counter] += 1
 
-    statistics.nb_emails_received += 1
+    Statistics.objects.filter(user=user).update(
+        **{counter: F(counter) + count for counter, count in counters.items()}
+    )
 
-    statistics.nb_meeting += 1 if email_ai["flags"]["meeting"] else 0
-    statistics.nb_spam += 1 if email_ai["flags"]["spam"] else 0
-    statistics.nb_scam += 1 if email_ai["flags"]["scam"] else 0
-    statistics.nb_newsletter += 1 if email_ai["flags"]["newsletter"] else 0
-    statistics.nb_notification += 1 if email_ai["flags"]["notification"] else 0
 
-    statistics.nb_emails_important += 1 if email_ai["importance"] == IMPORTANT else 0
-    statistics.nb_emails_informative += (
-        1 if email_ai["importance"] == INFORMATIVE else 0
-    )
-    statistics.nb_emails_useless += 1 if email_ai["importance"] == USELESS else 0
+def get_or_create_sender_ids(senders: dict[str, str]) -> dict[str, int]:
+    """
+    Returns the IDs of the Senders with the given emails, creating the missing ones.
 
-    statistics.nb_answer_required += 1 if email_ai["response"] == ANSWER_REQUIRED else 0
-    statistics.nb_might_require_answer += (
-        1 if email_ai["response"] == MIGHT_REQUIRE_ANSWER else 0
-    )
-    statistics.nb_no_answer_required += (
-        1 if email_ai["response"] == NO_ANSWER_REQUIRED else 0
+    IDs are cached per process once the transaction that read or created them is committed.
+
+    Args:
+        senders (dict[str, str]): The names of the senders, indexed by email address.
+
+    Returns:
+        dict[str, int]: The IDs of the Senders, indexed by email address.
+    """
+    with ENTITY_CACHE_LOCK:
+        sender_ids = {
+            sender_email: SENDER_ID_CACHE[sender_email]
+            for sender_email in senders
+            if sender_email in SENDER_ID_CACHE
+        }
+
+    missing_emails = senders.keys() - sender_ids.keys()
+    if not missing_emails:
+        return sender_ids
+
+    found_ids = dict(
+        Sender.objects.filter(email__in=missing_emails).values_list("email", "id")
     )
+    new_emails = missing_emails - found_ids.keys()
+    if new_emails:
+        # A single upsert returns the IDs, including those of Senders inserted
+        # concurrently since the lookup above
+        created_senders = Sender.objects.bulk_create(
+            [
+                Sender(email=sender_email, name=senders[sender_email] or sender_email)
+                for sender_email in new_emails
+            ],
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=["name"],
+        )
+        found_ids.update((sender.email, sender.id) for sender in created_senders)
+
+    def cache_sender_ids():
+        with ENTITY_CACHE_LOCK:
+            SENDER_ID_CACHE.update(found_ids)
+
+    transaction.on_commit(cache_sender_ids)
+    sender_ids.update(found_ids)
+    return sender_ids
+
 
-    statistics.nb_highly_relevant += (
-        1 if email_ai["relevance"] == HIGHLY_RELEVANT else 0
+def ensure_contacts(user: User, contacts: dict[str, str]):
+    """
+    Creates the Contacts of a user that do not already exist.
+
+    Known contacts are cached per process once the transaction that read or created them is committed.
+
+    Args:
+        user (User): The user owning the contacts.
+        contacts (dict[str, str]): The names of the contacts, indexed by email address.
+    """
+    with ENTITY_CACHE_LOCK:
+        missing_emails = {
+            contact_email
+            for contact_email in contacts
+            if (user.id, contact_email) not in KNOWN_CONTACTS_CACHE
+        }
+    if not missing_emails:
+        return
+
+    existing_emails = set(
+        Contact.objects.filter(user=user, email__in=missing_emails).values_list(
+            "email", flat=True
+        )
     )
-    statistics.nb_possibly_relevant += (
-        1 if email_ai["relevance"] == POSSIBLY_RELEVANT else 0
+    Contact.objects.bulk_create(
+        [
+            Contact(user=user, email=contact_email, username=contacts[contact_email])
+            for contact_email in missing_emails - existing_emails
+        ]
     )
-    statistics.nb_not_relevant += 1 if email_ai["relevance"] == NOT_RELEVANT else 0
 
-    statistics.save()
+    def cache_contacts():
+        with ENTITY_CACHE_LOCK:
+            for contact_email in missing_emails:
+                KNOWN_CONTACTS_CACHE[(user.id, contact_email)] = True
 
+    transaction.on_commit(cache_contacts)
 
-def process_email_entities(
-    topic: str, from_info: tuple, user: User
-) -> tuple[Category, Sender]:
+
+def get_user_categories(user: User) -> dict[str, Category]:
     """
-    Get or create the email category, sender, and contact.
+    Returns the categories of a user, cached per process for a short time.
 
     Args:
-        topic (str): The topic of the email.
-        from_info (tuple): A tuple containing the sender's name and email.
-        user (User): The user object associated with the email.
+        user (User): The user owning the categories.
 
     Returns:
-        tuple: A tuple containing two elements:
-               category: The Category object for the email.
-               sender: The Sender object for the email.
+        dict[str, Category]: A copy of the user's categories, indexed by name.
     """
-    category = Category.objects.get_or_create(name=topic, user=user)[0]
+    with ENTITY_CACHE_LOCK:
+        categories = CATEGORIES_CACHE.get(user.id)
 
-    sender_name, sender_email = from_info
-    sender, _ = Sender.objects.get_or_create(
-        email=sender_email, defaults={"name": sender_name or sender_email}
-    )
+    if categories is None:
+        categories = {
+            category.name: category for category in Category.objects.filter(user=user)
+        }
+        with ENTITY_CACHE_LOCK:
+            CATEGORIES_CACHE[user.id] = categories
+
+    return dict(categories)
+
+
+@receiver(post_delete, sender=Sender)
+def forget_sender(sender, instance: Sender, **kwargs):
+    """Removes a deleted Sender from the process cache."""
+    with ENTITY_CACHE_LOCK:
+        SENDER_ID_CACHE.pop(instance.email, None)
 
-    if not Contact.objects.filter(user=user, email=sender_email).exists():
-        Contact.objects.get_or_create(
-            user=user, email=sender_email, defaults={"username": sender_name}
-        )
 
-    return category, sender
+@receiver(post_delete, sender=Contact)
+def forget_contact(sender, instance: Contact, **kwargs):
+    """Removes a deleted Contact from the process cache."""
+    with ENTITY_CACHE_LOCK:
+        KNOWN_CONTACTS_CACHE.pop((instance.user_id, instance.email), None)
 
 
-def create_email_entry(
+@receiver([post_save, post_delete], sender=Category)
+def forget_categories(sender, instance: Category, **kwargs):
+    """Removes the cached categories of the user of a modified or deleted Category."""
+    with ENTITY_CACHE_LOCK:
+        CATEGORIES_CACHE.pop(instance.user_id, None)
+
+
+def build_email_entry(
     email_ai: dict,
     email_data: dict,
     user: User,
     social_api: SocialAPI,
     category: Category,
-    sender: Sender,
+    sender_id: int,
 ) -> Email:
     """
-    Create the main Email entry in the database.
+    Build the main Email entry, without saving it to the database.
 
     Args:
         email_ai (dict): Information provided by the AI processing.
@@ -628,12 +1235,12 @@ def create_email_entry(
         user (User): The user object associated with the email.
         social_api (SocialAPI): The social API object used to fetch the email.
         category (Category): The category object for the email.
-        sender (Sender): The sender object for the email.
+        sender_id (int): The ID of the sender object for the email.
 
     Returns:
-        Email: The created Email object.
+        Email: The unsaved Email object.
     """
-    return Email.objects.create(
+    return Email(
         social_api=social_api,
         provider_id=email_data["email_id"],
         email_provider=social_api.type_api,
@@ -644,12 +1251,9 @@ def create_email_entry(
             EMAIL_ONE_LINE_SUMMARY_KEY,
             email_ai["summary"]["one_line"],
         ),
-        html_content=encrypt_text(
-            EMAIL_HTML_CONTENT_KEY, email_data.get("safe_html", "")
-        ),
         subject=email_data["subject"],
         priority=email_ai["importance"],
-        sender=sender,
+        sender_id=sender_id,
         category=category,
         user=user,
         date=email_data["sent_date"],
@@ -664,46 +1268,99 @@ def create_email_entry(
     )
 
 
-def create_keypoints(summary: dict, is_reply: bool, email_entry: Email):
+def build_reply_keypoint_rows(summary: dict, email_id: int) -> list[tuple]:
     """
-    Create KeyPoint entries for the email.
+    Build the KeyPoint rows of a conversation summary, in the order of EMAIL_CHILD_COLUMNS.
 
     Args:
-        summary (dict): data from ai aswith keypoiiunts
-        is_reply (Email): The Email object to associate the keypoints with.
-    """
-    if is_reply:
-        keypoints = summary["keypoints"]
-        for index, keypoints_list in keypoints.items():
-            for keypoint in keypoints_list:
-                KeyPoint.objects.create(
-                    is_reply=True,
-                    position=index,
-                    category=summary["category"],
-                    organization=summary["organization"],
-                    topic=summary["topic"],
-                    content=keypoint,
-                    email=email_entry,
-                )
-    else:
-        for keypoint in summary["keypoints"]:
-            KeyPoint.objects.create(
-                is_reply=False,
-                category=summary["category"],
-                organization=summary["organization"],
-                topic=summary["topic"],
-                content=keypoint,
-                email=email_entry,
-            )
+        summary (dict): The conversation summary, with keypoints grouped by message position.
+        email_id (int): The ID of the Email to associate the keypoints with.
 
+    Returns:
+        list[tuple]: The KeyPoint rows to insert.
+    """
+    category, organization, topic, summary_keypoints = SUMMARY_FIELDS(summary)
+    return [
+        (True, index, category, organization, topic, keypoint, email_id)
+        for index, keypoints_list in summary_keypoints.items()
+        for keypoint in keypoints_list
+    ]
 
-def create_cc_bcc_senders(processed_email: dict, email_entry: Email):
+
+def build_email_keypoint_rows(summary: dict, email_id: int) -> list[tuple]:
+    """
+    Build the KeyPoint rows of a single email summary, in the order of EMAIL_CHILD_COLUMNS.
+
+    Args:
+        summary (dict): The email summary, with a flat list of keypoints.
+        email_id (int): The ID of the Email to associate the keypoints with.
+
+    Returns:
+        list[tuple]: The KeyPoint rows to insert.
+    """
+    category, organization, topic, summary_keypoints = SUMMARY_FIELDS(summary)
+    return [
+        (False, None, category, organization, topic, keypoint, email_id)
+        for keypoint in summary_keypoints
+    ]
+
+
+def insert_email_children(rows_by_model: dict[type[models.Model], list[tuple]]):
     """
-    Create CC and BCC sender entries.
+    Insert the child rows of a batch of emails in a single statement.
+
+    Each table gets an INSERT ... SELECT FROM unnest(...) and all of them are chained as
+    data-modifying CTEs, so every child table is written in one round-trip.
+
+    Args:
+        rows_by_model (dict[type[models.Model], list[tuple]]): The rows to insert per model,
+            in the order of EMAIL_CHILD_COLUMNS.
+    """
+    rows_by_model = {model: rows for model, rows in rows_by_model.items() if rows}
+    if not rows_by_model:
+        return
+
+    if connection.vendor != "postgresql":
+        for model, rows in rows_by_model.items():
+            columns = [column for column, _ in EMAIL_CHILD_COLUMNS[model]]
+            model.objects.bulk_create(model(**dict(zip(columns, row))) for row in rows)
+        return
+
+    statements = []
+    params = []
+    for model, rows in rows_by_model.items():
+        columns, types = zip(*EMAIL_CHILD_COLUMNS[model])
+        arrays = ", ".join(f"%s::{column_type}[]" for column_type in types)
+        statements.append(
+            f"INSERT INTO {model._meta.db_table} ({', '.join(columns)}) "
+            f"SELECT * FROM unnest({arrays})"
+        )
+        params.extend(list(values) for values in zip(*rows))
+
+    *ctes, query = statements
+    if ctes:
+        query = (
+            "WITH "
+            + ", ".join(f"insert_{index} AS ({cte})" for index, cte in enumerate(ctes))
+            + f" {query}"
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+
+
+def build_cc_bcc_sender_rows(
+    processed_email: dict, email_id: int
+) -> tuple[list[tuple], list[tuple]]:
+    """
+    Build the CC and BCC sender rows, in the order of EMAIL_CHILD_COLUMNS.
 
     Args:
         processed_email (dict): A dictionary containing the processed email data.
-        email_entry (Email): The Email object to associate the CC and BCC senders with.
+        email_id (int): The ID of the Email to associate the CC and BCC senders with.
+
+    Returns:
+        tuple: The CC_sender rows and the BCC_sender rows.
     """
     cc_info = processed_email.get("cc_info", [])
     bcc_info = processed_email.get("bcc_info", [])
@@ -748,58 +1405,60 @@ def create_cc_bcc_senders(processed_email: dict, email_entry: Email):
 
         return None, ""
 
-    def safe_create_sender(sender_info, creator_func):
-        """Helper function to safely create sender entries"""
-        try:
-            email, name = extract_email_and_name(sender_info)
+    def build_senders(senders_info) -> list[tuple]:
+        """Helper function to safely build sender rows"""
+        if not senders_info:
+            return []
+
+        if isinstance(senders_info, dict):
+            senders_info = [
+                [email, name]
+                for email, name in senders_info.items()
+                if email and isinstance(email, str)
+            ]
+        elif not isinstance(senders_info, (list, tuple)):
+            senders_info = [senders_info]
+
+        senders = []
+        for sender_info in senders_info:
+            try:
+                email, name = extract_email_and_name(sender_info)
+            except Exception as e:
+                LOGGER.warning("Failed to create sender entry: %s", e)
+                continue
 
             if not email:
-                return
+                continue
 
             if "@" not in email:
-                return
+                continue
 
-            creator_func(email_object=email_entry, email=email, name=name)
-        except Exception as e:
-            LOGGER.warning(f"Failed to create sender entry: {str(e)}")
-
-    if cc_info:
-        if isinstance(cc_info, dict):
-            for email, name in cc_info.items():
-                if email and isinstance(email, str):
-                    safe_create_sender([email, name], CC_sender.objects.create)
-        elif isinstance(cc_info, (list, tuple)):
-            for sender in cc_info:
-                safe_create_sender(sender, CC_sender.objects.create)
-        else:
-            safe_create_sender(cc_info, CC_sender.objects.create)
-
-    if bcc_info:
-        if isinstance(bcc_info, dict):
-            for email, name in bcc_info.items():
-                if email and isinstance(email, str):
-                    safe_create_sender([email, name], BCC_sender.objects.create)
-        elif isinstance(bcc_info, (list, tuple)):
-            for sender in bcc_info:
-                safe_create_sender(sender, BCC_sender.objects.create)
-        else:
-            safe_create_sender(bcc_info, BCC_sender.objects.create)
+            senders.append((email_id, email, name))
+
+        return senders
 
+    return build_senders(cc_info), build_senders(bcc_info)
 
-def create_pictures_and_attachments(processed_email: dict, email_entry: Email):
+
+def build_picture_and_attachment_rows(
+    processed_email: dict, email_id: int
+) -> tuple[list[tuple], list[tuple]]:
     """
-    Create Picture and Attachment entries.
+    Build the Picture and Attachment rows, in the order of EMAIL_CHILD_COLUMNS.
 
     Args:
         processed_email (dict): A dictionary containing the processed email data.
-        email_entry (Email): The Email object to associate the pictures and attachments with.
-    """
-    for image_path in processed_email.get("image_files", []):
-        Picture.objects.create(email=email_entry, path=image_path)
+        email_id (int): The ID of the Email to associate the pictures and attachments with.
 
-    for attachment in processed_email.get("attachments", []):
-        Attachment.objects.create(
-            email=email_entry,
-            name=attachment["attachmentName"],
-            id_api=attachment["attachmentId"],
-        )
+    Returns:
+        tuple: The Picture rows and the Attachment rows.
+    """
+    pictures = [
+        (email_id, image_path) for image_path in processed_email.get("image_files", [])
+    ]
+    attachments = [
+        (email_id, attachment["attachmentName"], attachment["attachmentId"])
+        for attachment in processed_email.get("attachments", [])
+    ]
+
+    return pictures, attachments
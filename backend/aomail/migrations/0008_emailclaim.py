@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aomail', '0007_socialapi_last_fetched_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailClaim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider_id', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
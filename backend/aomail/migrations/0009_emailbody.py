@@ -0,0 +1,49 @@
+# Generated by Django 5.1.6 on 2026-10-16 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_content_to_body(apps, schema_editor):
+    Email = apps.get_model("aomail", "Email")
+    EmailBody = apps.get_model("aomail", "EmailBody")
+    EmailBody.objects.bulk_create(
+        (
+            EmailBody(email_id=email_id, html_content=html_content)
+            for email_id, html_content in Email.objects.values_list(
+                "id", "html_content"
+            ).iterator(chunk_size=1000)
+        ),
+        batch_size=1000,
+    )
+
+
+def move_body_to_content(apps, schema_editor):
+    Email = apps.get_model("aomail", "Email")
+    EmailBody = apps.get_model("aomail", "EmailBody")
+    for email_id, html_content in EmailBody.objects.values_list(
+        "email_id", "html_content"
+    ).iterator(chunk_size=1000):
+        Email.objects.filter(id=email_id).update(html_content=html_content)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aomail', '0008_emailclaim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailBody',
+            fields=[
+                ('email', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='aomail.email')),
+                ('html_content', models.TextField(default='')),
+            ],
+        ),
+        migrations.RunPython(move_content_to_body, move_body_to_content),
+        migrations.RemoveField(
+            model_name='email',
+            name='html_content',
+        ),
+    ]
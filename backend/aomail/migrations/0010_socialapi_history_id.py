@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aomail', '0009_emailbody'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='socialapi',
+            name='history_id',
+            field=models.CharField(max_length=30, null=True),
+        ),
+    ]
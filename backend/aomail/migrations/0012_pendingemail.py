@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-16 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aomail', '0011_socialapi_access_token_expiry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider_id', models.CharField(max_length=200, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('social_api', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='aomail.socialapi')),
+            ],
+        ),
+    ]
@@ -136,6 +136,8 @@ class SocialAPI(models.Model):
     type_api = models.CharField(max_length=50)
     email = models.CharField(max_length=524, unique=True)
     access_token = models.CharField(max_length=3000)
+    # Expiry of the access token when known, shared by every worker to skip refreshes
+    access_token_expiry = models.DateTimeField(null=True)
     refresh_token = models.CharField(max_length=2000)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     user_description = models.CharField(max_length=200, default="")
@@ -151,6 +153,8 @@ class SocialAPI(models.Model):
         null=True,
         related_name="smtp_config",
     )
+    # Last Gmail history ID whose new messages have been synced
+    history_id = models.CharField(max_length=30, null=True)
 
 
 class Rule(models.Model):
@@ -226,7 +230,6 @@ class Email(models.Model):
     email_provider = models.CharField(max_length=50)
     short_summary = models.TextField()
     one_line_summary = models.CharField(max_length=1000)
-    html_content = models.TextField(default="")
     subject = models.CharField(max_length=800)
     priority = models.CharField(max_length=50)
     read = models.BooleanField(default=False)
@@ -248,6 +251,30 @@ class Email(models.Model):
     meeting = models.BooleanField(default=False)
 
 
+class EmailBody(models.Model):
+    """Model for storing the content of an email apart from the frequently queried Email rows."""
+
+    email = models.OneToOneField(
+        Email, on_delete=models.CASCADE, primary_key=True, related_name="body"
+    )
+    html_content = models.TextField(default="")
+
+
+class EmailClaim(models.Model):
+    """Marks an email as taken by an ingestion process to prevent duplicate processing."""
+
+    provider_id = models.CharField(max_length=200, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class PendingEmail(models.Model):
+    """Email notification acknowledged to the provider but not yet saved to the database."""
+
+    social_api = models.ForeignKey(SocialAPI, on_delete=models.CASCADE)
+    provider_id = models.CharField(max_length=200, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
 class Filter(models.Model):
     """Model for storing filter information"""
 
@@ -6,9 +6,10 @@ import logging
 import time
 from django.utils import timezone
 from datetime import timedelta
-from aomail.models import GoogleListener
+from aomail.models import EmailClaim, GoogleListener, PendingEmail, SocialAPI
 from aomail.email_providers.google import webhook as google_webhook
-from aomail.constants import ENV
+from aomail.email_providers.utils import flush_pending_emails
+from aomail.constants import EMAIL_CLAIM_TTL, ENV, PENDING_EMAIL_RECOVERY_DELAY
 
 
 LOGGER = logging.getLogger(__name__)
@@ -66,3 +67,37 @@ def renew_gmail_subscriptions():
     minutes, seconds = divmod(remainder, 60)
     formatted_time = f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
     LOGGER.info(f"Renewed {nb_subrenew} subscriptions in {formatted_time}.")
+
+
+def delete_expired_email_claims():
+    """
+    Delete the email claims older than EMAIL_CLAIM_TTL seconds.
+
+    Claims are dropped once their email is saved, the remaining old ones were left by
+    an ingestion process that stopped midway and would block the email forever.
+    """
+    expiry_threshold = timezone.now() - timedelta(seconds=EMAIL_CLAIM_TTL)
+    nb_deleted, _ = EmailClaim.objects.filter(created_at__lt=expiry_threshold).delete()
+    LOGGER.info(f"Deleted {nb_deleted} expired email claims.")
+
+
+def flush_stale_pending_emails():
+    """
+    Save the pending emails older than PENDING_EMAIL_RECOVERY_DELAY seconds.
+
+    Pending emails are saved a few seconds after their notification, the remaining old
+    ones were left by a process that stopped before saving them.
+    """
+    stale_threshold = timezone.now() - timedelta(seconds=PENDING_EMAIL_RECOVERY_DELAY)
+    social_api_ids = (
+        PendingEmail.objects.filter(created_at__lt=stale_threshold)
+        .values_list("social_api_id", flat=True)
+        .distinct()
+    )
+    social_apis = SocialAPI.objects.select_related("user").filter(id__in=social_api_ids)
+
+    for social_api in social_apis:
+        LOGGER.warning(
+            f"Saving pending emails left unsaved for user ID: {social_api.user_id}, SocialAPI ID: {social_api.id}"
+        )
+        flush_pending_emails(social_api)
@@ -5,6 +5,7 @@ Utility Functions for Email Processing
 import logging
 import re
 import base64
+from collections.abc import Iterable
 from django.db import IntegrityError
 from aomail.constants import DEFAULT_CATEGORY
 from aomail.models import Category, Contact
@@ -16,6 +17,14 @@ from django.contrib.auth.models import User
 LOGGER = logging.getLogger(__name__)
 
 
+######################## REGULAR EXPRESSIONS ########################
+IMAGE_PLACEHOLDER_PATTERN = re.compile(r"\[image:[^\]]+\]")
+IMAGE_LINK_PATTERN = re.compile(r"\[image[^\]]+\](?:\s*<\S+>)?")
+LINE_EDGE_SPACES_PATTERN = re.compile(r"[^\S\n]*\n[^\S\n]*")
+MULTIPLE_SPACES_PATTERN = re.compile(r" +")
+MULTIPLE_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+
+
 def validate_email_address(email_address: str) -> bool:
     # https://stackoverflow.com/questions/8022530/how-to-check-for-valid-email-address
     return "@" in email_address
@@ -107,21 +116,32 @@ def save_contacts(user: User, all_recipients: list[str]):
         user (User): The authenticated user object.
         all_recipients (list[str]): A list of recipient email addresses to be saved as contacts.
     """
-    for recipient_email in all_recipients:
-        contact = Contact.objects.filter(email=recipient_email)
-
-        if not is_no_reply_email(recipient_email):
-            if not contact.exists():
-                username = " ".join(
-                    [
-                        part.capitalize()
-                        for part in re.split(r"[.-]", recipient_email.split("@")[0])
-                        if part
-                    ]
-                )
-                Contact.objects.create(
-                    email=recipient_email, user=user, username=username
-                )
+    recipient_emails = [
+        recipient_email
+        for recipient_email in dict.fromkeys(all_recipients)
+        if not is_no_reply_email(recipient_email)
+    ]
+    existing_emails = set(
+        Contact.objects.filter(user=user, email__in=recipient_emails).values_list(
+            "email", flat=True
+        )
+    )
+
+    new_contacts = []
+    for recipient_email in recipient_emails:
+        if recipient_email not in existing_emails:
+            username = " ".join(
+                [
+                    part.capitalize()
+                    for part in re.split(r"[.-]", recipient_email.split("@")[0])
+                    if part
+                ]
+            )
+            new_contacts.append(
+                Contact(email=recipient_email, user=user, username=username)
+            )
+
+    Contact.objects.bulk_create(new_contacts)
 
 
 ######################## EMAIL DATA PROCESSING ########################
@@ -136,6 +156,19 @@ def get_db_categories(current_user: User) -> dict[str, str]:
         dict[str, str]: A dictionary where the keys are category names and the values are category descriptions.
     """
     categories = Category.objects.filter(user=current_user)
+    return get_category_descriptions(categories)
+
+
+def get_category_descriptions(categories: Iterable[Category]) -> dict[str, str]:
+    """
+    Maps the given categories to their descriptions, including the default category.
+
+    Args:
+        categories (Iterable[Category]): The categories of a user.
+
+    Returns:
+        dict[str, str]: A dictionary where the keys are category names and the values are category descriptions.
+    """
     category_list = {category.name: category.description for category in categories}
     category_list[DEFAULT_CATEGORY] = (
         "All emails that can not be classify in any of the given categories"
@@ -170,9 +203,7 @@ def get_text_from_mail(mime_type: str, part: dict, decoded_data_temp: bytes) ->
     Returns:
         bytes: The decoded text from the email body.
     """
-    data: str = part["body"]["data"]
-    data = data.replace("-", "+").replace("_", "/")
-    decoded_data_temp = base64.b64decode(data)
+    decoded_data_temp = base64.urlsafe_b64decode(part["body"]["data"])
     if mime_type == "text/html":
         decoded_data_temp = html_clear(decoded_data_temp).encode()
     return decoded_data_temp
@@ -265,8 +296,7 @@ def process_part(part: dict, plaintext_var: list) -> str | None:
 
             decoded_data = concat_text(decoded_data, subpart_data)
             if plaintext_var[0] == 1 and decoded_data:
-                decoded_data = re.sub(r"\[image[^\]]+\]\s*<\S+>", "", decoded_data)
-                decoded_data = re.sub(r"\[image[^\]]+\]", "", decoded_data)
+                decoded_data = IMAGE_LINK_PATTERN.sub("", decoded_data)
     return decoded_data
 
 
@@ -282,18 +312,16 @@ def preprocess_email(email_content: str) -> str:
              unnecessary spacings, and converted line endings.
     """
     # Delete patterns like "[image: ...]"
-    email_content = re.sub(r"\[image:[^\]]+\]", "", email_content)
-
-    # Convert Windows line endings to Unix line endings
-    email_content = email_content.replace("\r\n", "\n")
+    email_content = IMAGE_PLACEHOLDER_PATTERN.sub("", email_content)
 
-    # Remove spaces at the start and end of each line
-    email_content = "\n".join(line.strip() for line in email_content.split("\n"))
+    # Remove spaces at the start and end of each line in a single scan, which also
+    # converts Windows line endings to Unix line endings
+    email_content = LINE_EDGE_SPACES_PATTERN.sub("\n", email_content)
 
     # Delete multiple spaces
-    email_content = re.sub(r" +", " ", email_content)
+    email_content = MULTIPLE_SPACES_PATTERN.sub(" ", email_content)
 
     # Reduce multiple consecutive newlines to two newlines
-    email_content = re.sub(r"\n{3,}", "\n\n", email_content)
+    email_content = MULTIPLE_NEWLINES_PATTERN.sub("\n\n", email_content)
 
     return email_content.strip()
@@ -23,6 +23,17 @@ DATABASE_CONFIG = {
         "PASSWORD": os.getenv("DJANGO_DB_PASSWORD"),
         "HOST": os.getenv("DJANGO_DB_HOST"),
         "PORT": os.getenv("DJANGO_DB_PORT"),
+        # Closed after each request by default: connections opened by async views and
+        # background threads are never closed by Django, pool them with PgBouncer instead
+        "CONN_MAX_AGE": int(os.getenv("DJANGO_DB_CONN_MAX_AGE", "0")),
+        # Only useful with persistent connections, it costs a query per request
+        "CONN_HEALTH_CHECKS": os.getenv("DJANGO_DB_CONN_HEALTH_CHECKS", "False").lower()
+        == "true",
+        # Required when HOST points to a PgBouncer pool in transaction mode
+        "DISABLE_SERVER_SIDE_CURSORS": os.getenv(
+            "DJANGO_DB_DISABLE_SERVER_SIDE_CURSORS", "False"
+        ).lower()
+        == "true",
     }
 }
 BACKEND_LOG_PATH = "backend.log"
@@ -92,6 +103,7 @@ TEMPLATES = [
 ]
 
 # ----------------------- LOGGING CONFIGURATION -----------------------#
+LOG_LEVEL = os.getenv("DJANGO_LOG_LEVEL", "INFO")
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -99,12 +111,12 @@ LOGGING = {
         "console": {
             "class": "logging.StreamHandler",
             "formatter": "basic",
-            "level": "INFO",
+            "level": LOG_LEVEL,
         },
         "file": {
             "class": "logging.FileHandler",
             "filename": BACKEND_LOG_PATH,
-            "level": "INFO",
+            "level": LOG_LEVEL,
             "formatter": "json",
         },
     },
@@ -119,7 +131,7 @@ LOGGING = {
         },
         "": {
             "handlers": ["console", "file"],
-            "level": "INFO",
+            "level": LOG_LEVEL,
         },
     },
     "formatters": {
@@ -217,4 +229,6 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://crontab.guru/
 CRONJOBS = [
     ("0 3 * * *", "aomail.schedule_tasks.renew_gmail_subscriptions"),
+    ("0 * * * *", "aomail.schedule_tasks.delete_expired_email_claims"),
+    ("*/5 * * * *", "aomail.schedule_tasks.flush_stale_pending_emails"),
 ]
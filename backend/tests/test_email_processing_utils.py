@@ -1,7 +1,11 @@
+import pytest
+from django.contrib.auth.models import User
+from aomail.models import Contact
 from aomail.utils.email_processing import (
     camel_to_snake,
     is_no_reply_email,
     preprocess_email,
+    save_contacts,
     validate_email_address,
     snake_to_camel,
     contains_html,
@@ -74,3 +78,37 @@ def test_concat_text():
     assert concat_text("existing", "append") == "existingappend"
     assert concat_text(None, b"bytes text") == "bytes text"
     assert concat_text("existing", b"bytes append") == "existingbytes append"
+
+
+@pytest.mark.django_db
+def test_save_contacts_deduplicates_recipients(user: User):
+    save_contacts(
+        user,
+        [
+            "john.doe@example.com",
+            "john.doe@example.com",
+            "noreply@example.com",
+            "jane-smith@example.com",
+        ],
+    )
+
+    assert sorted(
+        Contact.objects.filter(user=user).values_list("email", "username")
+    ) == [
+        ("jane-smith@example.com", "Jane Smith"),
+        ("john.doe@example.com", "John Doe"),
+    ]
+
+
+@pytest.mark.django_db
+def test_save_contacts_skips_existing_contacts(user: User):
+    other_user = User.objects.create(username="otheruser")
+    Contact.objects.create(user=user, email="known@example.com", username="Known")
+    Contact.objects.create(user=other_user, email="shared@example.com", username="")
+
+    save_contacts(user, ["known@example.com", "shared@example.com"])
+
+    assert sorted(
+        Contact.objects.filter(user=user).values_list("email", "username")
+    ) == [("known@example.com", "Known"), ("shared@example.com", "Shared")]
+    assert Contact.objects.filter(email="shared@example.com").count() == 2
@@ -1,6 +1,26 @@
+import threading
+from datetime import timedelta
+from unittest import mock
 import pytest
 from django.contrib.auth.models import User
-from aomail.models import Category, Email, Rule, Sender, SocialAPI, Statistics
+from django.db import connection
+from django.utils import timezone
+from aomail.models import (
+    Attachment,
+    BCC_sender,
+    CC_sender,
+    Category,
+    Email,
+    EmailBody,
+    EmailClaim,
+    KeyPoint,
+    PendingEmail,
+    Picture,
+    Rule,
+    Sender,
+    SocialAPI,
+    Statistics,
+)
 from aomail.constants import (
     ANSWER_REQUIRED,
     DEFAULT_CATEGORY,
@@ -9,12 +29,22 @@ from aomail.constants import (
     NOT_RELEVANT,
     USELESS,
 )
+from aomail.email_providers import utils
 from aomail.email_providers.utils import (
     apply_rules,
     delete_email_rule,
+    drop_claimed_email_ids,
+    enqueue_email_to_db,
+    flush_emails_to_db,
+    insert_email_children,
     save_email_to_db,
     verify_condition,
 )
+from aomail import schedule_tasks
+from aomail.schedule_tasks import (
+    delete_expired_email_claims,
+    flush_stale_pending_emails,
+)
 from aomail.utils.security import encrypt_text
 
 
@@ -128,9 +158,6 @@ def email_entry(sender: Sender, social_api: SocialAPI):
             "XP6XNlULLDpZnZvskYE_dvJ3PPpXsmtFAv37Dlt3ak4=",
             "one line summary",
         ),
-        html_content=encrypt_text(
-            "XP6XNlULLDpZnZvskYE_dvJ3PPpXsmtFAv37Dlt3ak4=", "html content"
-        ),
         subject="subject",
         priority=IMPORTANT,
         sender=sender,
@@ -244,7 +271,7 @@ def test_save_email_to_db(processed_email: dict, social_api: SocialAPI, sender:
 
     assert email_entry.short_summary != "short summary"
     assert email_entry.one_line_summary != "one line summary"
-    assert email_entry.html_content != "html content"
+    assert email_entry.body.html_content != "html content"
     assert email_entry.subject == "subject"
     assert email_entry.priority == IMPORTANT
     assert email_entry.sender == sender
@@ -270,3 +297,213 @@ def test_save_email_to_db(processed_email: dict, social_api: SocialAPI, sender:
     assert email_entry.bcc_senders.count() == 0
     assert email_entry.pictures.count() == 0
     assert email_entry.attachments.count() == 0
+
+
+@pytest.fixture
+def stored_email(sender: Sender, social_api: SocialAPI):
+    category, _ = Category.objects.get_or_create(
+        user=social_api.user, description="Default category", name=DEFAULT_CATEGORY
+    )
+    return Email.objects.create(
+        social_api=social_api,
+        provider_id="stored_email_id",
+        email_provider=social_api.type_api,
+        short_summary="short summary",
+        one_line_summary="one line summary",
+        subject="subject",
+        priority=IMPORTANT,
+        sender=sender,
+        category=category,
+        user=social_api.user,
+        answer=ANSWER_REQUIRED,
+        relevance=HIGHLY_RELEVANT,
+    )
+
+
+def insert_and_check_email_children(email: Email):
+    insert_email_children(
+        {
+            EmailBody: [(email.id, "<p>html content</p>")],
+            KeyPoint: [
+                (
+                    False,
+                    None,
+                    DEFAULT_CATEGORY,
+                    "organization",
+                    "topic",
+                    "kp1",
+                    email.id,
+                ),
+                (True, 1, DEFAULT_CATEGORY, "organization", "topic", "kp2", email.id),
+            ],
+            CC_sender: [(email.id, "cc@example.com", "Cc Name")],
+            BCC_sender: [
+                (email.id, "bcc1@example.com", ""),
+                (email.id, "bcc2@example.com", "Bcc Name"),
+            ],
+            Picture: [(email.id, "pictures/1/image.png")],
+            Attachment: [(email.id, "report.pdf", "attachment-id")],
+        }
+    )
+
+    assert EmailBody.objects.get(email=email).html_content == "<p>html content</p>"
+    assert list(
+        KeyPoint.objects.filter(email=email)
+        .order_by("id")
+        .values_list(
+            "is_reply", "position", "category", "organization", "topic", "content"
+        )
+    ) == [
+        (False, None, DEFAULT_CATEGORY, "organization", "topic", "kp1"),
+        (True, 1, DEFAULT_CATEGORY, "organization", "topic", "kp2"),
+    ]
+    assert list(email.cc_senders.values_list("email", "name")) == [
+        ("cc@example.com", "Cc Name")
+    ]
+    assert list(email.bcc_senders.order_by("id").values_list("email", "name")) == [
+        ("bcc1@example.com", ""),
+        ("bcc2@example.com", "Bcc Name"),
+    ]
+    assert list(email.picture_mail.values_list("path", flat=True)) == [
+        "pictures/1/image.png"
+    ]
+    assert list(email.attachments.values_list("name", "id_api")) == [
+        ("report.pdf", "attachment-id")
+    ]
+
+
+@pytest.mark.django_db
+def test_insert_email_children_postgresql(stored_email: Email):
+    if connection.vendor != "postgresql":
+        pytest.skip("The unnest CTE chain is only used on PostgreSQL")
+
+    insert_and_check_email_children(stored_email)
+
+
+@pytest.mark.django_db
+def test_insert_email_children_bulk_create_fallback(stored_email: Email):
+    with mock.patch.object(connection, "vendor", "sqlite"):
+        insert_and_check_email_children(stored_email)
+
+
+@pytest.mark.django_db
+def test_insert_email_children_skips_empty_rows(stored_email: Email):
+    with mock.patch.object(connection, "cursor") as cursor:
+        insert_email_children({EmailBody: [], KeyPoint: []})
+
+    cursor.assert_not_called()
+    assert not EmailBody.objects.filter(email=stored_email).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_claims_process_email_once(social_api: SocialAPI):
+    barrier = threading.Barrier(2)
+    results = []
+
+    def get_email_data(social_api, email_id):
+        # Both processes fetch the email before either of them claims it
+        barrier.wait(timeout=5)
+        return {"email_id": "claimed_email_id"}
+
+    def prepare():
+        try:
+            results.append(utils.prepare_email(social_api, "claimed_email_id", {}, []))
+        finally:
+            connection.close()
+
+    with mock.patch.object(
+        utils, "get_email_data", side_effect=get_email_data
+    ), mock.patch.object(
+        utils, "delete_email_rule", return_value=False
+    ), mock.patch.object(
+        utils,
+        "process_email",
+        return_value={"email_processed": {"summary": {}}},
+    ) as process_email, mock.patch.object(
+        utils.google_labels, "replicate_labels"
+    ):
+        threads = [threading.Thread(target=prepare) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+    process_email.assert_called_once()
+    assert sorted(results, key=bool) == [None, {"email_processed": {"summary": {}}}]
+    assert EmailClaim.objects.filter(provider_id="claimed_email_id").count() == 1
+
+
+@pytest.mark.django_db
+def test_flush_emails_to_db_drops_claims_of_saved_emails(
+    user: User, social_api: SocialAPI, django_capture_on_commit_callbacks
+):
+    EmailClaim.objects.create(provider_id="saved_email_id")
+    processed_email = {"email_data": {"email_id": "saved_email_id", "subject": "s"}}
+
+    with mock.patch.object(
+        utils,
+        "save_emails_to_db",
+        return_value=[mock.Mock(provider_id="saved_email_id")],
+    ), mock.patch.object(utils, "apply_rules"), django_capture_on_commit_callbacks(
+        execute=True
+    ):
+        assert flush_emails_to_db([processed_email], user, social_api) == 1
+
+    assert not EmailClaim.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drop_claimed_email_ids_skips_saved_emails(stored_email: Email):
+    EmailClaim.objects.create(provider_id="claimed_email_id")
+    utils.CLAIMED_EMAIL_IDS.clear()
+
+    assert drop_claimed_email_ids(
+        ["claimed_email_id", stored_email.provider_id, "new_email_id", None]
+    ) == ["new_email_id", None]
+
+
+@pytest.mark.django_db
+def test_delete_expired_email_claims():
+    EmailClaim.objects.create(provider_id="orphan_email_id")
+    EmailClaim.objects.filter(provider_id="orphan_email_id").update(
+        created_at=timezone.now() - timedelta(days=1)
+    )
+    EmailClaim.objects.create(provider_id="fresh_email_id")
+
+    delete_expired_email_claims()
+
+    assert list(EmailClaim.objects.values_list("provider_id", flat=True)) == [
+        "fresh_email_id"
+    ]
+
+
+@pytest.mark.django_db
+def test_enqueue_email_to_db_stores_notifications_before_flush(social_api: SocialAPI):
+    with mock.patch.object(utils.threading, "Timer") as timer:
+        enqueue_email_to_db(social_api, "id1")
+        enqueue_email_to_db(social_api, "id2")
+    utils.PENDING_EMAILS.pop(social_api.id)
+
+    timer.assert_called_once_with(
+        utils.EMAIL_QUEUE_DELAY, utils.flush_pending_emails, args=(social_api,)
+    )
+    assert sorted(
+        PendingEmail.objects.filter(social_api=social_api).values_list(
+            "provider_id", flat=True
+        )
+    ) == ["id1", "id2"]
+
+
+@pytest.mark.django_db
+def test_flush_stale_pending_emails(social_api: SocialAPI):
+    PendingEmail.objects.create(social_api=social_api, provider_id="fresh_email_id")
+
+    with mock.patch.object(schedule_tasks, "flush_pending_emails") as flush:
+        flush_stale_pending_emails()
+        flush.assert_not_called()
+
+        # Left by a process that stopped before saving it
+        PendingEmail.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        flush_stale_pending_emails()
+
+    flush.assert_called_once_with(social_api)
@@ -0,0 +1,72 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+import httplib2
+import pytest
+from django.utils import timezone
+from aomail.constants import SOCIAL_API_REFRESH_TOKEN_KEY
+from aomail.email_providers.google import authentication
+from aomail.email_providers.google.authentication import (
+    ThrottledHttp,
+    authenticate_service,
+)
+from aomail.models import SocialAPI
+from aomail.utils.security import encrypt_text
+
+
+def test_throttled_http_retries_after_refresh_without_a_second_permit():
+    inner_http = mock.Mock()
+    inner_http.request.side_effect = [
+        (httplib2.Response({"status": 401}), b""),
+        (httplib2.Response({"status": 200}), b"ok"),
+    ]
+    http = ThrottledHttp(mock.Mock(), http=inner_http)
+    responses = []
+
+    with mock.patch.object(
+        authentication, "GOOGLE_API_SEMAPHORE", threading.BoundedSemaphore(1)
+    ):
+        thread = threading.Thread(
+            target=lambda: responses.append(http.request("https://gmail.test"))
+        )
+        thread.start()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert responses[0][1] == b"ok"
+    assert inner_http.request.call_count == 2
+    http.credentials.refresh.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_authenticate_service_reuses_token_refreshed_by_another_worker(social_api):
+    cache_key = (social_api.user.id, social_api.email)
+    authentication.CREDENTIALS_CACHE[cache_key] = {
+        "token": "expired_token",
+        "refresh_token": "refresh_token",
+        "token_uri": authentication.GOOGLE_TOKEN_URI,
+        "client_id": authentication.GOOGLE_CLIENT_ID,
+        "client_secret": authentication.GOOGLE_CLIENT_SECRET,
+        "scopes": authentication.GOOGLE_SCOPES,
+        "expiry": "2020-01-01T00:00:00Z",
+    }
+    # Another worker already refreshed the token and saved it
+    SocialAPI.objects.filter(id=social_api.id).update(
+        access_token="fresh_token",
+        access_token_expiry=timezone.now() + timedelta(hours=1),
+        refresh_token=encrypt_text(SOCIAL_API_REFRESH_TOKEN_KEY, "refresh_token"),
+    )
+
+    with mock.patch.object(
+        authentication, "refresh_credentials"
+    ) as refresh_credentials, mock.patch.object(
+        authentication, "build_services", return_value={"gmail": mock.Mock()}
+    ) as build_services:
+        assert (
+            authenticate_service(social_api.user, social_api.email, ["gmail"])
+            == build_services.return_value
+        )
+
+    refresh_credentials.assert_not_called()
+    assert build_services.call_args.args[0].token == "fresh_token"
+    authentication.CREDENTIALS_CACHE.pop(cache_key, None)
@@ -0,0 +1,97 @@
+from unittest import mock
+import httplib2
+import pytest
+from django.contrib.auth.models import User
+from googleapiclient.errors import HttpError
+from rest_framework.test import APIRequestFactory, force_authenticate
+from aomail.email_providers.google import compose_email
+from aomail.models import Subscription
+
+
+def post_send_email(user: User):
+    request = APIRequestFactory().post(
+        "/api/send_email/",
+        {
+            "email": "testuser@example.com",
+            "subject": "Subject",
+            "message": "<p>Hello</p>",
+            "to": ["to@example.com"],
+            "cc": ["cc@example.com"],
+        },
+    )
+    force_authenticate(request, user=user)
+    return compose_email.send_email(request)
+
+
+def http_error(status: int) -> HttpError:
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+@pytest.fixture
+def subscription(user: User):
+    subscription, _ = Subscription.objects.get_or_create(user=user, plan="start_plan")
+    return subscription
+
+
+@pytest.mark.django_db
+def test_send_email_reports_authentication_failure(user, subscription):
+    with mock.patch.object(
+        compose_email, "authenticate_service", return_value=None
+    ), mock.patch.object(compose_email, "send_message") as send_message:
+        response = post_send_email(user)
+
+    assert response.status_code == 401
+    send_message.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_send_email_reports_rejected_email(user, subscription):
+    with mock.patch.object(
+        compose_email, "authenticate_service", return_value={"gmail": mock.Mock()}
+    ), mock.patch.object(
+        compose_email, "send_message", side_effect=http_error(400)
+    ) as send_message, mock.patch.object(
+        compose_email.email_processing, "save_contacts"
+    ) as save_contacts:
+        response = post_send_email(user)
+
+    assert response.status_code == 400
+    send_message.assert_called_once()
+    save_contacts.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_send_email_sends_message_once(user, subscription):
+    with mock.patch.object(
+        compose_email, "authenticate_service", return_value={"gmail": mock.Mock()}
+    ), mock.patch.object(
+        compose_email, "send_message", return_value={"id": "1"}
+    ) as send_message, mock.patch.object(
+        compose_email.threading, "Thread"
+    ) as thread:
+        response = post_send_email(user)
+
+    assert response.status_code == 200
+    send_message.assert_called_once()
+    assert b"cc@example.com" in send_message.call_args.args[1]
+    thread.assert_called_once_with(
+        target=compose_email.email_processing.save_contacts,
+        args=(user, ["to@example.com", "cc@example.com"]),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("gmail_status, expected_status", [(429, 429), (503, 502)])
+def test_send_email_does_not_resend_failed_email(
+    user, subscription, gmail_status, expected_status
+):
+    # Gmail may have delivered the email despite the error, it is never sent twice
+    with mock.patch.object(
+        compose_email, "authenticate_service", return_value={"gmail": mock.Mock()}
+    ), mock.patch.object(
+        compose_email, "send_message", side_effect=http_error(gmail_status)
+    ) as send_message:
+        response = post_send_email(user)
+
+    assert response.status_code == expected_status
+    send_message.assert_called_once()
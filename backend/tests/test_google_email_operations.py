@@ -0,0 +1,123 @@
+from unittest import mock
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+from aomail.email_providers import utils
+from aomail.email_providers.google import email_operations
+from aomail.email_providers.google.email_operations import get_new_email_ids
+from aomail.models import PendingEmail, SocialAPI
+
+
+def history_page(email_ids: list[str], history_id: str, page_token: str = None):
+    page = {
+        "history": [
+            {"messagesAdded": [{"message": {"id": email_id}}]} for email_id in email_ids
+        ],
+        "historyId": history_id,
+    }
+    if page_token:
+        page["nextPageToken"] = page_token
+    return page
+
+
+@pytest.fixture
+def gmail_service():
+    service = mock.Mock()
+    service.users().getProfile().execute.return_value = {"historyId": "500"}
+    with mock.patch.object(
+        email_operations, "authenticate_service", return_value={"gmail": service}
+    ):
+        yield service
+
+
+def set_history_id(social_api: SocialAPI, history_id: str | None):
+    SocialAPI.objects.filter(id=social_api.id).update(history_id=history_id)
+
+
+@pytest.mark.django_db
+def test_get_new_email_ids_reads_history_page(social_api, gmail_service):
+    set_history_id(social_api, "100")
+    gmail_service.users().history().list().execute.return_value = history_page(
+        ["id1", "id2", "id1"], "150"
+    )
+
+    assert get_new_email_ids(social_api) == ["id1", "id2"]
+    gmail_service.users().history().list.assert_called_with(
+        userId="me",
+        startHistoryId="100",
+        historyTypes=["messageAdded"],
+        labelId="INBOX",
+        pageToken=None,
+        fields="history/messagesAdded/message/id,historyId,nextPageToken",
+    )
+    social_api.refresh_from_db()
+    assert social_api.history_id == "150"
+
+
+@pytest.mark.django_db
+def test_get_new_email_ids_follows_pages(social_api, gmail_service):
+    set_history_id(social_api, "100")
+    gmail_service.users().history().list().execute.side_effect = [
+        history_page(["id1"], "150", page_token="page2"),
+        history_page(["id2"], "160"),
+    ]
+
+    assert get_new_email_ids(social_api) == ["id1", "id2"]
+    page_tokens = [
+        call.kwargs["pageToken"]
+        for call in gmail_service.users().history().list.call_args_list
+        if call.kwargs
+    ]
+    assert page_tokens == [None, "page2"]
+    social_api.refresh_from_db()
+    assert social_api.history_id == "160"
+
+
+@pytest.mark.django_db
+def test_get_new_email_ids_reseeds_expired_history_id(social_api, gmail_service):
+    set_history_id(social_api, "100")
+    gmail_service.users().history().list().execute.side_effect = HttpError(
+        httplib2.Response({"status": 404}), b""
+    )
+
+    assert get_new_email_ids(social_api) is None
+    social_api.refresh_from_db()
+    assert social_api.history_id == "500"
+
+
+@pytest.mark.django_db
+def test_get_new_email_ids_seeds_missing_history_id(social_api, gmail_service):
+    set_history_id(social_api, None)
+
+    assert get_new_email_ids(social_api) is None
+    gmail_service.users().history().list().execute.assert_not_called()
+    social_api.refresh_from_db()
+    assert social_api.history_id == "500"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "new_email_ids, saved_email_ids",
+    [
+        (["id2", "id1", "id3"], ["id1", "id2", "id3"]),
+        # Without usable history the latest email is read instead
+        (None, ["id1", None]),
+    ],
+)
+def test_flush_pending_emails_merges_history(
+    social_api, new_email_ids, saved_email_ids
+):
+    utils.PENDING_EMAILS[social_api.id] = social_api
+    for email_id in ["id1", None, None, "id1"]:
+        PendingEmail.objects.create(social_api=social_api, provider_id=email_id)
+
+    with mock.patch.object(
+        utils.email_operations_google,
+        "get_new_email_ids",
+        return_value=new_email_ids,
+    ), mock.patch.object(utils, "emails_to_db") as emails_to_db:
+        utils.flush_pending_emails(social_api)
+
+    emails_to_db.assert_called_once_with(social_api, saved_email_ids)
+    assert social_api.id not in utils.PENDING_EMAILS
+    assert not PendingEmail.objects.exists()
@@ -0,0 +1,65 @@
+from unittest import mock
+import pytest
+from aomail.email_providers.google import profile
+from aomail.models import Contact
+
+
+def person(name: str, email: str, contact_id: str) -> dict:
+    return {
+        "names": [{"displayName": name}],
+        "emailAddresses": [{"value": email}],
+        "metadata": {"sources": [{"id": contact_id}]},
+    }
+
+
+@pytest.fixture
+def google_services():
+    people = mock.Mock()
+    gmail = mock.Mock()
+    people.people().connections().list().execute.return_value = {
+        "connections": [
+            person("Bob", "bob@example.com", "bob-id"),
+            person("Alice", "alice@example.com", "alice-id"),
+        ]
+    }
+    people.otherContacts().list().execute.return_value = {
+        "otherContacts": [person("Carol", "carol@example.com", "carol-id")]
+    }
+    gmail.users().messages().list().execute.return_value = {}
+    with mock.patch.object(
+        profile,
+        "authenticate_service",
+        return_value={"people": people, "gmail": gmail},
+    ):
+        yield people
+
+
+@pytest.mark.django_db
+def test_set_all_contacts_skips_existing_contacts(user, google_services):
+    Contact.objects.create(user=user, email="bob@example.com", username="Bob")
+
+    profile.set_all_contacts(user, "testuser@example.com")
+
+    assert sorted(
+        Contact.objects.filter(user=user).values_list("email", "provider_id")
+    ) == [
+        ("alice@example.com", "alice-id"),
+        ("bob@example.com", None),
+        ("carol@example.com", "carol-id"),
+    ]
+
+
+@pytest.mark.django_db
+def test_set_all_contacts_keeps_sources_that_succeeded(user, google_services):
+    google_services.otherContacts().list().execute.side_effect = Exception(
+        "People API unavailable"
+    )
+
+    profile.set_all_contacts(user, "testuser@example.com")
+
+    assert sorted(
+        Contact.objects.filter(user=user).values_list("email", flat=True)
+    ) == [
+        "alice@example.com",
+        "bob@example.com",
+    ]
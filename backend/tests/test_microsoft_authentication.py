@@ -0,0 +1,129 @@
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import orjson
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from django.utils import timezone as django_timezone
+from aomail.email_providers.microsoft import authentication
+from aomail.email_providers.microsoft.authentication import (
+    GraphSession,
+    get_retry_delay,
+    refresh_access_token,
+)
+from aomail.models import SocialAPI
+
+
+class FakeAdapter(HTTPAdapter):
+    """Adapter answering each request with the next status of a list."""
+
+    def __init__(self, statuses: list[int], retry_after: str = "2"):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append(request)
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.headers["Retry-After"] = self.retry_after
+        response.request = request
+        response._content = b""
+        return response
+
+
+def make_response(retry_after: str | None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def test_graph_session_retries_throttled_write_until_success():
+    adapter = FakeAdapter([429, 202])
+    session = GraphSession()
+    session.mount("https://", adapter)
+    semaphore = threading.BoundedSemaphore(1)
+    permit_free_while_sleeping = []
+
+    def sleep(delay):
+        # Other writes must be able to run during the back-off
+        permit_free_while_sleeping.append(semaphore.acquire(blocking=False))
+        semaphore.release()
+
+    with mock.patch.object(
+        authentication, "GRAPH_WRITE_SEMAPHORE", semaphore
+    ), mock.patch.object(authentication.time, "sleep", side_effect=sleep) as sleeper:
+        response = session.post(
+            "https://graph.microsoft.com/v1.0/me/sendMail", json={"message": {}}
+        )
+
+    assert response.status_code == 202
+    assert len(adapter.sent) == 2
+    assert adapter.sent[1].body == orjson.dumps({"message": {}})
+    sleeper.assert_called_once_with(2.0)
+    assert permit_free_while_sleeping == [True]
+
+
+def test_graph_session_returns_last_throttled_response():
+    adapter = FakeAdapter([429] * (authentication.GRAPH_MAX_RETRIES + 1))
+    session = GraphSession()
+    session.mount("https://", adapter)
+
+    with mock.patch.object(authentication.time, "sleep"):
+        response = session.patch("https://graph.microsoft.com/v1.0/me", json={})
+
+    assert response.status_code == 429
+    assert len(adapter.sent) == authentication.GRAPH_MAX_RETRIES + 1
+
+
+def test_get_retry_delay():
+    assert get_retry_delay(make_response("3"), 0) == 3.0
+
+    retry_date = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = get_retry_delay(make_response(format_datetime(retry_date, usegmt=True)), 0)
+    assert 0 < delay <= 30
+
+    assert get_retry_delay(make_response(None), 2) == 4
+    assert get_retry_delay(make_response("soon"), 1) == 2
+
+
+@pytest.fixture
+def token_endpoint():
+    token_reply = mock.Mock()
+    token_reply.json.return_value = {"access_token": "new_token", "expires_in": 3600}
+    with mock.patch.object(
+        authentication.security, "decrypt_text", return_value="refresh_token"
+    ), mock.patch.object(
+        authentication.LOGIN_SESSION, "post", return_value=token_reply
+    ) as post:
+        yield post
+
+
+@pytest.mark.django_db
+def test_refresh_access_token_reuses_unexpired_token(social_api, token_endpoint):
+    social_api.access_token_expiry = django_timezone.now() + timedelta(minutes=30)
+
+    assert refresh_access_token(social_api) == "access_token"
+    token_endpoint.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_refresh_access_token_forced_refresh_saves_only_the_token(
+    social_api, token_endpoint
+):
+    social_api.access_token_expiry = django_timezone.now() + timedelta(minutes=30)
+    # Saved by another request since the caller read the SocialAPI
+    SocialAPI.objects.filter(id=social_api.id).update(history_id="150")
+
+    assert refresh_access_token(social_api, force_refresh=True) == "new_token"
+
+    token_endpoint.assert_called_once()
+    social_api.refresh_from_db()
+    assert social_api.access_token == "new_token"
+    assert social_api.access_token_expiry > django_timezone.now()
+    assert social_api.history_id == "150"
@@ -0,0 +1,149 @@
+from unittest import mock
+import orjson
+import pytest
+from aomail.email_providers.microsoft import profile
+from aomail.models import Contact
+
+
+def graph_reply(data: dict) -> mock.Mock:
+    response = mock.Mock(status_code=200)
+    response.content = orjson.dumps(data)
+    return response
+
+
+def message_from(address: str) -> dict:
+    return {"from": {"emailAddress": {"address": address}}}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_set_all_contacts_saves_each_email_once(user):
+    Contact.objects.create(user=user, email="bob@example.com", username="Bob")
+
+    def get(endpoint, headers):
+        if "me/contacts" in endpoint:
+            return graph_reply(
+                {
+                    "value": [
+                        {
+                            "id": "bob-id",
+                            "displayName": "Bob",
+                            "emailAddresses": [{"address": "bob@example.com"}],
+                        },
+                        {
+                            "id": "alice-id",
+                            "displayName": "Alice",
+                            "emailAddresses": [{"address": "alice@example.com"}],
+                        },
+                    ]
+                }
+            )
+        if "$skip" not in endpoint or "$skip=0" in endpoint:
+            return graph_reply(
+                {
+                    "value": [
+                        message_from("alice@example.com"),
+                        message_from("carol@example.com"),
+                        message_from("carol@example.com"),
+                        message_from("noreply@example.com"),
+                    ]
+                }
+            )
+        return graph_reply({"value": []})
+
+    with mock.patch.object(
+        profile, "refresh_access_token", return_value="access_token"
+    ), mock.patch.object(profile, "get_social_api"), mock.patch.object(
+        profile, "GRAPH_SESSION"
+    ) as graph_session:
+        graph_session.get.side_effect = get
+        profile.set_all_contacts(user, "testuser@example.com")
+
+    assert sorted(
+        Contact.objects.filter(user=user).values_list(
+            "email", "username", "provider_id"
+        )
+    ) == [
+        ("alice@example.com", "Alice", "alice-id"),
+        ("bob@example.com", "Bob", None),
+        ("carol@example.com", "carol", ""),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_set_all_contacts_forces_token_refresh_after_401(user):
+    def get(endpoint, headers):
+        if headers["Authorization"] == "Bearer rejected_token":
+            return mock.Mock(status_code=401)
+        if "me/contacts" in endpoint:
+            return graph_reply(
+                {
+                    "value": [
+                        {
+                            "id": "alice-id",
+                            "displayName": "Alice",
+                            "emailAddresses": [{"address": "alice@example.com"}],
+                        }
+                    ]
+                }
+            )
+        return graph_reply({"value": []})
+
+    # The stored token has not expired yet but Graph rejects it
+    with mock.patch.object(
+        profile,
+        "refresh_access_token",
+        side_effect=lambda social_api, force_refresh: (
+            "new_token" if force_refresh else "rejected_token"
+        ),
+    ) as refresh_access_token, mock.patch.object(
+        profile, "get_social_api"
+    ), mock.patch.object(
+        profile, "GRAPH_SESSION"
+    ) as graph_session:
+        graph_session.get.side_effect = get
+        profile.set_all_contacts(user, "testuser@example.com")
+
+    # The contact and message threads share a single forced refresh
+    assert [call.args[1] for call in refresh_access_token.call_args_list] == [
+        False,
+        True,
+    ]
+    assert list(Contact.objects.filter(user=user).values_list("email", flat=True)) == [
+        "alice@example.com"
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "nb_first_page_messages, nb_message_requests", [(3, 1), (1000, 5)]
+)
+def test_set_all_contacts_requests_next_message_pages_when_first_is_full(
+    user, nb_first_page_messages, nb_message_requests
+):
+    def get(endpoint, headers):
+        if "me/messages" in endpoint and "$skip=0" in endpoint:
+            return graph_reply(
+                {
+                    "value": [
+                        message_from(f"sender{i}@example.com")
+                        for i in range(nb_first_page_messages)
+                    ]
+                }
+            )
+        return graph_reply({"value": []})
+
+    with mock.patch.object(
+        profile, "refresh_access_token", return_value="access_token"
+    ), mock.patch.object(profile, "get_social_api"), mock.patch.object(
+        profile, "GRAPH_SESSION"
+    ) as graph_session:
+        graph_session.get.side_effect = get
+        profile.set_all_contacts(user, "testuser@example.com")
+
+    message_requests = [
+        call.args[0]
+        for call in graph_session.get.call_args_list
+        if "me/messages" in call.args[0]
+    ]
+    assert len(message_requests) == nb_message_requests
+    assert Contact.objects.filter(user=user).count() == nb_first_page_messages
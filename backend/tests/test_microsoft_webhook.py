@@ -0,0 +1,130 @@
+from unittest import mock
+import orjson
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+from aomail.email_providers.microsoft import webhook
+from aomail.models import MicrosoftListener, Subscription
+
+
+def batch_reply(responses: list[dict]) -> mock.Mock:
+    response = mock.Mock(status_code=200)
+    response.content = orjson.dumps({"responses": responses})
+    return response
+
+
+@pytest.fixture
+def graph_session():
+    with mock.patch.object(
+        webhook, "refresh_access_token", return_value="access_token"
+    ), mock.patch.object(webhook, "get_social_api"), mock.patch.object(
+        webhook, "GRAPH_SESSION"
+    ) as graph_session:
+        yield graph_session
+
+
+@pytest.mark.django_db
+def test_subscribe_all_creates_listeners_of_successful_subscriptions(
+    user, graph_session
+):
+    graph_session.post.return_value = batch_reply(
+        [
+            {"id": "email", "status": 201, "body": {"id": "email-subscription"}},
+            {
+                "id": "contact",
+                "status": 403,
+                "body": {"error": {"code": "ExtensionError"}},
+            },
+        ]
+    )
+
+    assert webhook.subscribe_all(user, "testuser@example.com") is False
+
+    url = graph_session.post.call_args.args[0]
+    batch_body = graph_session.post.call_args.kwargs["json"]
+    assert url.endswith("$batch")
+    assert [request["id"] for request in batch_body["requests"]] == [
+        "email",
+        "contact",
+    ]
+    assert list(
+        MicrosoftListener.objects.values_list("subscription_id", "user", "email")
+    ) == [("email-subscription", user.id, "testuser@example.com")]
+
+
+@pytest.mark.django_db
+def test_subscribe_all_creates_both_listeners(user, graph_session):
+    graph_session.post.return_value = batch_reply(
+        [
+            {"id": "contact", "status": 201, "body": {"id": "contact-subscription"}},
+            {"id": "email", "status": 201, "body": {"id": "email-subscription"}},
+        ]
+    )
+
+    assert webhook.subscribe_all(user, "testuser@example.com") is True
+    assert set(MicrosoftListener.objects.values_list("subscription_id", flat=True)) == {
+        "contact-subscription",
+        "email-subscription",
+    }
+
+
+@pytest.mark.django_db
+def test_subscribe_all_rejected_batch(user, graph_session):
+    graph_session.post.return_value = mock.Mock(status_code=401, reason="Unauthorized")
+
+    assert webhook.subscribe_all(user, "testuser@example.com") is False
+    assert not MicrosoftListener.objects.exists()
+
+
+@pytest.mark.django_db
+def test_email_notification_skips_listeners_without_social_api(user, social_api):
+    Subscription.objects.create(user=user, plan="start_plan")
+    MicrosoftListener.objects.create(
+        subscription_id="linked", user=user, email=social_api.email
+    )
+    MicrosoftListener.objects.create(
+        subscription_id="unlinked", user=user, email="removed@example.com"
+    )
+    webhook.LISTENER_CACHE.clear()
+    notifications = [
+        {
+            "subscriptionId": subscription_id,
+            "clientState": "client_state",
+            "changeType": "created",
+            "resourceData": {"id": email_id},
+        }
+        for subscription_id, email_id in [("unlinked", "id1"), ("linked", "id2")]
+    ]
+    request = RequestFactory().post(
+        "/aomail/microsoft/receive_mail_notifications/",
+        data=orjson.dumps({"value": notifications}),
+        content_type="application/json",
+    )
+
+    with mock.patch.object(
+        webhook, "MICROSOFT_CLIENT_STATE", "client_state"
+    ), mock.patch.object(webhook, "enqueue_email_to_db") as enqueue_email_to_db:
+        response = async_to_sync(webhook.MicrosoftEmailNotification.as_view())(request)
+
+    assert response.status_code == 202
+    enqueue_email_to_db.assert_called_once_with(social_api, "id2")
+
+
+@pytest.mark.django_db
+def test_listener_cache_forgets_modified_and_deleted_listeners(user):
+    listener = MicrosoftListener.objects.create(
+        subscription_id="subscription", user=user, email="old@example.com"
+    )
+    webhook.LISTENER_CACHE.clear()
+
+    def get_listener():
+        return webhook.get_microsoft_listeners({"subscription"}).get("subscription")
+
+    assert get_listener().email == "old@example.com"
+
+    listener.email = "new@example.com"
+    listener.save()
+    assert get_listener().email == "new@example.com"
+
+    MicrosoftListener.objects.filter(id=listener.id).delete()
+    assert get_listener() is None